@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class AccountsConfig(AppConfig):
+    name = "apps.accounts"
+    label = "accounts"
+
+    def ready(self):
+        from django.conf import settings
+
+        from minishop.sharedcache import require_shared
+        from . import signals  # noqa: F401
+
+        # a logout or role change on one worker must reach the others
+        require_shared(getattr(settings, "TOKEN_REVOCATION_CACHE", "default"), "Token revocation (TOKEN_REVOCATION_CACHE)")
+        require_shared(getattr(settings, "ROLE_CHANGE_CACHE", "default"), "Role-change stamps (ROLE_CHANGE_CACHE)")
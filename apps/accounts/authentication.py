@@ -0,0 +1,123 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BaseAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import revocation, roles
+
+BATCH_AUTH = "batch_auth"  # HttpRequest attribute minishop.batch sets on its sub-requests: (user, token)
+
+
+class ClaimsUser(TokenUser):
+    """User built from access-token claims; has no DB row loaded (write FKs by `.pk`)."""
+
+    def __init__(self, token):
+        super().__init__(token)
+        self._grp_upper = {n.upper() for n in token.get("groups", ())}
+
+
+class RoleClaimJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that seeds the RBAC group set from the token's `groups` claim,
+    so permission checks run no SQL. Claims issued before a group change are ignored.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if revocation.is_revoked(token):
+            raise InvalidToken({"detail": "Token has been revoked.", "code": "token_revoked"})
+        return token
+
+    async def aget_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)  # signature and expiry only, no I/O
+        if await revocation.ais_revoked(token):
+            raise InvalidToken({"detail": "Token has been revoked.", "code": "token_revoked"})
+        return token
+
+    def has_fresh_claims(self, token, user_id):
+        read_at = token.get("roles_at", token.get("iat", 0))
+        return "groups" in token and not roles.changed_since(user_id, read_at)
+
+    async def ahas_fresh_claims(self, token, user_id):
+        read_at = token.get("roles_at", token.get("iat", 0))
+        return "groups" in token and not await roles.achanged_since(user_id, read_at)
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if self.has_fresh_claims(validated_token, user.pk):
+            user._grp_upper = {n.upper() for n in validated_token["groups"]}
+        return user
+
+    async def aauthenticate(self, request):
+        """authenticate() for the async read views (minishop.asyncviews), with async cache lookups."""
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        validated_token = await self.aget_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        # same checks as JWTAuthentication.get_user
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        if await self.ahas_fresh_claims(validated_token, user.pk):
+            user._grp_upper = {n.upper() for n in validated_token["groups"]}
+        else:  # permission classes are sync: resolve groups here
+            user._grp_upper = {n.upper() for n in await roles.agroup_names(user.pk)}
+        return user
+
+
+class StatelessJWTAuthentication(RoleClaimJWTAuthentication):
+    """
+    No auth_user query: request.user is a ClaimsUser built from the token. Tokens without
+    role claims, or issued before the user's groups/account changed, fall back to the DB.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None and self.has_fresh_claims(validated_token, user_id):
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None and await self.ahas_fresh_claims(validated_token, user_id):
+            return ClaimsUser(validated_token)
+        return await super().aget_user(validated_token)
+
+
+class BatchSubRequestAuthentication(BaseAuthentication):
+    """
+    The user and token the enclosing ``POST /api/batch/`` authenticated, for its
+    sub-requests (no second JWT decode). First in DEFAULT_AUTHENTICATION_CLASSES;
+    views that pick their own authenticators, or none, don't list it and
+    authenticate the sub-request's copied Authorization header themselves.
+    """
+
+    def authenticate(self, request):
+        return getattr(request._request, BATCH_AUTH, None)
+
+    async def aauthenticate(self, request):
+        return self.authenticate(request)
+
+    def authenticate_header(self, request):
+        # DRF answers 401 with the first authenticator's challenge: keep the JWT one
+        return JWTAuthentication().authenticate_header(request)
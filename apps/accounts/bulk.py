@@ -0,0 +1,83 @@
+import csv
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import EmailOutbox, Invitation
+from .utils import invitation_outbox
+
+User = get_user_model()
+
+MAX_INVITES = 5000
+ROLES = {r for r, _ in Invitation.ROLE_CHOICES}
+INVITE_TTL = timezone.timedelta(hours=72)
+
+
+def read_csv(stream, limit=MAX_INVITES + 1):
+    """Rows of a CSV upload with `email` and `role` columns, at most `limit` (enough to tell it's too long)."""
+    return [{"email": row.get("email"), "role": row.get("role")} for row in islice(csv.DictReader(stream), limit)]
+
+
+def invite_many(rows, invited_by_id=None) -> dict:
+    """
+    Create invitations for `rows` ([{"email", "role"}]) in one transaction: one query for
+    active invitations, one for registered users, bulk inserts for invitations and their
+    outbox mail. Emails are compared ignoring case, within the batch and against the
+    database. Returns per-row results in input order.
+    """
+    results, wanted = [], {}
+    for row in rows:
+        email = str(row.get("email") or "").strip() if isinstance(row, dict) else ""
+        role = str(row.get("role") or "").strip().lower() if isinstance(row, dict) else ""
+        result = {"email": email, "role": role}
+        results.append(result)
+        try:
+            validate_email(email)
+        except ValidationError:
+            result.update(status="invalid", error="Enter a valid email address.")
+            continue
+        if role not in ROLES:
+            result.update(status="invalid", error=f"Role must be one of {', '.join(sorted(ROLES))}.")
+            continue
+        if email.lower() in wanted:
+            result.update(status="duplicate", error="Listed more than once.")
+            continue
+        wanted[email.lower()] = result
+
+    now = timezone.now()
+    with transaction.atomic():
+        pending = {e.lower() for e in Invitation.objects.active(now).for_emails(*wanted)
+                   .values_list("email", flat=True)}
+        registered = {e.lower() for e in User.objects.alias(email_key=Lower("email"))
+                      .filter(email_key__in=list(wanted)).values_list("email", flat=True)}
+
+        todo = []
+        for key, result in wanted.items():
+            if key in registered:
+                result.update(status="registered", error="Email is already registered as a user.")
+            elif key in pending:
+                result.update(status="pending", error="An active invitation for this email still exists.")
+            else:
+                todo.append(result)
+
+        invitations = Invitation.objects.bulk_create([
+            Invitation(email=r["email"], role=r["role"], invited_by_id=invited_by_id, expires_at=now + INVITE_TTL)
+            for r in todo
+        ], batch_size=1000)
+        if invitations and invitations[0].pk is None:  # backend can't return ids from bulk inserts
+            by_token = Invitation.objects.in_bulk([inv.token for inv in invitations], field_name="token")
+            invitations = [by_token[inv.token] for inv in invitations]
+        EmailOutbox.objects.bulk_create([invitation_outbox(inv) for inv in invitations], batch_size=1000)
+
+    for result, inv in zip(todo, invitations):
+        result.update(status="created", id=inv.pk, token=str(inv.token))
+    return {
+        "created": len(invitations),
+        "skipped": len(results) - len(invitations),
+        "results": results,
+    }
@@ -0,0 +1,60 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.authentication import RoleClaimJWTAuthentication, StatelessJWTAuthentication
+from apps.accounts.tokens import RoleRefreshToken
+from apps.catalog.views import ProductViewSet
+
+User = get_user_model()
+
+MODES = {"db": RoleClaimJWTAuthentication, "stateless": StatelessJWTAuthentication}
+
+
+class Command(BaseCommand):
+    help = ("Compare requests/sec and queries/request on GET /api/catalog/products/ with "
+            "DB-backed vs stateless JWT authentication (in-process, creates and removes a user).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--path", default="/api/catalog/products/")
+
+    def handle(self, *args, **opts):
+        user = User.objects.create_user(f"bench-{uuid.uuid4().hex[:8]}")
+        user.groups.add(Group.objects.get_or_create(name="staff")[0])
+        access = str(RoleRefreshToken.for_user(user).access_token)
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {access}")
+        original = ProductViewSet.authentication_classes
+        results = {}
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                for mode, auth_class in MODES.items():
+                    ProductViewSet.authentication_classes = [auth_class]
+                    results[mode] = self.run(client, opts)
+        finally:
+            ProductViewSet.authentication_classes = original
+            user.delete()
+
+        for mode, (rps, queries) in results.items():
+            self.stdout.write(f"{mode:<10} {rps:>9.1f} req/s  {queries} queries/request")
+        base = results["db"][0]
+        self.stdout.write(self.style.SUCCESS(f"stateless: {results['stateless'][0] / base:.2f}x"))
+
+    def run(self, client, opts):
+        path = opts["path"]
+        for _ in range(20):  # warm the catalog cache and code paths
+            assert client.get(path).status_code == 200
+        with CaptureQueriesContext(connection) as ctx:
+            client.get(path)
+        queries = len(ctx.captured_queries)
+        started = time.perf_counter()
+        for _ in range(opts["requests"]):
+            client.get(path)
+        return opts["requests"] / (time.perf_counter() - started), queries
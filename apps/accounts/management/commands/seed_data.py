@@ -0,0 +1,136 @@
+import datetime
+import itertools
+import math
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.catalog.cache import bump_catalog_version
+from apps.catalog.models import Product
+from apps.orders.models import Order, OrderItem
+
+from .seed_roles import ROLES
+
+User = get_user_model()
+
+ROLE_WEIGHTS = (5, 15, 80)  # admin, manager, staff
+STATUS_WEIGHTS = {"pending": 20, "paid": 70, "cancelled": 10}
+LINES_WEIGHTS = (35, 25, 15, 10, 6, 4, 3, 2)  # 1..8 lines per order
+QTY_WEIGHTS = (55, 20, 10, 6, 4, 2, 1, 1, 1)  # 1..9 units per line
+
+
+class Command(BaseCommand):
+    help = ("Generate synthetic users (spread over admin/manager/staff), products and orders with "
+            "bulk inserts. Orders get skewed product popularity and line counts, are spread over --days "
+            "and carry their totals; stock is not reserved. Re-run with another --prefix to add more.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--products", type=int, default=1000)
+        parser.add_argument("--orders", type=int, default=5000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--prefix", default="seed", help="Username/SKU prefix; must not be in use.")
+        parser.add_argument("--password", default="seed12345", help="Password of every generated user.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        prefix = opts["prefix"]
+        if (User.objects.filter(username__startswith=f"{prefix}-").exists()
+                or Product.objects.filter(sku__startswith=f"{prefix.upper()}-").exists()):
+            raise CommandError(f"Prefix {prefix!r} is already in use; pass another --prefix.")
+        rng = random.Random(opts["seed"])
+        started = time.perf_counter()
+
+        users = self.create_users(rng, opts)
+        self.stdout.write(f"users: {len(users)}")
+        products = self.create_products(rng, opts)
+        self.stdout.write(f"products: {len(products)}")
+        orders, items = self.create_orders(rng, users, products, opts)
+        self.stdout.write(f"orders: {orders} ({items} items)")
+        self.stdout.write(self.style.SUCCESS(f"done in {time.perf_counter() - started:.1f}s"))
+
+    def create_users(self, rng, opts):
+        groups = {g.name: g for g in (Group.objects.get_or_create(name=name)[0] for name in ROLES)}
+        password = make_password(opts["password"])  # hash once, not per user
+        roles = rng.choices(ROLES, weights=ROLE_WEIGHTS, k=opts["users"])
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f"{opts['prefix']}-{i:06d}", email=f"{opts['prefix']}-{i:06d}@example.com",
+                     password=password, is_staff=role == "admin")
+                for i, role in enumerate(roles)
+            ], batch_size=opts["batch_size"])
+            User.groups.through.objects.bulk_create([
+                User.groups.through(user_id=user.pk, group_id=groups[role].pk)
+                for user, role in zip(users, roles)
+            ], batch_size=opts["batch_size"])
+        return users
+
+    def create_products(self, rng, opts):
+        sku = opts["prefix"].upper()
+        with transaction.atomic():
+            products = Product.objects.bulk_create([
+                Product(name=f"Product {i}", sku=f"{sku}-{i:06d}", price=_price(rng),
+                        stock=rng.randint(0, 500), is_active=rng.random() > 0.05)
+                for i in range(opts["products"])
+            ], batch_size=opts["batch_size"])
+            transaction.on_commit(bump_catalog_version)  # bulk_create bypasses the post_save signal
+        return products
+
+    def create_orders(self, rng, users, products, opts):
+        if not users or not products:
+            return 0, 0
+        now = timezone.now()
+        product_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(products))))  # Zipf-like
+        user_weights = list(itertools.accumulate(1 / math.sqrt(i + 1) for i in range(len(users))))
+        statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        total_items = 0
+        for offset in range(0, opts["orders"], opts["batch_size"]):
+            count = min(opts["batch_size"], opts["orders"] - offset)
+            owners = rng.choices(users, cum_weights=user_weights, k=count)
+            lines = []
+            orders = []
+            for owner in owners:
+                n = rng.choices(range(1, len(LINES_WEIGHTS) + 1), weights=LINES_WEIGHTS)[0]
+                picked = {p.pk: p for p in rng.choices(products, cum_weights=product_weights, k=n)}
+                order_lines = [
+                    OrderItem(product=p, price=p.price,
+                              qty=rng.choices(range(1, len(QTY_WEIGHTS) + 1), weights=QTY_WEIGHTS)[0])
+                    for p in picked.values()
+                ]
+                order = Order(user=owner, status=rng.choices(statuses, weights=status_weights)[0])
+                order.set_totals(order_lines)
+                orders.append(order)
+                lines.append(order_lines)
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                # auto_now_add stamps "now"; spread orders back over the window (plain executemany:
+                # bulk_update's CASE expression costs more than the inserts)
+                table = connection.ops.quote_name(Order._meta.db_table)
+                with connection.cursor() as cursor:
+                    cursor.executemany(f"UPDATE {table} SET created_at = %s WHERE id = %s", [
+                        (connection.ops.adapt_datetimefield_value(
+                            now - datetime.timedelta(seconds=rng.randint(0, opts["days"] * 86400))), order.pk)
+                        for order in orders
+                    ])
+                items = []
+                for order, order_lines in zip(orders, lines):
+                    for item in order_lines:
+                        item.order = order
+                    items.extend(order_lines)
+                OrderItem.objects.bulk_create(items, batch_size=opts["batch_size"])
+            total_items += len(items)
+        return opts["orders"], total_items
+
+
+def _price(rng):
+    # log-normal: mostly tens, a long tail of expensive products
+    value = min(max(math.exp(rng.gauss(3.5, 1.0)), 0.5), 5000)
+    return Decimal(str(round(value, 2)))
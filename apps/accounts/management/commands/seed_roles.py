@@ -0,0 +1,13 @@
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+
+ROLES = ("admin", "manager", "staff")
+
+
+class Command(BaseCommand):
+    help = "Create the RBAC groups (admin, manager, staff) if they are missing."
+
+    def handle(self, *args, **opts):
+        for name in ROLES:
+            _, created = Group.objects.get_or_create(name=name)
+            self.stdout.write(f"{name}: {'created' if created else 'exists'}")
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = ("Deliver queued mail from the EmailOutbox table in batches over one mail connection, "
+            "retrying failures with exponential backoff. Run once (cron) or with --loop as a worker.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, default=8)
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when drained.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep when idle (--loop).")
+
+    def handle(self, *args, **opts):
+        total = {"sent": 0, "retry": 0, "failed": 0}
+        while True:
+            stats = deliver_batch(opts["batch_size"], opts["max_attempts"])
+            for k, v in stats.items():
+                total[k] += v
+            if any(stats.values()):
+                self.stdout.write(f"sent={stats['sent']} retry={stats['retry']} failed={stats['failed']}")
+                continue
+            if not opts["loop"]:
+                break
+            time.sleep(opts["interval"])
+        self.stdout.write(self.style.SUCCESS(
+            f"done: sent={total['sent']} retry={total['retry']} failed={total['failed']}"
+        ))
@@ -0,0 +1,50 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import Invitation
+from minishop.exports import format_value
+
+ARCHIVE_FIELDS = ["id", "email", "role", "token", "expires_at", "used_at", "revoked_at", "invited_by_id", "created_at"]
+
+
+class Command(BaseCommand):
+    help = ("Delete invitations that were never accepted and expired more than --days ago, in batches "
+            "(walking the used_at IS NULL partial index). --archive appends them to an NDJSON file first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90, help="Keep expired/revoked rows this long.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--archive", metavar="PATH", help="Append swept rows to this NDJSON file.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        cutoff = timezone.now() - timedelta(days=opts["days"])
+        stale = Invitation.objects.filter(used_at__isnull=True, expires_at__lt=cutoff).order_by("expires_at", "id")
+        if opts["dry_run"]:
+            self.stdout.write(f"{stale.count()} invitations expired before {cutoff:%Y-%m-%d} would be swept")
+            return
+
+        archive = open(opts["archive"], "a", encoding="utf-8") if opts["archive"] else None
+        swept = 0
+        try:
+            while True:
+                with transaction.atomic():
+                    rows = list(stale.values(*ARCHIVE_FIELDS)[: opts["batch_size"]])
+                    if not rows:
+                        break
+                    if archive:
+                        archive.writelines(
+                            json.dumps({k: format_value(v) for k, v in row.items()}, default=str) + "\n" for row in rows
+                        )
+                        archive.flush()
+                    Invitation.objects.filter(pk__in=[r["id"] for r in rows]).delete()
+                swept += len(rows)
+                self.stdout.write(f"swept {swept}")
+        finally:
+            if archive:
+                archive.close()
+        self.stdout.write(self.style.SUCCESS(f"Swept {swept} invitations expired before {cutoff:%Y-%m-%d}."))
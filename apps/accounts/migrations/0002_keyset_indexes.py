@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+USER_EMAIL_INDEX = "accounts_user_email_id_idx"
+
+
+def create_user_email_index(apps, schema_editor):
+    # auth_user belongs to django.contrib.auth, so the (email, id) index used by
+    # the users endpoint's keyset pagination is managed here.
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {qn(USER_EMAIL_INDEX)} ON {qn(table)} ({qn('email')}, {qn('id')})"
+    )
+
+
+def drop_user_email_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(USER_EMAIL_INDEX)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['created_at', 'id'], name='invitation_created_id_idx'),
+        ),
+        migrations.RunPython(create_user_email_index, drop_user_email_index),
+    ]
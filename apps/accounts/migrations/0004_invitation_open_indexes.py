@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 20:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_email_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(condition=models.Q(('revoked_at__isnull', True), ('used_at__isnull', True)), fields=['email', 'expires_at'], name='invitation_open_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(condition=models.Q(('used_at__isnull', True)), fields=['expires_at', 'id'], name='invitation_unused_exp_idx'),
+        ),
+    ]
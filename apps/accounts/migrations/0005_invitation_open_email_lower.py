@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-17 21:27
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_invitation_open_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='invitation',
+            name='invitation_open_email_idx',
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.F('expires_at'), condition=models.Q(('revoked_at__isnull', True), ('used_at__isnull', True)), name='invitation_open_email_idx'),
+        ),
+    ]
@@ -1,10 +1,45 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import uuid
 
 User = get_user_model()
 
+OPEN = models.Q(revoked_at__isnull=True, used_at__isnull=True)
+
+
+def status_conditions(now=None) -> dict:
+    """Status name -> Q, mirroring Invitation.status (first match wins in that order)."""
+    now = now or timezone.now()
+    return {
+        "revoked": models.Q(revoked_at__isnull=False),
+        "accepted": models.Q(revoked_at__isnull=True, used_at__isnull=False),
+        "expired": OPEN & models.Q(expires_at__lte=now),
+        "pending": OPEN & models.Q(expires_at__gt=now),
+    }
+
+
+class InvitationQuerySet(models.QuerySet):
+    def active(self, now=None):
+        return self.filter(status_conditions(now)["pending"])
+
+    def for_emails(self, *emails):
+        """Invitations to any of ``emails``, ignoring case (as the open-invitation index does)."""
+        return self.alias(email_key=Lower("email")).filter(email_key__in=[e.lower() for e in emails])
+
+    def with_status(self, now=None):
+        whens = [models.When(q, then=models.Value(name)) for name, q in status_conditions(now).items()]
+        return self.annotate(status_code=models.Case(*whens, output_field=models.CharField()))
+
+    def by_status(self, *names, now=None):
+        conditions = status_conditions(now)
+        q = models.Q()
+        for name in names:
+            q |= conditions[name]
+        return self.filter(q)
+
+
 class Invitation(models.Model):
     ROLE_CHOICES = [("admin","admin"),("manager","manager"),("staff","staff")]
     email = models.EmailField(db_index=True)
@@ -16,8 +51,22 @@ class Invitation(models.Model):
     invited_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name="sent_invitations")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = InvitationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="invitation_created_id_idx"),
+            # only open invitations: duplicate checks and ?status=pending stay small as history grows
+            models.Index(Lower("email"), "expires_at", name="invitation_open_email_idx", condition=OPEN),
+            # sweep_invitations: never-accepted rows by expiry
+            models.Index(fields=["expires_at", "id"], name="invitation_unused_exp_idx",
+                         condition=models.Q(used_at__isnull=True)),
+        ]
+
     @property
     def status(self) -> str:
+        if "status_code" in self.__dict__:  # annotated by with_status()
+            return self.status_code
         if self.revoked_at:
             return "revoked"
         if self.used_at:
@@ -36,4 +85,24 @@ class Invitation(models.Model):
 
     def mark_used(self):
         self.used_at = timezone.now()
-        self.save(update_fields=["used_at"])
\ No newline at end of file
+        self.save(update_fields=["used_at"])
+
+class EmailOutbox(models.Model):
+    """Mail queued in the caller's transaction and delivered by `manage.py send_outbox`."""
+    PENDING, SENT, FAILED = "pending", "sent", "failed"
+    STATUS_CHOICES = [(PENDING, PENDING), (SENT, SENT), (FAILED, FAILED)]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    invitation = models.ForeignKey(Invitation, null=True, blank=True, on_delete=models.SET_NULL, related_name="emails")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at", "id"], name="outbox_due_idx")]
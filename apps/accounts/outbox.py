@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+BACKOFF_BASE = 30  # seconds, doubled per attempt
+BACKOFF_MAX = 6 * 3600
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def due(now=None):
+    return EmailOutbox.objects.filter(
+        status=EmailOutbox.PENDING, next_attempt_at__lte=now or timezone.now(),
+    ).order_by("next_attempt_at", "id")
+
+
+def deliver_batch(batch_size=100, max_attempts=8, mail_connection=None) -> dict:
+    """
+    Send up to `batch_size` due messages over one mail connection and record the result.
+    Rows are locked (SKIP LOCKED where supported) so parallel workers don't double-send.
+    """
+    stats = {"sent": 0, "retry": 0, "failed": 0}
+    with transaction.atomic():
+        qs = due()
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        rows = list(qs[:batch_size])
+        if not rows:
+            return stats
+
+        errors = _send(rows, mail_connection or get_connection(fail_silently=False))
+        now = timezone.now()
+        for row in rows:
+            row.attempts += 1
+            error = errors.get(row.pk)
+            if error is None:
+                row.status, row.sent_at, row.last_error = EmailOutbox.SENT, now, ""
+                stats["sent"] += 1
+            else:
+                row.last_error = error[:2000]
+                if row.attempts >= max_attempts:
+                    row.status = EmailOutbox.FAILED
+                    stats["failed"] += 1
+                else:
+                    row.next_attempt_at = now + backoff(row.attempts)
+                    stats["retry"] += 1
+        EmailOutbox.objects.bulk_update(rows, ["status", "attempts", "next_attempt_at", "last_error", "sent_at"])
+    return stats
+
+
+def _send(rows, mail_connection) -> dict:
+    """
+    Returns {row pk: error} for the rows that were not delivered. One open connection
+    for the batch; messages are handed over one at a time so a failure in the middle
+    doesn't leave us guessing which ones went out (and resending them).
+    """
+    try:
+        mail_connection.open()
+    except Exception as exc:
+        return {row.pk: f"{type(exc).__name__}: {exc}" for row in rows}
+    errors = {}
+    try:
+        for row in rows:
+            message = EmailMessage(row.subject, row.body, row.from_email or None, [row.to_email],
+                                   connection=mail_connection)
+            try:
+                if not mail_connection.send_messages([message]):
+                    errors[row.pk] = "not sent"
+            except Exception as exc:
+                errors[row.pk] = f"{type(exc).__name__}: {exc}"
+    finally:
+        try:
+            mail_connection.close()
+        except Exception:
+            pass
+    return errors
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from . import roles
+
 
 def _group_names(user) -> set[str]:
     if not getattr(user, "is_authenticated", False):
@@ -7,7 +9,8 @@ def _group_names(user) -> set[str]:
     if getattr(user, "is_superuser", False):
         return {"ADMIN", "MANAGER", "STAFF"}
     if not hasattr(user, "_grp_upper"):
-        user._grp_upper = set(n.upper() for n in user.groups.values_list("name", flat=True))
+        # set from the token's role claims by RoleClaimJWTAuthentication, else the role cache
+        user._grp_upper = set(n.upper() for n in roles.group_names(user.pk))
     return user._grp_upper
 
 def in_group(user, name: str) -> bool:
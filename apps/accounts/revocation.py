@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+KEY = "revoked:%s"
+
+
+def _cache():
+    return caches[getattr(settings, "TOKEN_REVOCATION_CACHE", "default")]
+
+
+def revoke(token):
+    """Deny the token's jti until the token would have expired anyway."""
+    jti, exp = token.get("jti"), token.get("exp")
+    if not jti or not exp:
+        return
+    ttl = int(exp - time.time()) + 1
+    if ttl > 0:
+        _cache().set(KEY % jti, 1, ttl)
+
+
+def is_revoked(token) -> bool:
+    jti = token.get("jti")
+    return bool(jti) and _cache().get(KEY % jti) is not None
+
+
+async def ais_revoked(token) -> bool:
+    jti = token.get("jti")
+    return bool(jti) and await _cache().aget(KEY % jti) is not None
@@ -0,0 +1,111 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework_simplejwt.settings import api_settings
+
+ROLE_ORDER = ("ADMIN", "MANAGER", "STAFF")
+ROLE_ALIAS = {
+    "ADMIN": "ADMIN", "MANAGER": "MANAGER", "STAFF": "STAFF",
+    "ROLE_ADMIN": "ADMIN", "ROLE_MANAGER": "MANAGER", "ROLE_STAFF": "STAFF",
+    "MGR": "MANAGER",
+}
+CHANGED_KEY = "roles:changed:%s"
+
+_lock = threading.Lock()
+_names = {}  # str(user id) -> (expires_at, frozenset of group names, wall-clock time of the read)
+
+
+def ttl() -> float:
+    return getattr(settings, "ROLE_CACHE_TTL", 300)
+
+
+def _stamps():
+    """Cache of role-change stamps; must be shared by all workers (checked at startup, see AccountsConfig)."""
+    return caches[getattr(settings, "ROLE_CHANGE_CACHE", "default")]
+
+
+def group_names(user_id, fresh=False) -> frozenset:
+    """
+    Group names of a user, from a per-process cache with TTL eviction (`fresh` skips it).
+    Entries read before a role-change stamp, possibly set by another worker, are re-read.
+    """
+    hit = None if fresh else _cached(user_id)
+    if hit is not None:
+        return hit
+    read_at = time.time()
+    return _store(user_id, frozenset(_names_query(user_id)), read_at)
+
+
+async def agroup_names(user_id) -> frozenset:
+    hit = _names.get(str(user_id))
+    if hit and hit[0] > time.monotonic() and not await achanged_since(user_id, hit[2]):
+        return hit[1]
+    read_at = time.time()
+    return _store(user_id, frozenset([n async for n in _names_query(user_id)]), read_at)
+
+
+def _names_query(user_id):
+    return Group.objects.filter(user__id=user_id).values_list("name", flat=True)
+
+
+def _cached(user_id):
+    hit = _names.get(str(user_id))  # token claims carry the id as a string
+    if hit and hit[0] > time.monotonic() and not changed_since(user_id, hit[2]):
+        return hit[1]
+    return None
+
+
+def _store(user_id, names, read_at):
+    now = time.monotonic()
+    with _lock:
+        if len(_names) >= getattr(settings, "ROLE_CACHE_MAX_ENTRIES", 10000):
+            for k in [k for k, v in _names.items() if v[0] <= now] or list(_names)[: len(_names) // 2]:
+                _names.pop(k, None)
+        _names[str(user_id)] = (now + ttl(), names, read_at)
+    return names
+
+
+def invalidate(user_ids=None):
+    """
+    Drop cached group names (all of them when user_ids is None) and stamp the change,
+    so role claims read before it are ignored until the token is refreshed. Repeated
+    on commit, since reads between the change and the commit still see the old rows.
+    """
+    user_ids = None if user_ids is None else list(user_ids)
+    _invalidate(user_ids)
+    transaction.on_commit(lambda: _invalidate(user_ids))
+
+
+def _invalidate(user_ids):
+    stamp = time.time()
+    lifetime = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    with _lock:
+        if user_ids is None:
+            _names.clear()
+        else:
+            for uid in user_ids:
+                _names.pop(str(uid), None)
+    keys = ["*"] if user_ids is None else list(user_ids)
+    _stamps().set_many({CHANGED_KEY % k: stamp for k in keys}, lifetime)
+
+
+def changed_since(user_id, read_at) -> bool:
+    stamps = _stamps().get_many([CHANGED_KEY % "*", CHANGED_KEY % user_id])
+    return any(s >= read_at for s in stamps.values())
+
+
+async def achanged_since(user_id, read_at) -> bool:
+    stamps = await _stamps().aget_many([CHANGED_KEY % "*", CHANGED_KEY % user_id])
+    return any(s >= read_at for s in stamps.values())
+
+
+def role_of(names) -> str:
+    up = {ROLE_ALIAS.get(n.upper(), n.upper()) for n in names}
+    for want in ROLE_ORDER:
+        if want in up:
+            return want
+    return "STAFF"
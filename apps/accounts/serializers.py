@@ -2,30 +2,19 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.utils import timezone
 
+from minishop.timing import TimedSerializerMixin
 from .models import Invitation
+from .permissions import _group_names, in_group
+from .roles import ROLE_ALIAS, role_of  # noqa: F401
 
 User = get_user_model()
 
 from rest_framework import serializers
 
-ROLE_ALIAS = {
-    "ADMIN": "ADMIN", "MANAGER": "MANAGER", "STAFF": "STAFF",
-    "ROLE_ADMIN": "ADMIN", "ROLE_MANAGER": "MANAGER", "ROLE_STAFF": "STAFF",
-    "MGR": "MANAGER",
-}
-
-
 def derive_role(user):
     if user.is_superuser:
         return "ADMIN"
-    names = [g.name for g in user.groups.all()]  # get ALL groups
-    up = [ROLE_ALIAS.get(n, n).upper() for n in names]
-
-    for want in ("ADMIN", "MANAGER", "STAFF"):
-        if want in up:
-            return want
-
-    return "STAFF"
+    return role_of(_group_names(user))  # token claims / role cache, no extra query
 
 
 class UserMeSerializer(serializers.ModelSerializer):
@@ -41,7 +30,7 @@ class UserMeSerializer(serializers.ModelSerializer):
         return derive_role(obj)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
     role = serializers.ChoiceField(choices=["admin", "manager", "staff"], required=False)  # <- writable
 
@@ -54,7 +43,7 @@ class UserSerializer(serializers.ModelSerializer):
     # representasi tetap otomatis dari groups
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        names = set(instance.groups.values_list("name", flat=True))
+        names = {g.name for g in instance.groups.all()}  # prefetched by UserViewSet
         data["role"] = "admin" if "admin" in names else ("manager" if "manager" in names else "staff")
         return data
 
@@ -68,7 +57,7 @@ class UserSerializer(serializers.ModelSerializer):
         # hanya admin yang boleh set admin
         req = self.context.get("request")
         if role == "admin":
-            ok = req and req.user and (req.user.is_superuser or req.user.groups.filter(name="admin").exists())
+            ok = req and req.user and in_group(req.user, "admin")
             if not ok:
                 raise serializers.ValidationError({"role":"Only admin can assign admin role."})
 
@@ -98,34 +87,31 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-class InvitationSerializer(serializers.ModelSerializer):
+class InvitationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    status = serializers.SerializerMethodField()
+
     class Meta:
         model = Invitation
-        fields = ["id", "email", "role", "token", "expires_at", "used_at", "revoked_at", "created_at"]
+        fields = ["id", "email", "role", "status", "token", "expires_at", "used_at", "revoked_at", "created_at"]
         read_only_fields = ["id", "token", "used_at", "revoked_at", "created_at", "expires_at"]
 
     def get_status(self, obj):
         return obj.status
 
     def validate(self, attrs):
-        if Invitation.objects.filter(
-                email=attrs["email"],
-                revoked_at__isnull=True,
-                used_at__isnull=True,
-                expires_at__gt=timezone.now(),
-        ).exists():
+        if Invitation.objects.active().for_emails(attrs["email"]).exists():
             raise serializers.ValidationError("An active invitation for this email still exists.")
-        if User.objects.filter(email=attrs["email"]).exists():
+        if User.objects.filter(email__iexact=attrs["email"]).exists():
             raise serializers.ValidationError("Email is already registered as a user.")
         return attrs
 
     def create(self, validated):
-        validated["invited_by"] = self.context["request"].user
+        validated["invited_by_id"] = self.context["request"].user.pk
         validated["expires_at"] = timezone.now() + timezone.timedelta(hours=72)
         return super().create(validated)
 
 
-class AcceptInvitationSerializer(serializers.Serializer):
+class AcceptInvitationSerializer(TimedSerializerMixin, serializers.Serializer):
     token = serializers.UUIDField()
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
@@ -142,7 +128,7 @@ class AcceptInvitationSerializer(serializers.Serializer):
         if User.objects.filter(username=attrs["username"]).exists():
             raise serializers.ValidationError("Username is already taken.")
 
-        if User.objects.filter(email=inv.email).exists():
+        if User.objects.filter(email__iexact=inv.email).exists():
             raise serializers.ValidationError("Email is already registered.")
 
         attrs["invitation"] = inv
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import roles
+
+User = get_user_model()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        roles.invalidate([instance.pk])
+    elif pk_set:
+        roles.invalidate(pk_set)
+    else:
+        roles.invalidate()  # group.user_set.clear(): members unknown
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, created=False, **kwargs):
+    if not created:
+        roles.invalidate()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, created=False, **kwargs):
+    # is_active/is_staff/is_superuser may have changed: stop trusting claims in issued tokens
+    if not created:
+        roles.invalidate([instance.pk])
@@ -0,0 +1,92 @@
+"""Token revocation (logout) and role claims that stop being trusted once the user's groups change."""
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from apps.accounts.authentication import ClaimsUser, RoleClaimJWTAuthentication, StatelessJWTAuthentication
+from apps.accounts.permissions import in_group
+from apps.accounts.tokens import RoleRefreshToken
+
+User = get_user_model()
+
+USERS = "/api/accounts/users/"
+ME = "/api/accounts/me/"
+
+
+def _bearer(token):
+    return f"Bearer {token}"
+
+
+def _client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=_bearer(token))
+    return client
+
+
+@pytest.fixture
+def manager(make_user):
+    return make_user("auth-manager", "manager")
+
+
+def test_logout_revokes_access_and_refresh_tokens(manager):
+    refresh = RoleRefreshToken.for_user(manager)
+    access = refresh.access_token
+    client = _client(access)
+    assert client.get(ME).status_code == 200
+
+    assert client.post("/api/accounts/logout/", {"refresh": str(refresh)}, format="json").status_code == 204
+
+    response = client.get(ME)
+    assert response.status_code == 401
+    assert response.json()["code"] == "token_revoked"
+    response = APIClient().post("/api/accounts/refresh/", {"refresh": str(refresh)}, format="json")
+    assert response.status_code == 401
+
+    # a new login is not affected
+    assert _client(RoleRefreshToken.for_user(manager).access_token).get(ME).status_code == 200
+
+
+def test_revoked_token_is_refused_on_the_async_path(manager):
+    access = RoleRefreshToken.for_user(manager).access_token
+    request = APIRequestFactory().get(ME, HTTP_AUTHORIZATION=_bearer(access))
+    aauthenticate = async_to_sync(RoleClaimJWTAuthentication().aauthenticate)
+    user, _ = aauthenticate(request)
+    assert user.pk == manager.pk
+
+    _client(access).post("/api/accounts/logout/")
+    with pytest.raises(InvalidToken, match="revoked"):
+        aauthenticate(request)
+
+
+def test_role_claims_are_dropped_after_a_group_change(manager):
+    client = _client(RoleRefreshToken.for_user(manager).access_token)
+    assert client.get(USERS).status_code == 200
+
+    manager.groups.remove(Group.objects.get(name="manager"))
+    # the token still says "manager"; the stamped change makes the groups come from the database
+    assert client.get(USERS).status_code == 403
+
+    manager.groups.add(Group.objects.get(name="manager"))
+    assert client.get(USERS).status_code == 200
+
+
+def test_stateless_auth_falls_back_to_the_database(manager):
+    token = RoleRefreshToken.for_user(manager).access_token
+    request = APIRequestFactory().get(ME, HTTP_AUTHORIZATION=_bearer(token))
+    auth = StatelessJWTAuthentication()
+
+    user, _ = auth.authenticate(request)
+    assert isinstance(user, ClaimsUser)
+    assert user._grp_upper == {"MANAGER"}
+
+    manager.groups.clear()
+    user, _ = auth.authenticate(request)
+    assert isinstance(user, User)
+    assert not in_group(user, "manager")
+
+    User.objects.filter(pk=manager.pk).update(is_active=False)
+    with pytest.raises(AuthenticationFailed, match="inactive"):
+        auth.authenticate(request)
@@ -0,0 +1,64 @@
+"""``POST /api/accounts/invitations/bulk/``: per-row results, bulk inserts and their outbox mail."""
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from apps.accounts.bulk import MAX_INVITES
+from apps.accounts.models import EmailOutbox, Invitation
+from minishop.querybudget import count_queries
+
+BULK = "/api/accounts/invitations/bulk/"
+
+
+def test_reports_each_row(client_for, make_user):
+    client = client_for("admin")
+    make_user("Taken")  # Taken@example.com
+    Invitation.objects.create(email="pending@example.com", role="staff", invited_by=client.user,
+                              expires_at=timezone.now() + timezone.timedelta(days=1))
+    rows = [
+        {"email": "new@example.com", "role": "Staff"},
+        {"email": "not-an-email", "role": "staff"},
+        {"email": "other@example.com", "role": "owner"},
+        {"email": "NEW@example.com", "role": "manager"},
+        {"email": "taken@EXAMPLE.com", "role": "staff"},
+        {"email": "Pending@example.com", "role": "staff"},
+        {"email": "second@example.com", "role": "manager"},
+    ]
+    response = client.post(BULK, rows, format="json")
+    assert response.status_code == 201
+    data = response.json()
+    assert (data["created"], data["skipped"]) == (2, 5)
+    assert [r["status"] for r in data["results"]] == [
+        "created", "invalid", "invalid", "duplicate", "registered", "pending", "created"]
+
+    created = Invitation.objects.filter(pk__in=[r["id"] for r in data["results"] if r["status"] == "created"])
+    assert sorted(created.values_list("email", "role", "invited_by_id")) == [
+        ("new@example.com", "staff", client.user.pk), ("second@example.com", "manager", client.user.pk)]
+    assert sorted(EmailOutbox.objects.filter(to_email__in=["new@example.com", "second@example.com"])
+                  .values_list("to_email", flat=True)) == ["new@example.com", "second@example.com"]
+
+
+def test_queries_do_not_grow_with_the_batch(client_for):
+    client = client_for("admin")
+    counts = []
+    for size in (2, 40):
+        rows = [{"email": f"bulk{size}-{i}@example.com", "role": "staff"} for i in range(size)]
+        with count_queries() as counter:
+            assert client.post(BULK, {"invitations": rows}, format="json").json()["created"] == size
+        counts.append(counter.count)
+    assert counts[0] == counts[1]
+
+
+def test_csv_upload(client_for):
+    client = client_for("admin")
+    upload = SimpleUploadedFile("invites.csv", b"\xef\xbb\xbfemail,role\ncsv1@example.com,staff\ncsv2@example.com,\n")
+    data = client.post(BULK, {"file": upload}, format="multipart").json()
+    assert [(r["email"], r["status"]) for r in data["results"]] == [
+        ("csv1@example.com", "created"), ("csv2@example.com", "invalid")]
+
+
+def test_refuses_bad_requests(client_for):
+    admin, manager = client_for("admin"), client_for("manager")
+    assert admin.post(BULK, [], format="json").status_code == 400
+    too_many = [{"email": f"x{i}@example.com", "role": "staff"} for i in range(MAX_INVITES + 1)]
+    assert admin.post(BULK, too_many, format="json").status_code == 400
+    assert manager.post(BULK, [{"email": "m@example.com", "role": "staff"}], format="json").status_code == 403
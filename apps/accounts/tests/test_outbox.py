@@ -0,0 +1,77 @@
+"""``deliver_batch`` against Django's locmem mail backend (``mail.outbox``)."""
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from apps.accounts.models import EmailOutbox
+from apps.accounts.outbox import backoff, deliver_batch
+
+
+class BouncingBackend(EmailBackend):
+    """locmem backend that refuses mail to ``*@bounce.example``."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(to.endswith("@bounce.example") for to in message.to):
+                raise ConnectionError("550 mailbox unavailable")
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def outbox(db):
+    EmailOutbox.objects.all().delete()
+    mail.outbox = []
+
+
+def _queue(*emails):
+    return [EmailOutbox.objects.create(to_email=e, subject="Invitation", body=f"Hi {e}") for e in emails]
+
+
+def test_sends_due_mail(outbox):
+    ok, later = _queue("ok@example.com", "later@example.com")
+    EmailOutbox.objects.filter(pk=later.pk).update(next_attempt_at=timezone.now() + timezone.timedelta(hours=1))
+
+    assert deliver_batch() == {"sent": 1, "retry": 0, "failed": 0}
+    assert [m.to for m in mail.outbox] == [["ok@example.com"]]
+    ok.refresh_from_db()
+    assert (ok.status, ok.attempts, ok.last_error) == (EmailOutbox.SENT, 1, "")
+    assert ok.sent_at is not None
+    assert EmailOutbox.objects.get(pk=later.pk).status == EmailOutbox.PENDING
+
+
+def test_retries_with_backoff_then_fails(outbox):
+    ok, bounce = _queue("ok@example.com", "x@bounce.example")
+
+    before = timezone.now()
+    assert deliver_batch(max_attempts=2, mail_connection=BouncingBackend()) == {"sent": 1, "retry": 1, "failed": 0}
+    assert [m.to for m in mail.outbox] == [["ok@example.com"]]
+    bounce.refresh_from_db()
+    assert (bounce.status, bounce.attempts) == (EmailOutbox.PENDING, 1)
+    assert "550 mailbox unavailable" in bounce.last_error
+    assert bounce.next_attempt_at >= before + backoff(1)
+
+    # not due again until the backoff has passed
+    assert deliver_batch(max_attempts=2, mail_connection=BouncingBackend()) == {"sent": 0, "retry": 0, "failed": 0}
+
+    EmailOutbox.objects.filter(pk=bounce.pk).update(next_attempt_at=timezone.now())
+    assert deliver_batch(max_attempts=2, mail_connection=BouncingBackend()) == {"sent": 0, "retry": 0, "failed": 1}
+    bounce.refresh_from_db()
+    assert (bounce.status, bounce.attempts, bounce.sent_at) == (EmailOutbox.FAILED, 2, None)
+    assert len(mail.outbox) == 1
+
+    EmailOutbox.objects.filter(pk=bounce.pk).update(next_attempt_at=timezone.now())
+    assert deliver_batch(max_attempts=2, mail_connection=BouncingBackend()) == {"sent": 0, "retry": 0, "failed": 0}
+
+
+def test_connection_failure_retries_the_batch(outbox):
+    rows = _queue("a@example.com", "b@example.com")
+
+    class Down(EmailBackend):
+        def open(self):
+            raise ConnectionRefusedError("smtp down")
+
+    assert deliver_batch(mail_connection=Down()) == {"sent": 0, "retry": 2, "failed": 0}
+    assert mail.outbox == []
+    assert {r.last_error for r in EmailOutbox.objects.filter(pk__in=[r.pk for r in rows])} == {
+        "ConnectionRefusedError: smtp down"}
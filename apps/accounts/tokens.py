@@ -0,0 +1,50 @@
+import time
+
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import revocation, roles
+
+User = get_user_model()
+
+USER_CLAIMS = ("username", "is_staff", "is_superuser")
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry `role`, `groups` and USER_CLAIMS, enough
+    for RBAC and StatelessJWTAuthentication without loading the user row.
+    """
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return access
+        read_at = time.time()  # before the reads; see roles.changed_since
+        flags = User.objects.filter(pk=user_id).values(*USER_CLAIMS).first()
+        if flags is not None:
+            access.payload.update(flags)
+            names = sorted(roles.group_names(user_id, fresh=True))
+            access["groups"] = names
+            access["role"] = roles.role_of(names).lower()
+            access["roles_at"] = read_at
+            access.set_iat()
+        return access
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
+
+    def validate(self, attrs):
+        if revocation.is_revoked(self.token_class(attrs["refresh"])):
+            raise InvalidToken({"detail": "Token has been revoked.", "code": "token_revoked"})
+        return super().validate(attrs)
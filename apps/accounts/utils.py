@@ -1,13 +1,25 @@
-from django.core.mail import send_mail
 from django.conf import settings
 
-def send_invitation_email(email: str, token: str):
+from .models import EmailOutbox
+
+
+def invitation_message(token: str) -> tuple[str, str]:
     base = getattr(settings, "FRONTEND_BASE_URL", "http://localhost:3000")
     link = f"{base}/accept?token={token}"
-    send_mail(
-        subject="Invitation",
-        message=f"Open this link to accept: {link}",
+    return "Invitation", f"Open this link to accept: {link}"
+
+
+def invitation_outbox(invitation) -> EmailOutbox:
+    """Unsaved outbox row for the invitation mail."""
+    subject, body = invitation_message(str(invitation.token))
+    return EmailOutbox(
+        to_email=invitation.email, subject=subject, body=body, invitation=invitation,
         from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
-        recipient_list=[email],
-        fail_silently=False,
     )
+
+
+def queue_invitation_email(invitation) -> EmailOutbox:
+    """Queue the invitation mail; call inside the transaction that writes the invitation."""
+    row = invitation_outbox(invitation)
+    row.save()
+    return row
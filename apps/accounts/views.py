@@ -1,15 +1,30 @@
+import io
+
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import aprefetch_related_objects, prefetch_related_objects
 from django.utils import timezone
 from rest_framework import status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes, authentication_classes
+from rest_framework.decorators import (
+    action, api_view, permission_classes, authentication_classes, throttle_classes,
+)
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.authentication import JWTAuthentication
-
-from .models import Invitation
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from minishop.admission import IPTokenBucketThrottle, UsernameTokenBucketThrottle, hashing_slot
+from minishop.timing import TimedViewMixin, phase
+from . import revocation
+from .bulk import MAX_INVITES, invite_many, read_csv
+from .models import Invitation, status_conditions
 from .permissions import (
     IsAdminOrManager,
     RBACUserPermission,
@@ -19,48 +34,139 @@ from .serializers import (
     InvitationSerializer,
     AcceptInvitationSerializer, UserMeSerializer,
 )
-from .utils import send_invitation_email
+from .utils import queue_invitation_email
 
 User = get_user_model()
 
 
-class CurrentUserView(APIView):
+class CurrentUserView(TimedViewMixin, APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        return Response(UserMeSerializer(request.user).data)
+        user = request.user
+        if not isinstance(user, User):  # claims-only user (stateless auth): load the row
+            user = User.objects.get(pk=user.pk)
+        prefetch_related_objects([user], "groups")
+        return self.me_response(user)
+
+    async def aget(self, request):
+        user = request.user
+        if not isinstance(user, User):
+            user = await User.objects.aget(pk=user.pk)
+        await aprefetch_related_objects([user], "groups")
+        return self.me_response(user)
+
+    @staticmethod
+    def me_response(user):
+        user._grp_upper = {g.name.upper() for g in user.groups.all()}  # role from the same rows as groups
+        with phase("serialize"):
+            return Response(UserMeSerializer(user).data)
+
+
+class LoginView(TokenObtainPairView):
+    """TokenObtainPairView behind the admission throttles and the password-hashing slots."""
+    throttle_classes = [IPTokenBucketThrottle, UsernameTokenBucketThrottle]
+
+    def post(self, request, *args, **kwargs):
+        with hashing_slot("login"):
+            return super().post(request, *args, **kwargs)
 
 
 class LogoutView(APIView):
+    """Revoke the bearer access token and the `refresh` token in the body (either may be absent)."""
     permission_classes = [AllowAny]
+    authentication_classes = []  # an expired access token must not block revoking the refresh token
+
     def post(self, request):
+        auth = JWTAuthentication()
+        header = auth.get_header(request)
+        raw = auth.get_raw_token(header) if header else None
+        candidates = [(AccessToken, raw), (RefreshToken, request.data.get("refresh"))]
+        for token_class, value in candidates:
+            if not value:
+                continue
+            try:
+                revocation.revoke(token_class(value))
+            except TokenError:
+                pass  # invalid or expired: already unusable
         return Response(status=204)
 
 
-class UserViewSet(ModelViewSet):
-    queryset = User.objects.all().order_by("-id")
+class UserViewSet(TimedViewMixin, ModelViewSet):
+    queryset = User.objects.prefetch_related("groups").order_by("-id")
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated,IsAdminOrManager]
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ["username", "email", "first_name", "last_name"]
     ordering_fields = ["id", "username", "email"]
+    replica_reads = True
 
+    def get_throttles(self):
+        if self.action in ("create", "update", "partial_update"):
+            return [IPTokenBucketThrottle()]
+        return super().get_throttles()
+
+    # create/update hash the password (set_password); only those take a slot
+    def perform_create(self, serializer):
+        with hashing_slot("user-create"):
+            serializer.save()
 
-class InvitationViewSet(viewsets.ModelViewSet):
+    def perform_update(self, serializer):
+        if "password" not in serializer.validated_data:
+            serializer.save()
+            return
+        with hashing_slot("user-update"):
+            serializer.save()
+
+
+class InvitationViewSet(TimedViewMixin, viewsets.ModelViewSet):
     queryset = Invitation.objects.all().order_by("-created_at")
     serializer_class = InvitationSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = [IsAuthenticated, RBACUserPermission]
 
+    def get_queryset(self):
+        qs = super().get_queryset().with_status()
+        if self.action != "list":
+            return qs
+        # ?status=pending,expired — filtered in SQL (the open-invitation partial index covers pending)
+        wanted = [s for s in self.request.query_params.get("status", "").split(",") if s]
+        unknown = set(wanted) - set(status_conditions())
+        if unknown:
+            raise ValidationError({"status": [f"Unknown status: {', '.join(sorted(unknown))}."]})
+        return qs.by_status(*wanted) if wanted else qs
+
     def perform_create(self, serializer):
-        obj = serializer.save(invited_by=self.request.user)
-        send_invitation_email(obj.email, obj.token)
+        with transaction.atomic():  # invitation + its outbox row, or neither
+            obj = serializer.save(invited_by_id=self.request.user.pk)
+            queue_invitation_email(obj)
+
+    @action(detail=False, methods=["post"], url_path="bulk",
+            parser_classes=[JSONParser, MultiPartParser])
+    def bulk(self, request):
+        """JSON `[{"email", "role"}]` (or `{"invitations": [...]}`) or a multipart CSV `file`."""
+        upload = request.FILES.get("file")
+        if upload is not None:
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            try:
+                rows = read_csv(stream)
+            except UnicodeDecodeError:
+                return Response({"file": ["File is not valid UTF-8 text."]}, status=400)
+            finally:
+                stream.detach()
+        else:
+            rows = request.data.get("invitations") if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            return Response({"invitations": ["Expected a non-empty list or a CSV file."]}, status=400)
+        if len(rows) > MAX_INVITES:
+            return Response({"invitations": [f"At most {MAX_INVITES} per request."]}, status=400)
+        report = invite_many(rows, invited_by_id=request.user.pk)
+        return Response(report, status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"])
     def resend(self, request, pk=None):
         inv = self.get_object()
         if not inv.is_active():
             return Response({"detail": "Invitation is not active (revoked/used/expired)."}, status=400)
-        send_invitation_email(inv.email, str(inv.token))
+        queue_invitation_email(inv)
         return Response({"detail": "Resent."})
 
     @action(detail=True, methods=["post"])
@@ -78,6 +184,7 @@ class InvitationViewSet(viewsets.ModelViewSet):
 @api_view(["POST"])
 @permission_classes([AllowAny])
 @authentication_classes([])
+@throttle_classes([IPTokenBucketThrottle])
 def accept_invitation(request):
     ser = AcceptInvitationSerializer(data=request.data)
     ser.is_valid(raise_exception=True)
@@ -91,7 +198,8 @@ def accept_invitation(request):
     if not inv.is_active():
         return Response({"detail": "Invitation is not active."}, status=400)
 
-    user = ser.save()
+    with hashing_slot("invitation-accept"):
+        user = ser.save()
     return Response(
         {"id": user.id, "username": user.username, "email": user.email},
         status=status.HTTP_201_CREATED,
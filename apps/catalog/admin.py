@@ -1,9 +1,21 @@
 from django.contrib import admin
+
+from minishop.adminpaging import EstimatedCountPaginator
 from .models import Product
+from .search import search_products
+
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ("sku","name","price","stock","is_active","created_at")
     list_filter = ("is_active",)
-    search_fields = ("sku","name")
+    search_fields = ("sku","name")  # shows the search box; matching is search_products (FTS + sku index)
     ordering = ("-created_at",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # also serves the autocomplete widgets on order items
+        if not search_term.strip():
+            return queryset, False
+        return search_products(queryset, search_term), False
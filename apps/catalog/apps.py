@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CatalogConfig(AppConfig):
+    name = "apps.catalog"
+    label = "catalog"
+
+    def ready(self):
+        from minishop.sharedcache import require_shared
+        from . import signals  # noqa: F401
+        from .cache import CACHE_ALIAS
+
+        # a product saved on one worker bumps the version every worker keys its pages on
+        require_shared(CACHE_ALIAS, f"Catalog cache (CACHES[{CACHE_ALIAS!r}])")
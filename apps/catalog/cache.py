@@ -0,0 +1,76 @@
+"""
+Versioned read-through cache for the product API.
+
+List responses are keyed by the request's query string plus a catalog version
+that is bumped whenever a product changes, so stale pages are never looked up
+again and simply age out of the LRU/TTL cache. Detail responses are keyed by
+``updated_at`` and need no version at all.
+"""
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.utils.http import parse_etags
+
+CACHE_ALIAS = "catalog"
+VERSION_KEY = "catalog:version"
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def catalog_version() -> int:
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # seed from the clock so an evicted counter never reuses an old version
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def acatalog_version() -> int:
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1("\x1f".join(map(str, parts)).encode()).hexdigest()
+
+
+def list_cache_key(request, version=None) -> str:
+    """Key of the list page for ``request`` (``version``: the catalog version, when already read)."""
+    version = catalog_version() if version is None else version
+    params = sorted(request.query_params.lists())
+    return f"catalog:list:{version}:{_digest(request.get_host(), request.path, params)}"
+
+
+def detail_cache_key(pk, updated_at) -> str:
+    return f"catalog:detail:{pk}:{updated_at.timestamp()}"
+
+
+def detail_etag(pk, updated_at) -> str:
+    return f'"{_digest(pk, updated_at.isoformat())}"'
+
+
+def list_etag(data) -> str:
+    rows = data["results"] if isinstance(data, dict) else data
+    return '"%s"' % _digest(*("%s:%s" % (r["id"], r["updated_at"]) for r in rows))
+
+
+def etag_matches(request, etag) -> bool:
+    wanted = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in wanted or etag in wanted
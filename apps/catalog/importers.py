@@ -0,0 +1,185 @@
+"""
+Streaming product import keyed on SKU.
+
+Rows are parsed one at a time from CSV or JSON Lines, validated with the same
+rule as ``ProductSerializer`` and upserted in batches with
+``bulk_create(update_conflicts=True)``, so memory stays bounded by the batch
+size regardless of file length. Bytes that aren't UTF-8 stop the import: the
+report says so and marks itself ``aborted`` (earlier batches stay upserted).
+"""
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from .cache import bump_catalog_version
+from .models import Product
+from .serializers import check_active_price
+
+FORMATS = ("csv", "jsonl")
+UPDATE_FIELDS = ["name", "price", "stock", "is_active", "updated_at"]
+DEFAULT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+_TRUE = {"1", "true", "t", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n"}
+_MAX_PRICE = Decimal(10) ** 10
+_SKU_LENGTH = Product._meta.get_field("sku").max_length
+_NAME_LENGTH = Product._meta.get_field("name").max_length
+_INTEGER = serializers.IntegerField()
+
+
+class RowError(Exception):
+    pass
+
+
+def guess_format(filename: str, default="csv") -> str:
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line_number, row_or_error)`` from a text stream."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield number, RowError(f"Invalid JSON: {exc}")
+                continue
+            yield number, row if isinstance(row, dict) else RowError("Expected a JSON object.")
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}; expected one of {FORMATS}.")
+
+
+def _text(row, key, max_length, required=True):
+    value = str(row.get(key) or "").strip()
+    if required and not value:
+        raise RowError(f"{key}: this field is required.")
+    if len(value) > max_length:
+        raise RowError(f"{key}: ensure this field has no more than {max_length} characters.")
+    return value
+
+
+def _bool(value, default=True):
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if not value:
+        return default
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise RowError("is_active: must be a boolean.")
+
+
+def parse_row(row) -> Product:
+    if isinstance(row, RowError):
+        raise row
+    sku = _text(row, "sku", _SKU_LENGTH)
+    name = _text(row, "name", _NAME_LENGTH)
+    try:
+        price = Decimal(str(row.get("price")).strip())
+    except (InvalidOperation, ValueError):
+        raise RowError("price: a valid number is required.")
+    if not price.is_finite() or price < 0 or price >= _MAX_PRICE or price.as_tuple().exponent < -2:
+        raise RowError("price: must be between 0 and 9999999999.99 with at most 2 decimals.")
+    try:
+        # parsed like the API's IntegerField: 3 and "3.0" pass, 3.7 is an error rather than truncated to 3
+        stock = _INTEGER.to_internal_value(row.get("stock") or 0)
+    except serializers.ValidationError:
+        raise RowError("stock: a valid integer is required.")
+    if stock < 0:
+        raise RowError("stock: must be >= 0.")
+    is_active = _bool(row.get("is_active"))
+    try:
+        check_active_price(price, is_active)
+    except serializers.ValidationError as exc:
+        raise RowError("; ".join(str(d) for d in exc.detail))
+    return Product(sku=sku, name=name, price=price, stock=stock, is_active=is_active)
+
+
+class ImportReport:
+    def __init__(self, max_errors=MAX_REPORTED_ERRORS):
+        self.rows = 0
+        self.upserted = 0
+        self.error_count = 0
+        self.errors = []
+        self.max_errors = max_errors
+        self.aborted = False
+
+    def error(self, line, message, sku=None):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "sku": sku, "error": message})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "upserted": self.upserted,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "errors_truncated": self.error_count > len(self.errors),
+        }
+
+
+def import_products(stream, fmt="csv", batch_size=DEFAULT_BATCH_SIZE, max_errors=MAX_REPORTED_ERRORS):
+    report = ImportReport(max_errors)
+    rows = read_rows(stream, fmt)
+    try:
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                break
+            _import_batch(chunk, report)
+    except UnicodeDecodeError:
+        report.aborted = True
+        report.error(None, f"File is not valid UTF-8 text; import stopped after row {report.rows}.")
+    finally:
+        if report.upserted:
+            bump_catalog_version()  # bulk_create bypasses the post_save signal
+    return report
+
+
+def _import_batch(chunk, report):
+    batch = {}  # sku -> (line, product); later rows for the same SKU win
+    for line, row in chunk:
+        report.rows += 1
+        try:
+            product = parse_row(row)
+        except RowError as exc:
+            sku = row.get("sku") if isinstance(row, dict) else None
+            report.error(line, str(exc), sku)
+            continue
+        batch[product.sku] = (line, product)
+    if not batch:
+        return
+    try:
+        with transaction.atomic():
+            Product.objects.bulk_create(
+                [p for _, p in batch.values()],
+                update_conflicts=True,
+                unique_fields=["sku"],
+                update_fields=UPDATE_FIELDS,
+            )
+    except DatabaseError as exc:
+        for line, product in batch.values():
+            report.error(line, f"Database error: {exc}", product.sku)
+        return
+    report.upserted += len(batch)
@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.catalog.models import Product
+from apps.catalog.serializers import ProductSerializer
+from apps.orders.models import Order
+from apps.orders.serializers import OrderSerializer
+from minishop.renderers import FastJSONRenderer
+from minishop.rowserializers import RowSerializer
+
+TARGETS = {
+    "products": (Product, ProductSerializer, ()),
+    "orders": (Order, OrderSerializer, ("items",)),
+}
+
+
+class Command(BaseCommand):
+    help = ("Time list serialization of existing rows: DRF serializer + JSONRenderer against "
+            "RowSerializer + FastJSONRenderer, and check both produce the same bytes. Read-only.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--only", choices=sorted(TARGETS))
+
+    def handle(self, *args, **opts):
+        for name, (model, serializer_class, prefetch) in TARGETS.items():
+            if opts["only"] and name != opts["only"]:
+                continue
+            ids = list(model.objects.order_by("-pk").values_list("pk", flat=True)[:opts["rows"]])
+            if not ids:
+                raise CommandError(f"No {name} to serialize; run seed_data first.")
+            queryset = model.objects.filter(pk__in=ids).order_by("-pk")
+            fast = RowSerializer(serializer_class)
+            if not fast.supported:
+                raise CommandError(f"{serializer_class.__name__} is not supported by RowSerializer.")
+
+            drf = (
+                lambda: list(queryset.prefetch_related(*prefetch)),
+                lambda objs: serializer_class(objs, many=True).data,
+                JSONRenderer().render,
+            )
+            # the fast path's child query runs inside serialize (DRF's prefetch is part of fetch)
+            rows = (lambda: list(fast.rows(queryset)), fast.serialize, FastJSONRenderer().render)
+            slow_ms, slow_bytes = self.timed(drf, opts["repeat"])
+            fast_ms, fast_bytes = self.timed(rows, opts["repeat"])
+            same = "match" if slow_bytes == fast_bytes else "MISMATCH"
+            self.stdout.write(f"{name:<9} {len(ids):>7} rows  {len(slow_bytes) / 1024:8.0f} KiB  ({same})")
+            for label, (fetch, serialize, render) in (("drf", slow_ms), ("fast", fast_ms)):
+                self.stdout.write(f"  {label:<5} fetch={fetch:8.1f} ms  serialize={serialize:8.1f} ms  "
+                                  f"render={render:7.1f} ms  total={fetch + serialize + render:8.1f} ms")
+            self.stdout.write(
+                f"  speedup x{sum(slow_ms) / max(sum(fast_ms), 0.001):.1f} total, "
+                f"x{(slow_ms[0] + slow_ms[1]) / max(fast_ms[0] + fast_ms[1], 0.001):.1f} fetch+serialize, "
+                f"x{slow_ms[2] / max(fast_ms[2], 0.001):.1f} render")
+            if same != "match":
+                raise CommandError(f"{name}: fast path output differs from the DRF serializer")
+
+    def timed(self, steps, repeat):
+        """p50 ms of each step (fetch, serialize, render) and the rendered bytes."""
+        fetch, serialize, render = steps
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            objs = fetch()
+            t1 = time.perf_counter()
+            data = serialize(objs)
+            t2 = time.perf_counter()
+            body = render(data)
+            samples.append((t1 - t0, t2 - t1, time.perf_counter() - t2))
+        return [statistics.median(column) * 1000 for column in zip(*samples)], body
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.catalog.importers import (
+    DEFAULT_BATCH_SIZE, FORMATS, MAX_REPORTED_ERRORS, guess_format, import_products,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or JSON Lines product feed and upsert it on SKU."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--max-errors", type=int, default=MAX_REPORTED_ERRORS,
+                            help="Errors kept in the report.")
+
+    def handle(self, *args, **opts):
+        fmt = opts["format"] or guess_format(opts["path"])
+        try:
+            with open(opts["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_products(stream, fmt, opts["batch_size"], opts["max_errors"])
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for err in report.errors:
+            self.stderr.write(json.dumps(err))
+        summary = f"{report.rows} rows, {report.upserted} upserted, {report.error_count} errors"
+        style = self.style.WARNING if report.error_count else self.style.SUCCESS
+        self.stdout.write(style(summary))
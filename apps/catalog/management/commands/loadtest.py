@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+SERVERS = {
+    "wsgi": "gunicorn minishop.wsgi:application --bind {host}:{port} --workers {workers} --threads {threads}",
+    "asgi": "uvicorn minishop.asgi:application --host {host} --port {port} --workers {workers} --no-access-log",
+}
+
+
+class Command(BaseCommand):
+    help = ("HTTP load test against a running server (keep-alive connections, stdlib asyncio client). "
+            "Reports req/s and p50/p95/p99 latency. With --server wsgi|asgi|both it starts gunicorn/uvicorn "
+            "on --port itself (override with --wsgi-cmd/--asgi-cmd) and compares them on the same path.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", nargs="?", default="http://127.0.0.1:8765/api/catalog/products/")
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=20000)
+        parser.add_argument("--warmup", type=int, default=500)
+        parser.add_argument("--token", help="Bearer token; otherwise --username/--password log in first.")
+        parser.add_argument("--username")
+        parser.add_argument("--password")
+        parser.add_argument("--server", choices=["none", "wsgi", "asgi", "both"], default="none")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker (WSGI).")
+        parser.add_argument("--wsgi-cmd", default=SERVERS["wsgi"])
+        parser.add_argument("--asgi-cmd", default=SERVERS["asgi"])
+
+    def handle(self, *args, **opts):
+        url = urlsplit(opts["url"])
+        if url.scheme != "http":
+            raise CommandError("Only plain http:// URLs are supported.")
+        modes = {"none": [None], "both": ["wsgi", "asgi"]}.get(opts["server"], [opts["server"]])
+        results = {}
+        for mode in modes:
+            server = self.start(mode, url, opts) if mode else None
+            try:
+                token = opts["token"] or self.login(url, opts)
+                results[mode or url.netloc] = asyncio.run(self.run(url, token, opts))
+            finally:
+                if server:
+                    server.terminate()
+                    server.wait(10)
+
+        self.stdout.write(f"{'server':<16}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}  status")
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<16}{r['rps']:>10.1f}{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}{r['max']:>9.1f}"
+                f"  {dict(r['status'])}"
+            )
+
+    def start(self, mode, url, opts):
+        cmd = opts[f"{mode}_cmd"].format(host=url.hostname, port=url.port or 80,
+                                         workers=opts["workers"], threads=opts["threads"])
+        self.stdout.write(f"starting {mode}: {cmd}")
+        env = {**os.environ, "ASYNC_READ_VIEWS": "1" if mode == "asgi" else "0"}
+        proc = subprocess.Popen(shlex.split(cmd), env=env, stdout=subprocess.DEVNULL, stderr=sys.stderr)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise CommandError(f"{mode} server exited with {proc.returncode}")
+            try:
+                socket.create_connection((url.hostname, url.port or 80), timeout=0.5).close()
+                return proc
+            except OSError:
+                time.sleep(0.2)
+        proc.terminate()
+        raise CommandError(f"{mode} server did not start listening within 30s")
+
+    def login(self, url, opts):
+        if not opts["username"]:
+            return None
+        body = json.dumps({"username": opts["username"], "password": opts["password"]}).encode()
+        req = urllib.request.Request(f"http://{url.netloc}/api/accounts/login/", data=body,
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return json.load(resp)["access"]
+
+    async def run(self, url, token, opts):
+        path = url.path + (f"?{url.query}" if url.query else "")
+        head = f"GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\nAccept: application/json\r\n"
+        if token:
+            head += f"Authorization: Bearer {token}\r\n"
+        request = (head + "\r\n").encode()
+        host, port = url.hostname, url.port or 80
+
+        await self.blast(host, port, request, opts["warmup"], min(opts["concurrency"], 50))
+        started = time.perf_counter()
+        latencies, status = await self.blast(host, port, request, opts["requests"], opts["concurrency"])
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+        return {"rps": len(latencies) / elapsed, "p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99),
+                "max": pct(1.0), "status": status}
+
+    async def blast(self, host, port, request, total, concurrency):
+        latencies, status = [], Counter()
+        remaining = [total]
+
+        async def client():
+            conn = None
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                start = time.perf_counter()
+                try:
+                    if conn is None:
+                        conn = await asyncio.open_connection(host, port)
+                    code, keep_alive = await _exchange(*conn, request)
+                except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    status["error"] += 1
+                    conn = _close(conn)
+                    continue
+                latencies.append(time.perf_counter() - start)
+                status[code] += 1
+                if not keep_alive:
+                    conn = _close(conn)
+            _close(conn)
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return latencies, status
+
+
+async def _exchange(reader, writer, request):
+    writer.write(request)
+    await writer.drain()
+    code = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    elif "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    return code, headers.get("connection", "").lower() != "close"
+
+
+def _close(conn):
+    if conn is not None:
+        conn[1].close()
+    return None
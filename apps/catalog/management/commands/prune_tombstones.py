@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.catalog.models import ProductTombstone
+from apps.orders.models import OrderTombstone
+from minishop.changes import get_changes_settings
+
+TOMBSTONES = (ProductTombstone, OrderTombstone)
+
+
+class Command(BaseCommand):
+    help = ("Delete changes-feed tombstones older than CHANGES_FEED['TOMBSTONE_DAYS'] (or --days), in batches. "
+            "Feed cursors older than that already get 410 and resync.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Defaults to CHANGES_FEED['TOMBSTONE_DAYS'].")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        days = opts["days"] if opts["days"] is not None else get_changes_settings()["TOMBSTONE_DAYS"]
+        cutoff = timezone.now() - timedelta(days=days)
+        for model in TOMBSTONES:
+            pruned = 0
+            while True:
+                ids = list(model.objects.filter(deleted_at__lt=cutoff).order_by("deleted_at", "id")
+                           .values_list("id", flat=True)[: opts["batch_size"]])
+                if not ids:
+                    break
+                model.objects.filter(pk__in=ids).delete()
+                pruned += len(ids)
+            self.stdout.write(f"{model._meta.label}: pruned {pruned} tombstones older than {cutoff:%Y-%m-%d}")
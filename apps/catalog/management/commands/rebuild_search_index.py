@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.catalog.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product search index from the catalog_product table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **opts):
+        alias = opts["database"]
+        get_backend(alias).rebuild(connections[alias])
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt on '{alias}'."))
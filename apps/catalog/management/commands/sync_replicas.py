@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from minishop.dbrouting import get_replica_settings
+
+
+class Command(BaseCommand):
+    help = ("Copy the primary SQLite database onto the SQLite replicas in DATABASE_REPLICAS "
+            "(local stand-in for replication, e.g. with DB_SQLITE_REPLICAS=2). With --every N it "
+            "keeps copying every N seconds, i.e. replicas lag the primary by up to N seconds.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=float, help="Repeat every N seconds until interrupted.")
+
+    def handle(self, *args, **opts):
+        conf = get_replica_settings()
+        if not conf["REPLICAS"]:
+            raise CommandError("No replicas configured (set DB_SQLITE_REPLICAS with the local settings).")
+        aliases = [conf["PRIMARY"], *conf["REPLICAS"]]
+        for alias in aliases:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"{alias} is not SQLite; real replicas are kept up to date by the database.")
+        while True:
+            self.sync(conf["PRIMARY"], conf["REPLICAS"])
+            if not opts["every"]:
+                return
+            time.sleep(opts["every"])
+
+    def sync(self, primary, replicas):
+        source = connections[primary]
+        source.ensure_connection()
+        for alias in replicas:
+            target = connections[alias]
+            target.ensure_connection()
+            started = time.perf_counter()
+            source.connection.backup(target.connection)
+            self.stdout.write(f"{alias}: copied from {primary} in {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+FTS_TABLE = "catalog_product_fts"
+
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE "{FTS_TABLE}" USING fts5(
+        name, content='catalog_product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER "{FTS_TABLE}_ai" AFTER INSERT ON "catalog_product" BEGIN
+        INSERT INTO "{FTS_TABLE}"(rowid, name) VALUES (new.id, new.name);
+    END""",
+    f"""CREATE TRIGGER "{FTS_TABLE}_ad" AFTER DELETE ON "catalog_product" BEGIN
+        INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}", rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    f"""CREATE TRIGGER "{FTS_TABLE}_au" AFTER UPDATE OF name ON "catalog_product" BEGIN
+        INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}", rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO "{FTS_TABLE}"(rowid, name) VALUES (new.id, new.name);
+    END""",
+    f"""INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}") VALUES ('rebuild')""",
+]
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS "{FTS_TABLE}_ai"',
+    f'DROP TRIGGER IF EXISTS "{FTS_TABLE}_ad"',
+    f'DROP TRIGGER IF EXISTS "{FTS_TABLE}_au"',
+    f'DROP TABLE IF EXISTS "{FTS_TABLE}"',
+]
+
+POSTGRES_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE INDEX IF NOT EXISTS "catalog_product_name_tsv_idx"
+        ON "catalog_product" USING GIN (to_tsvector('simple', "name"))""",
+    """CREATE INDEX IF NOT EXISTS "catalog_product_name_trgm_idx"
+        ON "catalog_product" USING GIN ("name" gin_trgm_ops)""",
+]
+POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS "catalog_product_name_tsv_idx"',
+    'DROP INDEX IF EXISTS "catalog_product_name_trgm_idx"',
+]
+
+
+def _run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql, params=None)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}),
+            _run({"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL}),
+        ),
+    ]
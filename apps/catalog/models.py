@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class Product(models.Model):
     name = models.CharField(max_length=160)
@@ -12,6 +13,14 @@ class Product(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # keyset pagination: each sortable column + id tiebreaker
+            models.Index(fields=["created_at", "id"], name="product_created_id_idx"),
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+            models.Index(fields=["stock", "id"], name="product_stock_id_idx"),
+            # changes feed: (updated_at, id) keyset
+            models.Index(fields=["updated_at", "id"], name="product_updated_id_idx"),
+        ]
         constraints = [
             models.CheckConstraint(check=models.Q(price__gte=0), name="product_price_gte_0"),
             models.CheckConstraint(check=models.Q(stock__gte=0), name="product_stock_gte_0"),
@@ -19,3 +28,12 @@ class Product(models.Model):
 
     def __str__(self):
         return f"{self.sku} - {self.name}"
+
+
+class ProductTombstone(models.Model):
+    """Id of a deleted product, for the changes feed (written on post_delete, see prune_tombstones)."""
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["deleted_at", "id"], name="product_tomb_deleted_id_idx")]
@@ -0,0 +1,153 @@
+"""
+Indexed product search.
+
+Names are matched through a full-text index (FTS5 on SQLite, tsvector + pg_trgm
+on PostgreSQL) and SKUs through range scans on the unique ``sku`` index, so no
+query falls back to ``LIKE '%term%'``. Matches are annotated with
+``search_rank`` (higher is better).
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Product
+
+FTS_TABLE = "catalog_product_fts"
+PG_TSV_INDEX = "catalog_product_name_tsv_idx"
+PG_TRGM_INDEX = "catalog_product_name_trgm_idx"
+
+SKU_EXACT_BOOST = 1000.0
+SKU_PREFIX_BOOST = 100.0
+MAX_TOKENS = 8
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(term: str) -> list[str]:
+    return _TOKEN_RE.findall(term.lower())[:MAX_TOKENS]
+
+
+def _col(name):
+    return f'"{Product._meta.db_table}"."{name}"'
+
+
+class SqliteSearchBackend:
+    def match(self, term, tokens):
+        query = " ".join(f'"{t}"*' for t in tokens)
+        fts = f'"{FTS_TABLE}"'
+        hit = RawSQL(
+            f"{_col('id')} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)",
+            (query,), output_field=BooleanField(),
+        )
+        # bm25 rank is negative (lower is better); flip it so higher wins
+        rank = RawSQL(
+            f"(SELECT -rank FROM {fts} WHERE {fts} MATCH %s AND rowid = {_col('id')})",
+            (query,), output_field=FloatField(),
+        )
+        return hit, rank
+
+    def rebuild(self, connection):
+        with connection.cursor() as cur:
+            cur.execute(f'INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}") VALUES (\'rebuild\')')
+            cur.execute(f'INSERT INTO "{FTS_TABLE}"("{FTS_TABLE}") VALUES (\'optimize\')')
+
+
+class PostgresSearchBackend:
+    document = f"to_tsvector('simple', {_col('name')})"
+
+    def match(self, term, tokens):
+        tsquery = " & ".join(f"{t}:*" for t in tokens)
+        hit = RawSQL(
+            f"({self.document} @@ to_tsquery('simple', %s) OR {_col('name')} %% %s)",
+            (tsquery, term), output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"GREATEST(ts_rank({self.document}, to_tsquery('simple', %s)), similarity({_col('name')}, %s))",
+            (tsquery, term), output_field=FloatField(),
+        )
+        return hit, rank
+
+    def rebuild(self, connection):
+        with connection.cursor() as cur:
+            cur.execute(f'REINDEX INDEX "{PG_TSV_INDEX}"')
+            cur.execute(f'REINDEX INDEX "{PG_TRGM_INDEX}"')
+            cur.execute(f'ANALYZE "{Product._meta.db_table}"')
+
+
+class FallbackSearchBackend:
+    def match(self, term, tokens):
+        hit = Q()
+        for t in tokens:
+            hit &= Q(name__icontains=t)
+        return hit, Value(0.0)
+
+    def rebuild(self, connection):
+        pass
+
+
+BACKENDS = {
+    "sqlite": SqliteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_backend(alias="default"):
+    return BACKENDS.get(connections[alias].vendor, FallbackSearchBackend)()
+
+
+def search_products(queryset, term: str):
+    term = term.strip()
+    tokens = tokenize(term)
+
+    # exact/prefix SKU lookups stay on the unique index as range scans
+    sku_exact = Q()
+    sku_prefix = Q()
+    for variant in {term, term.upper()}:
+        sku_exact |= Q(sku=variant)
+        sku_prefix |= Q(sku__gte=variant, sku__lt=variant + "\U0010ffff")
+
+    condition = sku_prefix
+    rank = Value(0.0)
+    if tokens:
+        hit, name_rank = get_backend(queryset.db).match(term, tokens)
+        condition |= Q(hit)
+        rank = Coalesce(name_rank, Value(0.0))
+
+    return queryset.filter(condition).annotate(search_rank=Case(
+        When(sku_exact, then=Value(SKU_EXACT_BOOST)),
+        When(sku_prefix, then=Value(SKU_PREFIX_BOOST)),
+        default=rank,
+        output_field=FloatField(),
+    ))
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    """
+    Drop-in for ``SearchFilter`` on products. Orders by relevance unless the
+    client asked for an explicit ``?ordering=``, so it must run after
+    ``OrderingFilter``.
+    """
+    search_param = "search"
+    ordering_param = "ordering"
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        queryset = search_products(queryset, term)
+        if not request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by("-search_rank", "-id")
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            "name": self.search_param,
+            "required": False,
+            "in": "query",
+            "description": "Full-text search on name, exact/prefix match on SKU.",
+            "schema": {"type": "string"},
+        }]
@@ -1,14 +1,23 @@
 from rest_framework import serializers
+
+from minishop.timing import TimedSerializerMixin
 from .models import Product
 
-class ProductSerializer(serializers.ModelSerializer):
+ZERO_PRICE_MESSAGE = "Produk aktif tidak boleh berharga 0."
+
+
+def check_active_price(price, is_active):
+    # contoh validasi bisnis ringan
+    if price == 0 and is_active:
+        raise serializers.ValidationError(ZERO_PRICE_MESSAGE)
+
+
+class ProductSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ["id","name","sku","price","stock","is_active","created_at","updated_at"]
         read_only_fields = ["id","created_at","updated_at"]
 
     def validate(self, attrs):
-        # contoh validasi bisnis ringan
-        if attrs.get("price", 0) == 0 and attrs.get("is_active", True):
-            raise serializers.ValidationError("Produk aktif tidak boleh berharga 0.")
+        check_active_price(attrs.get("price", 0), attrs.get("is_active", True))
         return attrs
@@ -0,0 +1,64 @@
+"""Product read cache: ETags, 304s and invalidation when a product changes."""
+from decimal import Decimal
+
+import pytest
+from django.test import TestCase
+
+from apps.catalog.models import Product
+from apps.orders.stock import adjust_stock
+
+LIST = "/api/catalog/products/"
+
+
+@pytest.fixture
+def product(db):
+    return Product.objects.create(name="Cached widget", sku="CACHE-1", price=Decimal("4.00"), stock=3)
+
+
+@pytest.fixture
+def client(client_for):
+    return client_for("staff")
+
+
+def test_detail_etag(client, product):
+    url = f"{LIST}{product.pk}/"
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first["ETag"]
+
+    again = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert (again.status_code, again["ETag"], again.content) == (304, etag, b"")
+
+    product.price = Decimal("5.00")
+    product.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+    assert changed.json()["price"] == "5.00"
+
+
+def test_list_cache_is_invalidated_by_saves(client, product):
+    params = {"search": "CACHE-"}
+    first = client.get(LIST, params)
+    assert first.status_code == 200
+    etag = first["ETag"]
+    assert client.get(LIST, params, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # the catalog version is bumped on commit; without the bump the cached page is served
+    product.name = "Renamed widget"
+    with TestCase.captureOnCommitCallbacks(execute=True) as callbacks:
+        product.save()
+    assert callbacks
+    changed = client.get(LIST, params, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+    assert [r["name"] for r in changed.json()["results"]] == ["Renamed widget"]
+
+
+def test_stock_updates_invalidate_the_list(client, product):
+    params = {"search": "CACHE-"}
+    assert client.get(LIST, params).json()["results"][0]["stock"] == 3
+    # queryset.update() sends no post_save; adjust_stock bumps the version itself
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        adjust_stock({product.pk: 2})
+    assert client.get(LIST, params).json()["results"][0]["stock"] == 1
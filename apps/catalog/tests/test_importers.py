@@ -0,0 +1,40 @@
+"""``import_products``: row validation and upserts on SKU."""
+import io
+import json
+
+import pytest
+
+from apps.catalog.importers import import_products
+from apps.catalog.models import Product
+
+
+def _jsonl(*rows):
+    return io.StringIO("".join(json.dumps(r) + "\n" for r in rows))
+
+
+@pytest.mark.parametrize("stock, expected", [(3, 3), ("4", 4), ("5.0", 5), (6.0, 6), (None, 0), ("", 0)])
+def test_accepts_integral_stock(db, stock, expected):
+    report = import_products(_jsonl({"sku": "IMP-1", "name": "Imported", "price": "1.00", "stock": stock}), "jsonl")
+    assert (report.upserted, report.errors) == (1, [])
+    assert Product.objects.get(sku="IMP-1").stock == expected
+
+
+@pytest.mark.parametrize("stock", [3.7, "3.7", "1e3", "many", True, -1])
+def test_rejects_other_stock(db, stock):
+    report = import_products(_jsonl({"sku": "IMP-1", "name": "Imported", "price": "1.00", "stock": stock}), "jsonl")
+    assert report.upserted == 0
+    assert report.errors[0]["error"].startswith("stock:")
+    assert not Product.objects.filter(sku="IMP-1").exists()
+
+
+def test_upserts_on_sku_and_reports_bad_rows(db):
+    Product.objects.create(sku="IMP-1", name="Old name", price="9.00", stock=1)
+    stream = io.StringIO("sku,name,price,stock\nIMP-1,New name,2.50,3.7\nIMP-1,New name,2.50,8\nIMP-2,,1.00,1\n")
+    report = import_products(stream, "csv")
+    assert report.as_dict() == {
+        "rows": 3, "upserted": 1, "error_count": 2, "errors_truncated": False, "errors": [
+            {"line": 2, "sku": "IMP-1", "error": "stock: a valid integer is required."},
+            {"line": 4, "sku": "IMP-2", "error": "name: this field is required."},
+        ],
+    }
+    assert Product.objects.values_list("name", "stock").get(sku="IMP-1") == ("New name", 8)
@@ -0,0 +1,65 @@
+"""Indexed product search: SKU boosts, full-text ranking and index sync on writes."""
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+
+from apps.catalog.models import Product
+from apps.catalog.search import SKU_EXACT_BOOST, SKU_PREFIX_BOOST, search_products
+
+
+@pytest.fixture
+def products(db):
+    names = {"SRCH-1": "Blue cotton shirt", "SRCH-10": "Blue blue blue", "SRCH-2": "Green wool scarf",
+             "SRCH-3": "Cotton"}
+    return {sku: Product.objects.create(name=name, sku=sku, price=Decimal("9.99"), stock=1)
+            for sku, name in names.items()}
+
+
+def _search(products, term):
+    qs = Product.objects.filter(pk__in=[p.pk for p in products.values()])
+    return [(p.sku, p.search_rank) for p in search_products(qs, term).order_by("-search_rank", "-id")]
+
+
+def test_exact_sku_then_prefix(products):
+    hits = _search(products, "srch-1")
+    assert hits == [("SRCH-1", SKU_EXACT_BOOST), ("SRCH-10", SKU_PREFIX_BOOST)]
+
+
+def test_name_matches_are_ranked(products):
+    hits = _search(products, "blue")
+    assert [sku for sku, _ in hits] == ["SRCH-10", "SRCH-1"]
+    assert hits[0][1] > hits[1][1] > 0
+
+    assert [sku for sku, _ in _search(products, "cott")] == ["SRCH-3", "SRCH-1"]  # prefix match
+    assert _search(products, "blue scarf") == []  # every token must match
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="trigram matching is PostgreSQL only")
+def test_trigram_matches_typos(products):
+    assert [sku for sku, _ in _search(products, "coton")][:1] == ["SRCH-3"]
+
+
+def test_index_follows_renames_and_deletes(products):
+    shirt = products["SRCH-1"]
+    shirt.name = "Red linen shirt"
+    shirt.save()
+    assert [sku for sku, _ in _search(products, "linen")] == ["SRCH-1"]
+    assert [sku for sku, _ in _search(products, "cotton")] == ["SRCH-3"]
+
+    # updates that leave the name alone keep the entry
+    Product.objects.filter(pk=shirt.pk).update(stock=7)
+    assert [sku for sku, _ in _search(products, "linen")] == ["SRCH-1"]
+
+    shirt.delete()
+    assert _search(products, "linen") == []
+
+
+def test_search_param_orders_by_relevance(client_for, products):
+    client = client_for("staff")
+    response = client.get("/api/catalog/products/", {"search": "blue"})
+    assert response.status_code == 200
+    assert [r["sku"] for r in response.json()["results"]] == ["SRCH-10", "SRCH-1"]
+
+    response = client.get("/api/catalog/products/", {"search": "blue", "ordering": "created_at"})
+    assert [r["sku"] for r in response.json()["results"]] == ["SRCH-1", "SRCH-10"]  # explicit ordering wins
@@ -1,7 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+
+from minishop.asyncviews import async_read_urls
 from .views import ProductViewSet
 
 router = DefaultRouter()
 router.register(r"products", ProductViewSet, basename="product")
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [path("", include(async_read_urls(router.urls)))]
@@ -1,19 +1,149 @@
-from rest_framework.filters import SearchFilter, OrderingFilter
+import io
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.accounts.permissions import RBACProductPermission
-from .models import Product
+from minishop import exports
+from minishop.asyncviews import AsyncReadMixin, Fallback
+from minishop.changes import ChangesFeedMixin
+from minishop.dbrouting import get_replica_settings, read_from_replica
+from minishop.rowserializers import FastReadMixin
+from minishop.timing import TimedViewMixin
+from .cache import (
+    acatalog_version, detail_cache_key, detail_etag, etag_matches, get_cache, list_cache_key, list_etag,
+)
+from .importers import FORMATS, guess_format, import_products
+from .models import Product, ProductTombstone
+from .search import ProductSearchFilter
 from .serializers import ProductSerializer
 
 
-class ProductViewSet(ModelViewSet):
+class ProductViewSet(TimedViewMixin, ChangesFeedMixin, FastReadMixin, AsyncReadMixin, ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = [IsAuthenticated, RBACProductPermission]
-    filter_backends = [SearchFilter, OrderingFilter]
-    search_fields = ["name", "sku"]
+    filter_backends = [OrderingFilter, ProductSearchFilter]
     ordering_fields = ["created_at", "price", "stock"]
     ordering = ["-created_at"]
+    replica_reads = True
+    tombstone_model = ProductTombstone
+
+    def list(self, request, *args, **kwargs):
+        key, hit = self._cached_list(request)
+        if hit is None:
+            hit = self._cache_list(key, super().list(request, *args, **kwargs).data)
+        return self._list_response(request, *hit)
+
+    async def alist(self, request, *args, **kwargs):
+        # the async cache API: a shared backend must not block the event loop
+        cache = get_cache()
+        key = list_cache_key(request, await acatalog_version())
+        hit = await cache.aget(key)
+        if hit is None:
+            data = (await super().alist(request, *args, **kwargs)).data
+            hit = (list_etag(data), data)
+            await cache.aset(key, hit, self._list_timeout())
+        return self._list_response(request, *hit)
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            updated_at = self._updated_at(pk).first()
+        except (DjangoValidationError, TypeError, ValueError):
+            updated_at = None
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)  # 404 path
+        etag = detail_etag(pk, updated_at)
+        if etag_matches(request, etag):
+            return self._not_modified(etag)
+        cache, key = get_cache(), detail_cache_key(pk, updated_at)
+        data = cache.get(key)
+        if data is None:
+            data = super().retrieve(request, *args, **kwargs).data
+            cache.set(key, data)
+        return Response(data, headers={"ETag": etag})
+
+    async def aretrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            updated_at = await self._updated_at(pk).afirst()
+        except (DjangoValidationError, TypeError, ValueError):
+            updated_at = None
+        if updated_at is None:
+            raise Fallback  # 404 path
+        etag = detail_etag(pk, updated_at)
+        if etag_matches(request, etag):
+            return self._not_modified(etag)
+        cache, key = get_cache(), detail_cache_key(pk, updated_at)
+        data = await cache.aget(key)
+        if data is None:
+            data = (await super().aretrieve(request, *args, **kwargs)).data
+            await cache.aset(key, data)
+        return Response(data, headers={"ETag": etag})
+
+    @staticmethod
+    def _cached_list(request):
+        key = list_cache_key(request)
+        return key, get_cache().get(key)
+
+    def _cache_list(self, key, data):
+        hit = (list_etag(data), data)
+        get_cache().set(key, hit, self._list_timeout())
+        return hit
+
+    @staticmethod
+    def _list_timeout():
+        # a lagging replica may predate the latest version bump: keep such pages only briefly
+        return get_replica_settings()["PIN_SECONDS"] if read_from_replica() else DEFAULT_TIMEOUT
+
+    def _list_response(self, request, etag, data):
+        if etag_matches(request, etag):
+            return self._not_modified(etag)
+        return Response(data, headers={"ETag": etag})
+
+    def _updated_at(self, pk):
+        return self.filter_queryset(self.get_queryset()).filter(pk=pk).values_list("updated_at", flat=True)
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"file": ["This field is required."]}, status=400)
+        fmt = request.data.get("fmt") or guess_format(upload.name)
+        if fmt not in FORMATS:
+            return Response({"fmt": [f"Expected one of {', '.join(FORMATS)}."]}, status=400)
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_products(stream, fmt)
+        finally:
+            stream.detach()
+        return Response(report.as_dict(), status=400 if report.aborted else 200)
+
+    @action(detail=False, methods=["get"], url_path="export",
+            content_negotiation_class=exports.ExportNegotiation)
+    def export(self, request):
+        fmt = request.query_params.get("fmt", "csv")
+        if fmt not in exports.FORMATS:
+            return Response({"fmt": [f"Expected one of {', '.join(exports.FORMATS)}."]}, status=400)
+        fields = ProductSerializer.Meta.fields
+        rows = (self.filter_queryset(self.get_queryset())
+                .values_list(*fields).iterator(chunk_size=exports.CHUNK_SIZE))
+        if fmt == "csv":
+            lines = exports.csv_lines(fields, rows)
+        else:
+            lines = exports.ndjson_lines(
+                {f: exports.format_value(v) for f, v in zip(fields, row)} for row in rows
+            )
+        return exports.streaming_export(lines, fmt, "products", request)
+
+    @staticmethod
+    def _not_modified(etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,120 @@
+from collections import Counter
+
+from django import forms
+from django.contrib import admin, messages
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import HttpResponseRedirect
+
+from minishop.adminpaging import EstimatedCountPaginator
+from .models import Order, OrderItem
+from .stock import InsufficientStock, held, move_stock
+
+
+class StatusFilter(admin.SimpleListFilter):
+    # fixed choices: the default filter for a plain CharField runs SELECT DISTINCT over the table
+    title = "status"
+    parameter_name = "status"
+
+    def lookups(self, request, model_admin):
+        return Order.Status.choices
+
+    def queryset(self, request, queryset):
+        return queryset.filter(status=self.value()) if self.value() else queryset
+
+
+class OrderItemFormSet(forms.BaseInlineFormSet):
+    def clean(self):
+        super().clean()
+        if any(self.errors):
+            return
+        lines = [{"product_id": f.cleaned_data["product"].pk, "qty": f.cleaned_data["qty"]}
+                 for f in self.forms if f.cleaned_data and not f.cleaned_data.get("DELETE")]
+        order = self.instance
+        before = Counter()
+        if order.pk:
+            before = held(order.items.all(), Order.objects.values_list("status", flat=True).get(pk=order.pk))
+        needed = held(lines, order.status)
+        needed.subtract(before)
+        stock = {f.cleaned_data["product"].pk: f.cleaned_data["product"].stock
+                 for f in self.forms if f.cleaned_data}
+        short = [pid for pid, d in needed.items() if d > 0 and stock.get(pid, 0) < d]
+        if short:
+            raise forms.ValidationError(f"Insufficient stock for products {', '.join(map(str, sorted(short)))}.")
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    formset = OrderItemFormSet
+    extra = 0
+    autocomplete_fields = ("product",)  # ProductAdmin search: FTS + sku index
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("product")
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "status", "item_count", "total_amount", "products", "created_at")
+    list_select_related = ("user",)
+    list_filter = (StatusFilter,)
+    search_fields = ("=id", "=user__username")  # exact matches stay on the pk / unique username index
+    raw_id_fields = ("user",)
+    readonly_fields = ("total_amount", "item_count", "created_at", "updated_at")
+    ordering = ("-pk",)  # same order as -created_at; with a status filter it walks (status, id)
+    inlines = [OrderItemInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith("_changelist"):
+            # SKUs for the products column: two queries per page, not one per row
+            qs = qs.prefetch_related(Prefetch("items", queryset=OrderItem.objects.select_related("product")
+                                              .only("order_id", "qty", "product_id", "product__sku")))
+        return qs
+
+    @admin.display(description="items")
+    def products(self, obj):
+        return ", ".join(f"{it.qty}x {it.product.sku}" for it in obj.items.all())
+
+    # stock and the denormalized totals follow the items, as in OrderSerializer.update
+    def save_model(self, request, obj, form, change):
+        if change:
+            old = Order.objects.select_for_update().values_list("status", flat=True).get(pk=obj.pk)
+            obj._held_before = held(obj.items.all(), old)
+        else:
+            obj._held_before = Counter()
+        super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        order = form.instance
+        items = list(order.items.all())
+        order.set_totals(items)
+        order.save(update_fields=["total_amount", "item_count", "updated_at"])
+        move_stock(order._held_before, held(items, order.status))
+
+    def changeform_view(self, request, object_id=None, form_url="", extra_context=None):
+        try:
+            return super().changeform_view(request, object_id, form_url, extra_context)
+        except InsufficientStock as exc:
+            # stock taken by a concurrent order after the formset check; the save was rolled back
+            detail = ", ".join(f"product {pid} (available: {available})"
+                               for pid, available in exc.shortages().items()) or "stock changed, try again"
+            self.message_user(request, f"Not saved: insufficient stock ({detail}).", messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Order.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        # give back what the orders hold, read under the row locks (as OrderViewSet.perform_destroy)
+        with transaction.atomic():
+            statuses = dict(queryset.select_for_update().order_by().values_list("pk", "status"))
+            released = Counter()
+            items = OrderItem.objects.filter(order_id__in=list(statuses)).order_by("order_id")
+            for item in items:
+                released += held([item], statuses[item.order_id])
+            move_stock(released, Counter())
+            Order.objects.filter(pk__in=list(statuses)).delete()
@@ -0,0 +1,102 @@
+import datetime
+import itertools
+import random
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.catalog.models import Product
+from apps.orders.models import DailySalesRollup, Order, OrderItem
+from apps.orders.rollups import query_live, query_rollups, refresh_rollups
+
+User = get_user_model()
+STATUSES = ["pending", "paid", "paid", "paid", "cancelled"]
+
+
+class Command(BaseCommand):
+    help = ("Generate synthetic orders, build the sales rollups and time the analytics query "
+            "against live aggregation. Writes to the configured database: use a scratch one.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=100_000, help="e.g. 10000000 for the full run")
+        parser.add_argument("--products", type=int, default=1000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--range-days", type=int, default=90, help="Width of the queried range.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--keep", action="store_true", help="Keep the generated rows.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(f"bench-{tag}")
+        products = Product.objects.bulk_create([
+            Product(name=f"bench {tag} {i}", sku=f"BR-{tag}-{i}", price=Decimal(rng.randint(100, 10000)) / 100)
+            for i in range(opts["products"])
+        ])
+        try:
+            started = time.perf_counter()
+            self.generate(rng, user, products, opts)
+            self.stdout.write(f"generated {opts['items']} items in {time.perf_counter() - started:.1f}s")
+
+            started = time.perf_counter()
+            days, rows = refresh_rollups(full=True, now=timezone.now() + datetime.timedelta(minutes=1))
+            self.stdout.write(f"rollup build: {days} days, {rows} rows in {time.perf_counter() - started:.1f}s")
+
+            end = timezone.now().date()
+            start = end - datetime.timedelta(days=opts["range_days"])
+            for group_by in ("day", "product"):
+                live_ms, live = self.timed(query_live, opts["repeat"], start, end, group_by)
+                roll_ms, rolled = self.timed(query_rollups, opts["repeat"], start, end, group_by)
+                same = "match" if live == rolled else "MISMATCH"
+                self.stdout.write(
+                    f"group_by={group_by:<8} live p50={live_ms:9.1f} ms  rollup p50={roll_ms:7.1f} ms  "
+                    f"speedup x{live_ms / max(roll_ms, 0.001):.0f}  ({same})"
+                )
+        finally:
+            if not opts["keep"]:
+                Order.objects.filter(user=user).delete()
+                DailySalesRollup.objects.filter(product__in=products).delete()
+                Product.objects.filter(pk__in=[p.pk for p in products]).delete()
+                user.delete()
+
+    def generate(self, rng, user, products, opts):
+        now = timezone.now()
+        remaining = opts["items"]
+        cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(products))))  # Zipf-like
+        while remaining > 0:
+            with transaction.atomic():
+                stamps = [now - datetime.timedelta(seconds=rng.randint(0, opts["days"] * 86400))
+                          for _ in range(min(2000, remaining))]
+                orders = Order.objects.bulk_create(
+                    [Order(user=user, status=rng.choice(STATUSES)) for _ in stamps]
+                )
+                # auto_now_add stamps "now"; spread orders back over the window
+                for order, created in zip(orders, stamps):
+                    order.created_at = created
+                Order.objects.bulk_update(orders, ["created_at"], batch_size=2000)
+                items = []
+                for order in orders:
+                    lines = min(remaining, rng.randint(1, 9))
+                    for product in rng.choices(products, cum_weights=cum_weights, k=lines):
+                        items.append(OrderItem(order=order, product=product, qty=rng.randint(1, 5),
+                                               price=product.price))
+                    remaining -= lines
+                    if remaining <= 0:
+                        break
+                OrderItem.objects.bulk_create(items, batch_size=5000)
+
+    @staticmethod
+    def timed(fn, repeat, *args):
+        samples, result = [], None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn(*args)
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples), result
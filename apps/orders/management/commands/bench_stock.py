@@ -0,0 +1,108 @@
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from apps.catalog.models import Product
+from apps.orders.models import Order, OrderItem
+from apps.orders.stock import InsufficientStock, adjust_stock
+
+User = get_user_model()
+
+
+def place_conditional(user, product, qty):
+    with transaction.atomic():
+        order = Order.objects.create(user=user)
+        OrderItem.objects.create(order=order, product=product, qty=qty, price=product.price)
+        adjust_stock({product.pk: qty})
+
+
+def place_locking(user, product, qty):
+    with transaction.atomic():
+        locked = Product.objects.select_for_update().get(pk=product.pk)
+        if locked.stock < qty:
+            raise InsufficientStock({product.pk: qty})
+        locked.stock -= qty
+        locked.save(update_fields=["stock", "updated_at"])
+        order = Order.objects.create(user=user)
+        OrderItem.objects.create(order=order, product=product, qty=qty, price=product.price)
+
+
+STRATEGIES = {"conditional": place_conditional, "locking": place_locking}
+
+
+class Command(BaseCommand):
+    help = ("Race parallel writers placing orders against one product and report "
+            "orders/sec and oversell for the conditional-UPDATE vs select_for_update paths. "
+            "Creates and removes its own rows in the configured database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--attempts", type=int, default=200, help="Orders attempted per writer.")
+        parser.add_argument("--stock", type=int, default=1000)
+        parser.add_argument("--qty", type=int, default=1)
+        parser.add_argument("--strategy", choices=[*STRATEGIES, "both"], default="both")
+
+    def handle(self, *args, **opts):
+        names = list(STRATEGIES) if opts["strategy"] == "both" else [opts["strategy"]]
+        user = User.objects.create_user(f"bench-{uuid.uuid4().hex[:8]}")
+        try:
+            for name in names:
+                self.run(name, user, opts)
+        finally:
+            user.delete()
+
+    def run(self, name, user, opts):
+        product = Product.objects.create(
+            name="bench", sku=f"BENCH-{uuid.uuid4().hex[:12]}", price=1, stock=opts["stock"],
+        )
+        place = STRATEGIES[name]
+        stats = {"accepted": 0, "rejected": 0, "retries": 0}
+        lock = threading.Lock()
+
+        def writer():
+            local = {"accepted": 0, "rejected": 0, "retries": 0}
+            try:
+                for _ in range(opts["attempts"]):
+                    while True:
+                        try:
+                            place(user, product, opts["qty"])
+                            local["accepted"] += 1
+                        except InsufficientStock:
+                            local["rejected"] += 1
+                        except OperationalError:  # SQLite "database is locked"
+                            local["retries"] += 1
+                            time.sleep(0.001)
+                            continue
+                        break
+            finally:
+                connections.close_all()
+                with lock:
+                    for k, v in local.items():
+                        stats[k] += v
+
+        threads = [threading.Thread(target=writer) for _ in range(opts["writers"])]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        product.refresh_from_db()
+        sold = opts["stock"] - product.stock
+        oversold = stats["accepted"] * opts["qty"] - sold
+        attempts = opts["writers"] * opts["attempts"]
+        self.stdout.write(
+            f"{name:<12} {attempts / elapsed:8.1f} attempts/s  {stats['accepted'] / elapsed:8.1f} orders/s  "
+            f"accepted={stats['accepted']} rejected={stats['rejected']} retries={stats['retries']} "
+            f"final_stock={product.stock} oversold={oversold}"
+        )
+        style = self.style.SUCCESS if oversold == 0 and product.stock >= 0 else self.style.ERROR
+        self.stdout.write(style(f"{name}: {'no oversell' if oversold == 0 else 'OVERSOLD'}"))
+
+        Order.objects.filter(items__product=product).delete()
+        product.delete()
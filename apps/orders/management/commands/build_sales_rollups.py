@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = ("Refresh the daily sales rollups for orders changed since the last run "
+            "(updated_at watermark). --full rebuilds everything, which also drops deleted orders.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true")
+
+    def handle(self, *args, **opts):
+        days, rows = refresh_rollups(full=opts["full"])
+        self.stdout.write(self.style.SUCCESS(f"{days} day(s) rebuilt, {rows} rollup rows written."))
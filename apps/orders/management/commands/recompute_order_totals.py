@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.orders.models import LINE_TOTAL, Order, OrderItem
+
+
+class Command(BaseCommand):
+    help = "Backfill or verify Order.total_amount / item_count against OrderItem rows, in id batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true", help="Report mismatches without writing; exit 1 if any.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        batch_size = opts["batch_size"]
+        checked = mismatched = 0
+        last_id = 0
+        while True:
+            orders = list(Order.objects.filter(pk__gt=last_id).order_by("pk")
+                          .only("pk", "total_amount", "item_count")[:batch_size])
+            if not orders:
+                break
+            last_id = orders[-1].pk
+            actual = {
+                row["order_id"]: row
+                for row in OrderItem.objects
+                .filter(order_id__gte=orders[0].pk, order_id__lte=last_id)
+                .values("order_id")
+                .annotate(total=Sum(LINE_TOTAL), n=Count("id"))
+                .order_by()
+            }
+            stale = []
+            for order in orders:
+                row = actual.get(order.pk, {"total": Decimal("0"), "n": 0})
+                total = (row["total"] or Decimal("0")).quantize(Decimal("0.01"))
+                if order.total_amount != total or order.item_count != row["n"]:
+                    if opts["verify"]:
+                        self.stdout.write(
+                            f"order {order.pk}: stored {order.total_amount}/{order.item_count}, "
+                            f"actual {total}/{row['n']}"
+                        )
+                    order.total_amount, order.item_count = total, row["n"]
+                    order.updated_at = timezone.now()  # bulk_update skips auto_now; the changes feed needs it
+                    stale.append(order)
+            checked += len(orders)
+            mismatched += len(stale)
+            if stale and not opts["verify"]:
+                with transaction.atomic():
+                    Order.objects.bulk_update(stale, ["total_amount", "item_count", "updated_at"])
+
+        action = "found" if opts["verify"] else "fixed"
+        self.stdout.write(f"{checked} orders checked, {mismatched} mismatches {action}.")
+        if opts["verify"] and mismatched:
+            raise CommandError("Order totals are out of sync; run recompute_order_totals.")
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-17 20:00
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Round
+
+
+def backfill_totals(apps, schema_editor):
+    # one UPDATE with correlated subqueries; recompute_order_totals does the same in id batches
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    items = OrderItem.objects.filter(order_id=models.OuterRef("pk")).order_by().values("order_id")
+    line_total = models.ExpressionWrapper(models.F("qty") * models.F("price"),
+                                          output_field=models.DecimalField(max_digits=16, decimal_places=2))
+    total = Round(models.Subquery(items.annotate(total=models.Sum(line_total)).values("total")), 2)
+    Order.objects.using(schema_editor.connection.alias).update(
+        total_amount=Coalesce(total, models.Value(Decimal("0")),
+                              output_field=models.DecimalField(max_digits=14, decimal_places=2)),
+        item_count=Coalesce(models.Subquery(items.annotate(n=models.Count("id")).values("n")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['total_amount', 'id'], name='order_total_id_idx'),
+        ),
+    ]
@@ -1,18 +1,75 @@
+from decimal import Decimal
+
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from apps.catalog.models import Product
 User = get_user_model()
 
 class Order(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        PAID = "paid"
+        CANCELLED = "cancelled"
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
-    status = models.CharField(max_length=20, default="pending")  # pending/paid/cancelled
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    # denormalized from items; kept exact by OrderSerializer, see recompute_order_totals
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    item_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    class Meta: ordering = ["-created_at"]
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="order_created_id_idx"),
+            models.Index(fields=["status", "id"], name="order_status_id_idx"),
+            models.Index(fields=["total_amount", "id"], name="order_total_id_idx"),
+            models.Index(fields=["updated_at", "id"], name="order_updated_id_idx"),
+        ]
     def __str__(self): return f"Order#{self.pk} by {self.user_id}"
 
+    def set_totals(self, items):
+        self.total_amount = sum((it.qty * it.price for it in items), Decimal("0"))
+        self.item_count = len(items)
+
+class OrderTombstone(models.Model):
+    """Id of a deleted order, for the changes feed (written on post_delete, see prune_tombstones)."""
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["deleted_at", "id"], name="order_tomb_deleted_id_idx")]
+
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     qty = models.PositiveIntegerField()
     price = models.DecimalField(max_digits=12, decimal_places=2)  # snapshot price
+
+
+# per-line value, shared by totals verification and the sales rollups
+LINE_TOTAL = models.ExpressionWrapper(
+    models.F("qty") * models.F("price"), output_field=models.DecimalField(max_digits=16, decimal_places=2)
+)
+
+
+class DailySalesRollup(models.Model):
+    """Pre-aggregated day x product x status sales, maintained by build_sales_rollups."""
+    day = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    status = models.CharField(max_length=20)
+    order_count = models.PositiveIntegerField(default=0)  # orders containing the product
+    qty = models.PositiveBigIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "product", "status"], name="rollup_day_product_status_uniq"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField(null=True)
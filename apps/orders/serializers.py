@@ -1,45 +1,156 @@
+from collections import Counter, defaultdict
+
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import serializers
+from apps.catalog.models import Product
+from minishop.timing import TimedSerializerMixin
 from .models import Order, OrderItem
+from .stock import InsufficientStock, held, move_stock
 
 User = get_user_model()
 
+
+def _stock_error(exc: InsufficientStock):
+    return serializers.ValidationError({"items": [
+        f"Insufficient stock for product {pid} (available: {available})."
+        for pid, available in exc.shortages().items()
+    ] or ["Insufficient stock."]})
+
+
 class OrderItemSerializer(serializers.ModelSerializer):
+    # on update, lines are matched to existing rows by id (or by product) and diffed
+    id = serializers.IntegerField(required=False)
+    # resolved for the whole order with one in_bulk() instead of a query per line
+    product = serializers.IntegerField(source="product_id", min_value=1)
+
     class Meta:
         model = OrderItem
         fields = ["id","product","qty","price"]
+        read_only_fields = ["price"]  # snapshot of Product.price taken on write
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=False)
 
     items = OrderItemSerializer(many=True)
 
     class Meta:
         model = Order
-        fields = ["id","user","status","items","created_at","updated_at"]
-        read_only_fields = ["id","created_at","updated_at"]
+        fields = ["id","user","status","items","total_amount","item_count","created_at","updated_at"]
+        read_only_fields = ["id","total_amount","item_count","created_at","updated_at"]
+
+    @staticmethod
+    def _load_products(ids):
+        ids = set(ids)
+        products = Product.objects.only("price").in_bulk(ids)
+        missing = sorted(ids - products.keys())
+        if missing:
+            raise serializers.ValidationError({"items": [
+                f'Invalid pk "{pid}" - object does not exist.' for pid in missing
+            ]})
+        return products
+
+    @staticmethod
+    def _build_items(order, items, products):
+        return [
+            OrderItem(order=order, product_id=it["product_id"], qty=it["qty"],
+                      price=products[it["product_id"]].price)
+            for it in items
+        ]
+
+    def _sync_items(self, order, old_items, items):
+        """
+        Apply ``items`` as a diff against ``old_items``: matched lines keep their
+        primary key (and price snapshot unless the product changes), new lines
+        are bulk-inserted and missing ones removed with one filtered delete.
+        Returns the order's resulting lines.
+        """
+        existing = {it.pk: it for it in old_items}
+        claimed = {}
+        for it in items:
+            pk = it.get("id")
+            if pk is None:
+                continue
+            if pk not in existing or pk in claimed:
+                raise serializers.ValidationError({"items": [f"Invalid item id {pk} for this order."]})
+            claimed[pk] = it
+
+        free = defaultdict(list)
+        for old in old_items:
+            if old.pk not in claimed:
+                free[old.product_id].append(old)
+
+        pairs = []  # (existing line or None, incoming data)
+        for it in items:
+            if it.get("id") is not None:
+                pairs.append((existing[it["id"]], it))
+            else:
+                candidates = free[it["product_id"]]
+                pairs.append((candidates.pop(0) if candidates else None, it))
+
+        needs_price = {it["product_id"] for old, it in pairs
+                       if old is None or old.product_id != it["product_id"]}
+        products = self._load_products(needs_price)
+
+        kept, changed, created = set(), [], []
+        for old, it in pairs:
+            if old is None:
+                created.append(it)
+                continue
+            kept.add(old.pk)
+            if old.product_id != it["product_id"]:
+                old.product_id = it["product_id"]
+                old.price = products[it["product_id"]].price
+                changed.append(old)
+            elif old.qty != it["qty"]:
+                changed.append(old)
+            old.qty = it["qty"]
+
+        removed = [pk for pk in existing if pk not in kept]
+        if removed:
+            OrderItem.objects.filter(order=order, pk__in=removed).delete()
+        if changed:
+            OrderItem.objects.bulk_update(changed, ["product", "qty", "price"])
+        new_lines = OrderItem.objects.bulk_create(self._build_items(order, created, products))
+        return [existing[pk] for pk in existing if pk in kept] + new_lines
 
     def create(self, validated_data):
         items = validated_data.pop("items", [])
         request = self.context["request"]
         user = validated_data.pop("user", None)
 
-        if user is None or not request.user.is_staff:
-            user = request.user
+        # ids only: request.user may be a claims-only user (StatelessJWTAuthentication)
+        user_id = user.pk if user is not None and request.user.is_staff else request.user.pk
 
-        order = Order.objects.create(user=user, **validated_data)
-        for it in items:
-            OrderItem.objects.create(order=order, **it)
+        try:
+            with transaction.atomic():
+                products = self._load_products(it["product_id"] for it in items)
+                order = Order(user_id=user_id, **validated_data)
+                lines = self._build_items(order, items, products)
+                order.set_totals(lines)
+                order.save()
+                OrderItem.objects.bulk_create(lines)
+                move_stock(Counter(), held(items, order.status))
+        except InsufficientStock as exc:
+            raise _stock_error(exc)
         return order
 
     def update(self, instance, validated_data):
         items = validated_data.pop("items", None)
         validated_data.pop("user", None)
-        for k, v in validated_data.items():
-            setattr(instance, k, v)
-        instance.save()
-        if items is not None:
-            instance.items.all().delete()
-            for it in items:
-                OrderItem.objects.create(order=instance, **it)
+        try:
+            with transaction.atomic():
+                # lock the order row, then read status and lines under it: the prefetched items may
+                # predate a concurrent update, which would move the same stock twice
+                old_status = Order.objects.select_for_update().values_list("status", flat=True).get(pk=instance.pk)
+                old_items = list(OrderItem.objects.select_for_update().filter(order_id=instance.pk).order_by("pk"))
+                before = held(old_items, old_status)  # _sync_items edits old_items in place
+                for k, v in validated_data.items():
+                    setattr(instance, k, v)
+                new_items = old_items if items is None else self._sync_items(instance, old_items, items)
+                instance.set_totals(new_items)
+                instance.save()
+                move_stock(before, held(new_items, instance.status))
+        except InsufficientStock as exc:
+            raise _stock_error(exc)
         return instance
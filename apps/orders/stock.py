@@ -0,0 +1,70 @@
+"""
+Stock reservation for orders.
+
+Every change is a single conditional ``UPDATE ... SET stock = stock - delta
+WHERE stock >= delta`` across all products of an order, so concurrent writers
+never oversell and never queue on row locks taken by ``select_for_update``.
+Callers must run inside the order's transaction.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from apps.catalog.cache import bump_catalog_version
+from apps.catalog.models import Product
+from .models import Order
+
+CANCELLED = Order.Status.CANCELLED
+
+
+class InsufficientStock(Exception):
+    def __init__(self, deltas):
+        super().__init__("Insufficient stock.")
+        self.deltas = deltas
+
+    def shortages(self) -> dict[int, int]:
+        """Products that could not cover their delta, with what is available now."""
+        available = dict(Product.objects.filter(pk__in=self.deltas).values_list("pk", "stock"))
+        return {pid: available.get(pid, 0) for pid, d in self.deltas.items()
+                if d > 0 and available.get(pid, 0) < d}
+
+
+def quantities(items) -> Counter:
+    """Sum qty per product id from OrderItems or validated item dicts."""
+    totals = Counter()
+    for it in items:
+        if isinstance(it, dict):
+            totals[it["product_id"]] += it["qty"]
+        else:
+            totals[it.product_id] += it.qty
+    return totals
+
+
+def held(items, status) -> Counter:
+    """Stock an order in ``status`` keeps reserved for ``items``."""
+    return Counter() if status == CANCELLED else quantities(items)
+
+
+def adjust_stock(deltas):
+    """Take ``delta`` units per product (negative gives stock back) in one UPDATE."""
+    deltas = {pid: d for pid, d in deltas.items() if d}
+    if not deltas:
+        return
+    delta = Case(*(When(pk=pid, then=Value(d)) for pid, d in deltas.items()),
+                 output_field=IntegerField())
+    updated = (Product.objects
+               .filter(pk__in=list(deltas), stock__gte=delta)
+               .update(stock=F("stock") - delta, updated_at=timezone.now()))
+    if updated != len(deltas):
+        raise InsufficientStock(deltas)
+    # queryset.update() skips post_save, so invalidate cached catalog reads here
+    transaction.on_commit(bump_catalog_version)
+
+
+def move_stock(before: Counter, after: Counter):
+    """Reserve/release the difference between two held quantities."""
+    deltas = Counter(after)
+    deltas.subtract(before)
+    adjust_stock(deltas)
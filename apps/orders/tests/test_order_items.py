@@ -0,0 +1,83 @@
+"""``OrderSerializer`` applies item updates as a diff: kept lines keep their primary keys."""
+from decimal import Decimal
+
+import pytest
+
+from apps.catalog.models import Product
+from apps.orders.models import OrderItem
+
+
+@pytest.fixture
+def products(db):
+    return [Product.objects.create(name=f"Line widget {i}", sku=f"LINE-{i}", price=Decimal(f"{i + 1}.00"), stock=50)
+            for i in range(3)]
+
+
+@pytest.fixture
+def order(client_for, products):
+    client = client_for("admin")
+    a, b, _ = products
+    response = client.post("/api/orders/", {"items": [{"product": a.pk, "qty": 1}, {"product": b.pk, "qty": 2}]},
+                           format="json")
+    assert response.status_code == 201, response.json()
+    return client, response.json()
+
+
+def _lines(order_id):
+    return list(OrderItem.objects.filter(order_id=order_id).order_by("pk").values_list("pk", "product_id", "qty"))
+
+
+def test_update_keeps_matched_lines(order, products):
+    client, data = order
+    a, b, c = products
+    line_a, line_b = (it["id"] for it in data["items"])
+
+    # line a by id, line b matched by product, a new line for c
+    items = [{"id": line_a, "product": a.pk, "qty": 4}, {"product": b.pk, "qty": 2}, {"product": c.pk, "qty": 1}]
+    response = client.put(f"/api/orders/{data['id']}/", {"items": items}, format="json")
+    assert response.status_code == 200, response.json()
+
+    lines = _lines(data["id"])
+    assert lines[:2] == [(line_a, a.pk, 4), (line_b, b.pk, 2)]
+    assert lines[2][1:] == (c.pk, 1)
+    assert response.json()["total_amount"] == "11.00"
+    assert [p.stock for p in Product.objects.filter(pk__in=[a.pk, b.pk, c.pk]).order_by("pk")] == [46, 48, 49]
+
+
+def test_update_removes_missing_lines(order, products):
+    client, data = order
+    a, b, _ = products
+    line_a, _ = (it["id"] for it in data["items"])
+
+    response = client.patch(f"/api/orders/{data['id']}/", {"items": [{"id": line_a, "product": a.pk, "qty": 1}]},
+                            format="json")
+    assert response.status_code == 200, response.json()
+    assert _lines(data["id"]) == [(line_a, a.pk, 1)]
+    assert response.json()["item_count"] == 1
+    assert Product.objects.get(pk=b.pk).stock == 50
+
+
+def test_changing_the_product_takes_its_price(order, products):
+    client, data = order
+    _, b, c = products
+    _, line_b = (it["id"] for it in data["items"])
+
+    response = client.patch(f"/api/orders/{data['id']}/", {"items": [{"id": line_b, "product": c.pk, "qty": 2}]},
+                            format="json")
+    assert response.status_code == 200, response.json()
+    assert _lines(data["id"]) == [(line_b, c.pk, 2)]
+    assert OrderItem.objects.get(pk=line_b).price == c.price
+
+
+def test_rejects_foreign_and_repeated_ids(order, products):
+    client, data = order
+    a, _, _ = products
+    line_a, _ = (it["id"] for it in data["items"])
+    before = _lines(data["id"])
+
+    for items in ([{"id": line_a, "product": a.pk, "qty": 1}, {"id": line_a, "product": a.pk, "qty": 1}],
+                  [{"id": line_a + 1000, "product": a.pk, "qty": 1}]):
+        response = client.patch(f"/api/orders/{data['id']}/", {"items": items}, format="json")
+        assert response.status_code == 400
+        assert "Invalid item id" in response.json()["items"][0]
+    assert _lines(data["id"]) == before
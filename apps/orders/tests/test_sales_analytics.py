@@ -0,0 +1,43 @@
+"""``GET /api/analytics/sales/``: parameter validation and status filtering on the rollups."""
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.catalog.models import Product
+from apps.orders.models import Order, OrderItem
+from apps.orders.rollups import refresh_rollups
+
+SALES = "/api/analytics/sales/"
+
+
+@pytest.fixture
+def client(client_for):
+    client = client_for("manager")
+    product = Product.objects.create(name="Sales widget", sku="SALES-1", price=Decimal("2.00"), stock=10)
+    for status, qty in ((Order.Status.PAID, 3), (Order.Status.CANCELLED, 1)):
+        order = Order.objects.create(user=client.user, status=status)
+        OrderItem.objects.create(order=order, product=product, qty=qty, price=product.price)
+    refresh_rollups(full=True, now=timezone.now() + timezone.timedelta(minutes=1))
+    client.product = product
+    return client
+
+
+def test_filters_by_status(client):
+    params = {"group_by": "status", "product": client.product.pk}
+    rows = client.get(SALES, params).json()["results"]
+    assert rows == [{"status": "cancelled", "qty": 1, "revenue": "2.00"},
+                    {"status": "paid", "qty": 3, "revenue": "6.00"}]
+
+    rows = client.get(SALES, {**params, "status": "paid"}).json()["results"]
+    assert rows == [{"status": "paid", "qty": 3, "revenue": "6.00"}]
+
+
+def test_rejects_unknown_parameters(client):
+    response = client.get(SALES, {"status": "shipped", "group_by": "week", "start": "yesterday"})
+    assert response.status_code == 400
+    assert response.json() == {
+        "start": ["Date has wrong format. Use YYYY-MM-DD."],
+        "group_by": ["Expected one of day, product, status, day_product."],
+        "status": ["Expected one of pending, paid, cancelled."],
+    }
@@ -0,0 +1,68 @@
+"""Stock reservation: ``adjust_stock`` and the orders API on top of it."""
+from collections import Counter
+from decimal import Decimal
+
+import pytest
+from django.db import transaction
+
+from apps.catalog.models import Product
+from apps.orders.models import Order
+from apps.orders.stock import InsufficientStock, adjust_stock, move_stock
+
+
+@pytest.fixture
+def products(db):
+    return [Product.objects.create(name=f"Stock widget {i}", sku=f"STOCK-{i}", price=Decimal("2.50"), stock=5)
+            for i in range(2)]
+
+
+def _stock(*products):
+    return [p.stock for p in Product.objects.filter(pk__in=[p.pk for p in products]).order_by("pk")]
+
+
+def test_takes_and_releases_stock(products):
+    a, b = products
+    adjust_stock({a.pk: 5, b.pk: 2})
+    assert _stock(a, b) == [0, 3]
+
+    adjust_stock({a.pk: -4, b.pk: 0})
+    assert _stock(a, b) == [4, 3]
+
+
+def test_refuses_to_oversell(products):
+    a, b = products
+    with pytest.raises(InsufficientStock) as exc, transaction.atomic():
+        adjust_stock({a.pk: 2, b.pk: 6})
+    assert exc.value.shortages() == {b.pk: 5}
+    # the caller's transaction undoes the lines that could be covered
+    assert _stock(a, b) == [5, 5]
+
+
+def test_move_stock_applies_the_difference(products):
+    a, b = products
+    move_stock(Counter({a.pk: 3, b.pk: 1}), Counter({a.pk: 1, b.pk: 4}))
+    assert _stock(a, b) == [7, 2]
+
+
+def test_order_api_reserves_and_releases(client_for, products):
+    a, b = products
+    client = client_for("admin")
+
+    response = client.post("/api/orders/", {"items": [{"product": a.pk, "qty": 6}]}, format="json")
+    assert response.status_code == 400
+    assert response.json() == {"items": [f"Insufficient stock for product {a.pk} (available: 5)."]}
+    assert not Order.objects.filter(user=client.user).exists()
+
+    response = client.post("/api/orders/", {"items": [{"product": a.pk, "qty": 3}, {"product": b.pk, "qty": 5}]},
+                           format="json")
+    assert response.status_code == 201, response.json()
+    assert _stock(a, b) == [2, 0]
+    order = response.json()["id"]
+
+    response = client.patch(f"/api/orders/{order}/", {"status": "cancelled"}, format="json")
+    assert response.status_code == 200, response.json()
+    assert _stock(a, b) == [5, 5]
+
+    # a cancelled order holds nothing: deleting it gives nothing back twice
+    assert client.delete(f"/api/orders/{order}/").status_code == 204
+    assert _stock(a, b) == [5, 5]
@@ -1,7 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import OrderViewSet
+
+from minishop.asyncviews import async_read_urls
+from .views import OrderViewSet, SalesAnalyticsView
 
 router = DefaultRouter()
 router.register(r"orders", OrderViewSet, basename="order")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("analytics/sales/", SalesAnalyticsView.as_view(), name="sales-analytics"),
+    *async_read_urls(router.urls),
+]
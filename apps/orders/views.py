@@ -1,16 +1,136 @@
+from collections import Counter
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from .models import Order
+from minishop import exports
+from minishop.asyncviews import AsyncReadMixin
+from minishop.changes import ChangesFeedMixin
+from minishop.rowserializers import FastReadMixin
+from minishop.timing import TimedViewMixin
+from .models import Order, OrderItem, OrderTombstone
+from .rollups import GROUPINGS, query_rollups
 from .serializers import OrderSerializer
+from .stock import held, move_stock
 from ..accounts.permissions import RBACOrderPermission
 
+EXPORT_ORDER_FIELDS = ["id", "user_id", "status", "total_amount", "item_count", "created_at", "updated_at"]
+EXPORT_ITEM_FIELDS = ["items__id", "items__product_id", "items__qty", "items__price"]
+EXPORT_CSV_HEADER = ["order_id", "user", "status", "total_amount", "item_count", "created_at", "updated_at",
+                     "item_id", "product", "qty", "price"]
+
 
-class OrderViewSet(ModelViewSet):
-    queryset = Order.objects.all().order_by("-id")
+class OrderViewSet(TimedViewMixin, ChangesFeedMixin, FastReadMixin, AsyncReadMixin, ModelViewSet):
+    queryset = Order.objects.prefetch_related("items").order_by("-id")
     serializer_class = OrderSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = [IsAuthenticated, RBACOrderPermission]
+    filter_backends = [OrderingFilter]
     search_fields = ["id", "status"]
-    ordering_fields = ["id", "created_at", "status"]
+    ordering_fields = ["id", "created_at", "status", "total_amount"]
+    replica_reads = True
+    tombstone_model = OrderTombstone
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action in ("update", "partial_update", "destroy"):
+            # the lines are re-read under the order's row lock; a prefetch would be a stale extra query
+            qs = qs.prefetch_related(None)
+        return qs
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # lock the order row and release what it holds now: a concurrent cancel may have released it already
+            try:
+                status = Order.objects.select_for_update().values_list("status", flat=True).get(pk=instance.pk)
+            except Order.DoesNotExist:
+                raise Http404
+            move_stock(held(OrderItem.objects.filter(order_id=instance.pk), status), Counter())
+            instance.delete()
+
+    @action(detail=False, methods=["get"], url_path="export",
+            content_negotiation_class=exports.ExportNegotiation)
+    def export(self, request):
+        fmt = request.query_params.get("fmt", "csv")
+        if fmt not in exports.FORMATS:
+            return Response({"fmt": [f"Expected one of {', '.join(exports.FORMATS)}."]}, status=400)
+        # one LEFT JOIN pass ordered by order id; rows of the same order are adjacent
+        rows = (self.filter_queryset(self.get_queryset())
+                .prefetch_related(None)
+                .order_by("id", "items__id")
+                .values_list(*EXPORT_ORDER_FIELDS, *EXPORT_ITEM_FIELDS)
+                .iterator(chunk_size=exports.CHUNK_SIZE))
+        if fmt == "csv":
+            lines = exports.csv_lines(EXPORT_CSV_HEADER, rows)
+        else:
+            lines = exports.ndjson_lines(_group_orders(rows))
+        return exports.streaming_export(lines, fmt, "orders", request)
+
+
+class SalesAnalyticsView(TimedViewMixin, APIView):
+    """Date-range sales answered from DailySalesRollup (see build_sales_rollups)."""
+    permission_classes = [IsAuthenticated, RBACOrderPermission]
+    max_days = 3660
+
+    def get(self, request):
+        params = request.query_params
+        errors = {}
+        today = timezone.now().date()
+        start = _parse_date(params.get("start"), today - timedelta(days=29), "start", errors)
+        end = _parse_date(params.get("end"), today, "end", errors)
+        group_by = params.get("group_by", "day")
+        if group_by not in GROUPINGS:
+            errors["group_by"] = [f"Expected one of {', '.join(GROUPINGS)}."]
+        status = params.get("status")
+        if status and status not in Order.Status.values:
+            errors["status"] = [f"Expected one of {', '.join(Order.Status.values)}."]
+        product = params.get("product")
+        if product is not None and not product.isdigit():
+            errors["product"] = ["A valid integer is required."]
+        if not errors and (end < start or (end - start).days > self.max_days):
+            errors["end"] = [f"Must be on or after start and within {self.max_days} days of it."]
+        if errors:
+            return Response(errors, status=400)
+
+        results = query_rollups(start, end, group_by, status=status, product=product)
+        return Response({
+            "start": start.isoformat(), "end": end.isoformat(), "group_by": group_by, "results": results,
+        })
+
+
+def _parse_date(value, default, name, errors):
+    if not value:
+        return default
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        errors[name] = ["Date has wrong format. Use YYYY-MM-DD."]
+    return parsed
+
+
+def _group_orders(rows):
+    width = len(EXPORT_ORDER_FIELDS)
+    fmt = exports.format_value
+    for _, group in groupby(rows, key=lambda r: r[0]):
+        first = next(group)
+        items = [
+            {"id": r[width], "product": r[width + 1], "qty": r[width + 2], "price": fmt(r[width + 3])}
+            for r in (first, *group) if r[width] is not None
+        ]
+        order_id, user_id, status, total_amount, item_count, created_at, updated_at = first[:width]
+        yield {
+            "id": order_id, "user": user_id, "status": status, "items": items,
+            "total_amount": fmt(total_amount), "item_count": item_count,
+            "created_at": fmt(created_at), "updated_at": fmt(updated_at),
+        }
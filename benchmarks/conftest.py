@@ -0,0 +1,120 @@
+"""
+Endpoint benchmarks: ``python -m pytest benchmarks`` (see pytest.ini).
+
+The session test database (``django_test_db``, in the root ``conftest.py``) is
+filled by ``seed_data`` (fixed seed, so response sizes are stable) plus one user
+per role. Each
+scenario in ``scenarios.py`` is timed over ``--bench-rounds`` requests after a
+warm-up; p50/p99 latency, SQL statements and response bytes are compared with
+``baseline.json``:
+
+* queries: must not exceed the baseline;
+* bytes: at most ``measure.BYTES_TOLERANCE`` above it;
+* latency: reported next to the baseline only. With ``--bench-check-latency``,
+  p50 must stay within ``(1 + tolerance) x baseline + slack`` and p99 within
+  twice the tolerance (``--bench-latency-tolerance``; baselines are per
+  machine, so this is for runs on the machine that wrote them).
+
+``--bench-update-baseline`` rewrites the baseline from the current run.
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from .measure import BASELINE, load_baseline
+
+SEED = {"users": 200, "products": 1000, "orders": 3000, "prefix": "bench", "seed": 1}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-rounds", type=int, default=30, help="Timed requests per scenario.")
+    group.addoption("--bench-warmup", type=int, default=3)
+    group.addoption("--bench-baseline", default=str(BASELINE))
+    group.addoption("--bench-update-baseline", action="store_true",
+                    help="Write this run's numbers to the baseline instead of comparing.")
+    group.addoption("--bench-check-latency", action="store_true",
+                    help="Fail on latency regressions too (default: report them only).")
+    group.addoption("--bench-latency-tolerance", type=float, default=1.0,
+                    help="Allowed p50 slowdown as a fraction of the baseline (p99: twice this).")
+
+
+def pytest_configure(config):
+    config.bench_results = {}
+
+
+class Context:
+    """Seeded ids and per-role clients shared by all scenarios."""
+    password = "Bench-pass-123!"
+
+    def __init__(self):
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import Group
+        from django.core.management import call_command
+        from django.test import Client
+        from django.utils import timezone
+
+        from apps.accounts.models import Invitation
+        from apps.accounts.tokens import RoleRefreshToken
+        from apps.catalog.models import Product
+        from apps.orders.models import Order
+
+        User = get_user_model()
+        call_command("seed_roles", stdout=open(os.devnull, "w"))
+        call_command("seed_data", stdout=open(os.devnull, "w"), **SEED)
+
+        self.users = {}
+        for role in ("admin", "manager", "staff"):
+            user = User.objects.create_user(f"bench-{role}", f"bench-{role}@example.com", self.password,
+                                            is_staff=role == "admin", is_superuser=role == "admin")
+            user.groups.add(Group.objects.get(name=role))
+            self.users[role] = user
+        self.clients = {
+            role: Client(HTTP_AUTHORIZATION=f"Bearer {RoleRefreshToken.for_user(user).access_token}")
+            for role, user in self.users.items()
+        }
+        self.clients["anon"] = Client()
+        self.clients["site"] = Client()
+        self.clients["site"].force_login(self.users["admin"])
+
+        self.user = User.objects.filter(username__startswith="bench-0").order_by("id").first().pk
+        self.products = list(Product.objects.filter(is_active=True, stock__gte=100)
+                             .order_by("id").values_list("id", flat=True)[:2])
+        self.product = self.products[0]
+        self.order = Order.objects.order_by("id").first().pk
+        self.invitation = Invitation.objects.create(
+            email="bench-pending@example.com", role="staff", invited_by=self.users["admin"],
+            expires_at=timezone.now() + timezone.timedelta(days=30),
+        ).pk
+
+
+@pytest.fixture(scope="session")
+def bench(django_test_db):
+    return Context()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = getattr(config, "bench_results", None)
+    if results and config.getoption("bench_update_baseline"):
+        baseline = {**load_baseline(config), **results}
+        path = Path(config.getoption("bench_baseline"))
+        path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = getattr(config, "bench_results", None)
+    if not results:
+        return
+    baseline = load_baseline(config)
+    write = terminalreporter.write_line
+    terminalreporter.section("endpoint benchmarks")
+    write(f"{'scenario':<58}{'p50 ms':>9}{'p99 ms':>9}{'queries':>9}{'bytes':>10}  vs baseline p50")
+    for name, r in results.items():
+        base = baseline.get(name)
+        delta = f"{r['p50_ms'] / base['p50_ms'] - 1:+.0%}" if base and base["p50_ms"] else "new"
+        write(f"{name:<58}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['queries']:>9}{r['bytes']:>10}  {delta}")
+    if config.getoption("bench_update_baseline"):
+        write(f"baseline written to {config.getoption('bench_baseline')}")
@@ -0,0 +1,68 @@
+"""Timing, baseline comparison and result formatting for the endpoint benchmarks."""
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.db import transaction
+
+from minishop.querybudget import count_queries
+
+BASELINE = Path(__file__).with_name("baseline.json")
+BYTES_TOLERANCE = 0.10
+LATENCY_SLACK_MS = 2.0
+
+
+def load_baseline(config):
+    path = Path(config.getoption("bench_baseline"))
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def compare(result, base, tolerance=None):
+    """Regression messages for ``result`` against a baseline entry (latency only with a ``tolerance``)."""
+    problems = []
+    if result["queries"] > base["queries"]:
+        problems.append(f"queries {result['queries']} > {base['queries']}")
+    if result["bytes"] > base["bytes"] * (1 + BYTES_TOLERANCE):
+        problems.append(f"bytes {result['bytes']} > {base['bytes']} +{BYTES_TOLERANCE:.0%}")
+    if tolerance is None:
+        return problems
+    for key, factor in (("p50_ms", 1 + tolerance), ("p99_ms", 1 + 2 * tolerance)):
+        limit = base[key] * factor + LATENCY_SLACK_MS
+        if result[key] > limit:
+            problems.append(f"{key} {result[key]:.2f} > {limit:.2f} (baseline {base[key]:.2f})")
+    return problems
+
+
+def summarize(samples, queries, size):
+    samples = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+        "queries": queries,
+        "bytes": size,
+    }
+
+
+def _request(client, scenario, path, data, headers):
+    if scenario.method == "GET":
+        return client.get(path, **headers)
+    if scenario.multipart:
+        return client.post(path, data, **headers)
+    send = getattr(client, scenario.method.lower())
+    return send(path, data, content_type="application/json", **headers)
+
+
+def run_round(bench, scenario):
+    """One round: (seconds, queries, body bytes, status)."""
+    client = bench.clients[scenario.user]
+    with transaction.atomic():
+        path, data, headers = scenario.resolve(bench)
+        with count_queries() as counter:
+            started = time.perf_counter()
+            response = _request(client, scenario, path, data, headers)
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+            elapsed = time.perf_counter() - started
+        if scenario.writes:
+            transaction.set_rollback(True)
+    return elapsed, counter.count, len(body), response.status_code
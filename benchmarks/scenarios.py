@@ -0,0 +1,190 @@
+"""
+One request per route (and method) in ``minishop/urls.py``.
+
+``path``/``data``/``headers`` may be callables taking the benchmark context;
+for writes they run inside the rolled-back transaction of each round, so they
+can create the objects the request consumes (an invitation to accept, a
+product to delete) without changing what the next round sees.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from apps.accounts.models import Invitation
+from apps.accounts.tokens import RoleRefreshToken
+from apps.catalog.models import Product
+from minishop.changes import encode_since
+
+
+@dataclass(frozen=True)
+class Scenario:
+    url_name: str
+    method: str
+    path: str | Callable
+    status: int = 200
+    data: Any = None
+    user: str = "admin"  # a role, "anon", or "site" (admin site session)
+    multipart: bool = False
+    headers: Callable | None = None
+    label: str = ""
+
+    @property
+    def id(self) -> str:
+        return f"{self.method} {self.url_name}" + (f"[{self.label}]" if self.label else "")
+
+    @property
+    def writes(self) -> bool:
+        return self.method != "GET"
+
+    def resolve(self, ctx):
+        """(path, data, extra headers) for one round."""
+        headers = self.headers(ctx) if self.headers else {}
+        return _value(self.path, ctx), _value(self.data, ctx), headers
+
+
+def _value(value, ctx):
+    return value(ctx) if callable(value) else value
+
+
+def _fresh_refresh(ctx):
+    return str(RoleRefreshToken.for_user(ctx.users["admin"]))
+
+
+def _fresh_access(ctx):
+    return {"HTTP_AUTHORIZATION": f"Bearer {RoleRefreshToken.for_user(ctx.users['admin']).access_token}"}
+
+
+def _new_invitation(ctx, email="bench-invitee@example.com"):
+    return Invitation.objects.create(email=email, role="staff", invited_by=ctx.users["admin"],
+                                     expires_at=timezone.now() + timezone.timedelta(hours=72))
+
+
+def _accept_data(ctx):
+    return {"token": str(_new_invitation(ctx).token), "username": "bench-invitee", "password": "Bench-pass-123!"}
+
+
+def _user_to_delete(ctx):
+    user = get_user_model().objects.create_user("bench-doomed")
+    return f"/api/accounts/users/{user.pk}/"
+
+
+def _product_to_delete(ctx):
+    product = Product.objects.create(name="Doomed", sku="BENCH-DOOMED", price=1)
+    return f"/api/catalog/products/{product.pk}/"
+
+
+def _import_file(ctx):
+    lines = ["sku,name,price,stock,is_active"]
+    lines += [f"IMPORT-{i:04d},Imported {i},{i % 90 + 10}.50,{i % 40},true" for i in range(200)]
+    body = ("\n".join(lines) + "\n").encode()
+    return {"file": SimpleUploadedFile("products.csv", body, content_type="text/csv")}
+
+
+def _since_now(ctx):
+    now = timezone.now()
+    return {"since": encode_since((now, 0), (now, 0))}
+
+
+def _order_items(ctx):
+    return [{"product": ctx.product, "qty": 1}, {"product": ctx.products[1], "qty": 2}]
+
+
+SCENARIOS = [
+    # auth
+    Scenario("token_obtain_pair", "POST", "/api/accounts/login/", user="anon",
+             data=lambda c: {"username": c.users["admin"].username, "password": c.password}),
+    Scenario("token_refresh", "POST", "/api/accounts/refresh/", user="anon",
+             data=lambda c: {"refresh": _fresh_refresh(c)}),
+    Scenario("logout", "POST", "/api/accounts/logout/", status=204, user="anon",
+             data=lambda c: {"refresh": _fresh_refresh(c)}, headers=_fresh_access),
+    Scenario("me", "GET", "/api/accounts/me/"),
+    Scenario("me", "GET", "/api/accounts/me/", user="staff", label="staff"),
+    Scenario("api-root", "GET", "/api/accounts/", label="accounts"),
+    Scenario("api-root", "GET", "/api/catalog/", label="catalog"),
+    Scenario("api-root", "GET", "/api/", label="orders"),
+
+    # users
+    Scenario("user-list", "GET", "/api/accounts/users/"),
+    Scenario("user-list", "GET", "/api/accounts/users/?search=bench-0001", label="search"),
+    Scenario("user-list", "POST", "/api/accounts/users/", status=201,
+             data={"username": "bench-new", "email": "bench-new@example.com", "password": "Bench-pass-123!",
+                   "role": "staff"}),
+    Scenario("user-detail", "GET", lambda c: f"/api/accounts/users/{c.user}/"),
+    Scenario("user-detail", "PUT", lambda c: f"/api/accounts/users/{c.user}/",
+             data={"username": "bench-renamed", "email": "bench-renamed@example.com", "role": "manager"}),
+    Scenario("user-detail", "PATCH", lambda c: f"/api/accounts/users/{c.user}/", data={"first_name": "Bench"}),
+    Scenario("user-detail", "DELETE", _user_to_delete, status=204),
+
+    # invitations
+    Scenario("invitation-list", "GET", "/api/accounts/invitations/"),
+    Scenario("invitation-list", "GET", "/api/accounts/invitations/?status=pending", label="pending"),
+    Scenario("invitation-list", "POST", "/api/accounts/invitations/", status=201,
+             data={"email": "bench-invite@example.com", "role": "staff"}),
+    Scenario("invitation-bulk", "POST", "/api/accounts/invitations/bulk/", status=201,
+             data=[{"email": f"bench-bulk-{i}@example.com", "role": "staff"} for i in range(100)]),
+    Scenario("invitation-detail", "GET", lambda c: f"/api/accounts/invitations/{c.invitation}/"),
+    Scenario("invitation-detail", "PUT", lambda c: f"/api/accounts/invitations/{c.invitation}/",
+             data={"email": "bench-put@example.com", "role": "manager"}),
+    Scenario("invitation-detail", "PATCH", lambda c: f"/api/accounts/invitations/{c.invitation}/",
+             data={"email": "bench-patch@example.com", "role": "staff"}),
+    Scenario("invitation-detail", "DELETE", lambda c: f"/api/accounts/invitations/{c.invitation}/", status=204),
+    Scenario("invitation-resend", "POST", lambda c: f"/api/accounts/invitations/{c.invitation}/resend/"),
+    Scenario("invitation-revoke", "POST", lambda c: f"/api/accounts/invitations/{c.invitation}/revoke/"),
+    Scenario("invitation-accept", "POST", "/api/accounts/invitations/accept/", status=201, user="anon",
+             data=_accept_data),
+
+    # products
+    Scenario("product-list", "GET", "/api/catalog/products/"),
+    Scenario("product-list", "GET", "/api/catalog/products/?ordering=price&page_size=200", label="page200"),
+    Scenario("product-list", "GET", "/api/catalog/products/?search=Product", label="search"),
+    Scenario("product-list", "POST", "/api/catalog/products/", status=201,
+             data={"name": "Bench product", "sku": "BENCH-NEW", "price": "12.50", "stock": 5}),
+    Scenario("product-bulk-import", "POST", "/api/catalog/products/import/", multipart=True, data=_import_file),
+    Scenario("product-export", "GET", "/api/catalog/products/export/?fmt=csv"),
+    Scenario("product-changes", "GET", "/api/catalog/products/changes/", label="initial"),
+    Scenario("product-changes", "GET", lambda c: "/api/catalog/products/changes/?" + urlencode(_since_now(c)),
+             label="poll"),
+    Scenario("product-detail", "GET", lambda c: f"/api/catalog/products/{c.product}/"),
+    Scenario("product-detail", "PUT", lambda c: f"/api/catalog/products/{c.product}/",
+             data={"name": "Renamed", "sku": "BENCH-PUT", "price": "9.99", "stock": 10, "is_active": True}),
+    Scenario("product-detail", "PATCH", lambda c: f"/api/catalog/products/{c.product}/", data={"price": "11.00", "stock": 7}),
+    Scenario("product-detail", "DELETE", _product_to_delete, status=204),
+
+    # orders
+    Scenario("order-list", "GET", "/api/orders/"),
+    Scenario("order-list", "GET", "/api/orders/?ordering=-total_amount", label="by-total"),
+    Scenario("order-list", "GET", "/api/orders/", user="staff", label="staff"),
+    Scenario("order-list", "POST", "/api/orders/", status=201, data=lambda c: {"items": _order_items(c)}),
+    Scenario("order-export", "GET", "/api/orders/export/?fmt=ndjson"),
+    Scenario("order-changes", "GET", "/api/orders/changes/", label="initial"),
+    Scenario("order-changes", "GET", lambda c: "/api/orders/changes/?" + urlencode(_since_now(c)), label="poll"),
+    Scenario("order-detail", "GET", lambda c: f"/api/orders/{c.order}/"),
+    Scenario("order-detail", "PUT", lambda c: f"/api/orders/{c.order}/",
+             data=lambda c: {"status": "paid", "items": _order_items(c)}),
+    Scenario("order-detail", "PATCH", lambda c: f"/api/orders/{c.order}/", data={"status": "cancelled"}),
+    Scenario("order-detail", "DELETE", lambda c: f"/api/orders/{c.order}/", status=204),
+    Scenario("sales-analytics", "GET", "/api/analytics/sales/?group_by=product"),
+
+    # dashboard load: me + first pages of products/orders/invitations in one round trip
+    Scenario("batch", "POST", "/api/batch/", label="dashboard", data={"requests": [
+        {"id": path, "path": path} for path in ("/api/accounts/me/", "/api/catalog/products/?page_size=20",
+                                                "/api/orders/?page_size=20", "/api/accounts/invitations/?page_size=20")
+    ]}),
+    Scenario("batch", "POST", "/api/batch/", label="atomic", data=lambda c: {"atomic": True, "requests": [
+        {"method": "POST", "path": "/api/orders/", "body": {"items": _order_items(c)}},
+        {"method": "PATCH", "path": f"/api/orders/{c.order}/", "body": {"status": "paid"}},
+    ]}),
+
+    # admin site: the index plus every registered model's changelist
+    Scenario("admin:index", "GET", "/admin/", user="site"),
+    *[
+        Scenario(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist", "GET",
+                 f"/admin/{model._meta.app_label}/{model._meta.model_name}/", user="site")
+        for model in admin.site._registry
+    ],
+]
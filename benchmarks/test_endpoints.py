@@ -0,0 +1,65 @@
+import gc
+
+import pytest
+from django.urls import URLResolver, get_resolver
+
+from .measure import compare, load_baseline, run_round, summarize
+from .scenarios import SCENARIOS
+
+
+def _routes(patterns):
+    """(url name, method) for every concrete route, format-suffix twins collapsed."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == "admin":
+                yield "admin:index", "GET"
+                continue
+            yield from _routes(pattern.url_patterns)
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, "actions", None)
+        cls = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+        if actions:
+            methods = actions  # DRF adds "head" here on the route's first request
+        elif cls is not None:
+            methods = [m for m in cls.http_method_names if hasattr(cls, m)]
+        else:
+            methods = ["get"]
+        for method in methods:
+            if method not in ("head", "options"):
+                yield pattern.name, method.upper()
+
+
+def test_every_route_has_a_scenario():
+    covered = {(s.url_name, s.method) for s in SCENARIOS}
+    missing = sorted(set(_routes(get_resolver().url_patterns)) - covered)
+    assert not missing, f"routes without a benchmark scenario: {missing}"
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.id)
+def test_endpoint(bench, scenario, request):
+    config = request.config
+    for _ in range(config.getoption("bench_warmup")):
+        _, _, _, status = run_round(bench, scenario)
+        assert status == scenario.status, f"{scenario.id}: HTTP {status}"
+
+    samples = []
+    queries = size = 0
+    gc.collect()
+    gc.disable()  # as timeit does: collector pauses otherwise land in random rounds' p99
+    try:
+        for _ in range(config.getoption("bench_rounds")):
+            elapsed, queries, size, status = run_round(bench, scenario)
+            assert status == scenario.status, f"{scenario.id}: HTTP {status}"
+            samples.append(elapsed)
+    finally:
+        gc.enable()
+    result = summarize(samples, queries, size)
+    config.bench_results[scenario.id] = result
+
+    base = load_baseline(config).get(scenario.id)
+    if base is None or config.getoption("bench_update_baseline"):
+        return
+    tolerance = config.getoption("bench_latency_tolerance") if config.getoption("bench_check_latency") else None
+    problems = compare(result, base, tolerance)
+    assert not problems, f"{scenario.id} regressed: " + "; ".join(problems)
@@ -0,0 +1,91 @@
+"""
+Shared pytest setup: Django settings, the session test database, and fixtures
+for the tests next to each app (``apps/*/tests``, ``minishop/tests``).
+
+Those tests run on the same test database as the benchmarks, each inside a
+transaction that is rolled back, with the caches emptied before and after so
+no state leaks into the benchmark scenarios.
+"""
+import os
+
+import django
+import pytest
+
+PASSWORD = "Test-pass-123!"
+
+
+def pytest_configure(config):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "minishop.settings.local")
+    django.setup()
+
+
+@pytest.fixture(scope="session")
+def django_test_db():
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.test.utils import (setup_databases, setup_test_environment, teardown_databases,
+                                   teardown_test_environment)
+
+    setup_test_environment(debug=False)
+    # hashing dominates login/user-create otherwise; Django's own test suites do the same
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    # every scenario comes from one IP and logs in the same user each round
+    settings.ADMISSION = {**settings.ADMISSION, "RATES": {}}
+    old_config = setup_databases(verbosity=0, interactive=False)
+    for cache in caches.all():
+        cache.clear()
+    yield
+    teardown_databases(old_config, verbosity=0)
+    teardown_test_environment()
+
+
+def _reset_caches():
+    from django.core.cache import caches
+
+    from apps.accounts import roles
+
+    for cache in caches.all():
+        cache.clear()
+    roles._names.clear()
+
+
+@pytest.fixture
+def db(django_test_db):
+    """The test database inside a transaction that is rolled back afterwards."""
+    from django.db import transaction
+
+    _reset_caches()
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+    _reset_caches()
+
+
+@pytest.fixture
+def make_user(db):
+    """``make_user(username, role=None, **fields)``: a user with ``PASSWORD``, in the ``role`` group."""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group
+
+    def make(username, role=None, **fields):
+        user = get_user_model().objects.create_user(username, f"{username}@example.com", PASSWORD, **fields)
+        if role:
+            user.groups.add(Group.objects.get_or_create(name=role)[0])
+        return user
+    return make
+
+
+@pytest.fixture
+def client_for(make_user):
+    """``client_for(role)``: an APIClient with a bearer token for a new user in ``role`` (``client.user``)."""
+    from rest_framework.test import APIClient
+
+    from apps.accounts.tokens import RoleRefreshToken
+
+    def make(role, username=None):
+        user = make_user(username or f"test-{role}", role)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RoleRefreshToken.for_user(user).access_token}")
+        client.user = user
+        return client
+    return make
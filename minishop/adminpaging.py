@@ -0,0 +1,74 @@
+"""
+Admin paginator for large tables.
+
+Django's changelist counts the whole (filtered) queryset on every load, which
+is a full scan at tens of millions of rows. ``EstimatedCountPaginator`` counts
+exactly only up to ``exact_below`` rows (``COUNT(*)`` over a ``LIMIT``ed
+subquery, so bounded). Past that it uses the planner's estimate:
+
+* PostgreSQL: ``pg_class.reltuples`` for the bare table, the ``EXPLAIN`` row
+  estimate for a filtered one;
+* MySQL: ``information_schema.tables.table_rows``;
+* SQLite: ``sqlite_stat1`` (after ``ANALYZE``).
+
+Without an estimate (a filtered queryset off PostgreSQL, or SQLite never
+analyzed) it falls back to the exact count. Use it with
+``show_full_result_count = False``, or the changelist counts the table anyway.
+"""
+import json
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """The database's row estimate for ``queryset``, or None when it has none."""
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    bare = not queryset.query.where and not queryset.query.distinct
+    try:
+        with connection.cursor() as cur:
+            if connection.vendor == "postgresql":
+                if bare:
+                    cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                                [connection.ops.quote_name(table)])
+                else:
+                    sql, params = queryset.order_by().query.sql_with_params()
+                    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            elif connection.vendor == "mysql" and bare:
+                cur.execute("SELECT table_rows FROM information_schema.tables "
+                            "WHERE table_schema = DATABASE() AND table_name = %s", [table])
+            elif connection.vendor == "sqlite" and bare:
+                cur.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s AND idx IS NULL "
+                            "UNION ALL SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table, table])
+            else:
+                return None
+            row = cur.fetchone()
+    except DatabaseError:  # e.g. sqlite_stat1 missing before the first ANALYZE
+        return None
+    if row is None or row[0] is None:
+        return None
+    value = row[0]
+    if connection.vendor == "postgresql" and not bare:
+        plan = json.loads(value) if isinstance(value, str) else value
+        return int(plan[0]["Plan"]["Plan Rows"])
+    if connection.vendor == "sqlite":
+        value = str(value).split()[0]  # "<rows> <rows per distinct prefix>..."
+    value = int(value)
+    return value if value >= 0 else None  # reltuples is -1 before the first ANALYZE/VACUUM
+
+
+class EstimatedCountPaginator(Paginator):
+    exact_below = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        capped = queryset.order_by()[: self.exact_below + 1].count()
+        if capped <= self.exact_below:
+            return capped
+        estimate = estimate_count(queryset)
+        if estimate is None:
+            return queryset.count()
+        return max(estimate, capped)
@@ -0,0 +1,179 @@
+"""
+Admission control for endpoints that hash passwords (login, invitation accept,
+user create/update).
+
+Two layers, both answering 429 with ``Retry-After``:
+
+* ``IPTokenBucketThrottle`` / ``UsernameTokenBucketThrottle``: DRF throttles
+  with a token bucket per client IP / submitted username in the ``CACHE`` alias
+  (local memory by default, so per process: N workers allow N times the
+  rate). ``RATES`` like ``"30/min"`` give a burst of 30 refilled evenly over
+  the minute. The client IP is DRF's ``get_ident``, so ``X-Forwarded-For`` is
+  only used as far as ``REST_FRAMEWORK["NUM_PROXIES"]`` trusts it.
+* ``hashing_slot()``: a per-process semaphore admitting ``MAX_CONCURRENT``
+  requests into the hashing code. Up to ``MAX_QUEUE`` more wait for at most
+  ``QUEUE_TIMEOUT`` seconds; the rest are rejected at once, so a login storm
+  holds at most ``MAX_CONCURRENT + MAX_QUEUE`` worker threads and the other
+  routes keep theirs.
+
+``metrics()`` returns this process's counters (admitted, queued, wait time,
+rejections by reason). Waits show up as the ``queue`` phase of the
+``Server-Timing`` header, and rejections are logged on ``minishop.admission``.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from .timing import phase
+
+logger = logging.getLogger("minishop.admission")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "MAX_CONCURRENT": 2,
+    "MAX_QUEUE": 4,
+    "QUEUE_TIMEOUT": 2.0,
+    "RATES": {"ip": "60/min", "username": "10/min"},
+    "CACHE": "default",
+}
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+_bucket_lock = threading.Lock()
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def get_admission_settings():
+    return {**DEFAULTS, **getattr(settings, "ADMISSION", {})}
+
+
+def metrics():
+    """Counters of this process: ``<name>.admitted``, ``.queued``, ``.wait_ms``, ``.rejected_busy``, ``<scope>.throttled``."""
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def _count(**increments):
+    with _metrics_lock:
+        _metrics.update(increments)
+
+
+def parse_rate(rate):
+    """``"30/min"`` -> (30, 60): bucket capacity and the seconds to refill it."""
+    num, period = rate.split("/")
+    return int(num), DURATIONS[period[0]]
+
+
+class _Slots:
+    def __init__(self, size, max_queue):
+        self.semaphore = threading.BoundedSemaphore(size)
+        self.max_queue = max_queue
+        self.waiting = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout):
+        if self.semaphore.acquire(blocking=False):
+            return True, 0.0
+        with self.lock:
+            if self.waiting >= self.max_queue:
+                return False, 0.0
+            self.waiting += 1
+        start = time.perf_counter()
+        try:
+            ok = self.semaphore.acquire(timeout=timeout)
+        finally:
+            with self.lock:
+                self.waiting -= 1
+        return ok, time.perf_counter() - start
+
+
+def _get_slots(conf):
+    global _slots
+    if _slots is None:
+        with _slots_lock:
+            if _slots is None:
+                _slots = _Slots(conf["MAX_CONCURRENT"], conf["MAX_QUEUE"])
+    return _slots
+
+
+@contextmanager
+def hashing_slot(name):
+    """Run the block in one of ``MAX_CONCURRENT`` slots, or raise ``Throttled`` (429) when none frees up in time."""
+    conf = get_admission_settings()
+    if not conf["ENABLED"]:
+        yield
+        return
+    slots = _get_slots(conf)
+    with phase("queue"):
+        ok, waited = slots.acquire(conf["QUEUE_TIMEOUT"])
+    if not ok:
+        _count(**{f"{name}.rejected_busy": 1})
+        logger.warning("Admission rejected: %s busy (%d waiting)", name, slots.waiting,
+                       extra={"endpoint": name, "reason": "busy", "waited_ms": round(waited * 1000, 1)})
+        raise Throttled(wait=conf["QUEUE_TIMEOUT"], detail="Server busy checking passwords; retry shortly.")
+    _count(**{f"{name}.admitted": 1, f"{name}.queued": int(waited > 0), f"{name}.wait_ms": round(waited * 1000)})
+    try:
+        yield
+    finally:
+        slots.semaphore.release()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """A bucket of ``RATES[scope]`` tokens per ident; each request takes one."""
+
+    scope = None
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        conf = get_admission_settings()
+        rate = conf["RATES"].get(self.scope)
+        ident = self.get_ident_key(request, view) if conf["ENABLED"] and rate else None
+        if ident is None:
+            return True
+        capacity, period = parse_rate(rate)
+        key = f"admission:{self.scope}:{ident}"
+        cache = caches[conf["CACHE"]]
+        now = time.time()
+        with _bucket_lock:  # get+set is atomic within the process; across processes a shared cache is approximate
+            tokens, stamp = cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * capacity / period)
+            allowed = tokens >= 1
+            cache.set(key, (tokens - 1 if allowed else tokens, now), period)
+        if not allowed:
+            self.retry_after = (1 - tokens) * period / capacity
+            _count(**{f"{self.scope}.throttled": 1})
+            logger.info("Admission rejected: %s bucket empty for %s", self.scope, request.path,
+                        extra={"scope": self.scope, "reason": "throttled", "path": request.path})
+        return allowed
+
+    def wait(self):
+        return getattr(self, "retry_after", None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    scope = "ip"
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameTokenBucketThrottle(TokenBucketThrottle):
+    """Per submitted ``username`` (login), whatever the client IP."""
+
+    scope = "username"
+
+    def get_ident_key(self, request, view):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        return username.strip().lower()[:150] or None if isinstance(username, str) else None
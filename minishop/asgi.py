@@ -11,6 +11,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'minishop.settings')
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE",
+    os.getenv("DJANGO_SETTINGS_MODULE", "minishop.settings.production")
+)
+# GET list/detail for products and orders, and /me, run on the event loop (minishop.asyncviews)
+os.environ.setdefault("ASYNC_READ_VIEWS", "1")
 
 application = get_asgi_application()
@@ -0,0 +1,138 @@
+"""
+Async read path for ASGI deployments (``settings.ASYNC_READ_VIEWS``).
+
+``async_read(view)`` wraps a DRF view so that ``GET`` runs the view class's
+``a<action>`` coroutine (``alist``, ``aretrieve``, ``aget``) on the event loop:
+async authentication (``aauthenticate``), the usual permission/throttle classes
+(sync, but SQL-free once the authenticator has resolved the user's groups), and
+the async ORM. Errors raised there (403/404/429/...) are answered by the view's
+own ``handle_exception``, as ``APIView.dispatch`` does, without running the
+request twice (a rerun would also charge the throttles twice). What the async
+path can't do raises ``Fallback`` and goes to the regular DRF view in a worker
+thread: other methods, ``?format=``, non-JSON renderers, anonymous requests
+(DRF's 401/anonymous handling), authenticators without ``aauthenticate``.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse
+from django.urls import URLPattern
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .timing import phase
+
+
+class Fallback(Exception):
+    """Let the sync DRF view handle this request."""
+
+
+def async_read(view):
+    """Async-dispatching twin of a DRF ``as_view()`` callable (unchanged if disabled/unsupported)."""
+    cls = getattr(view, "cls", None)
+    actions = getattr(view, "actions", None)
+    action = actions.get("get") if actions else "get"
+    handler = f"a{action}" if action else None
+    if not getattr(settings, "ASYNC_READ_VIEWS", False) or cls is None or not hasattr(cls, handler or ""):
+        return view
+
+    sync_view = sync_to_async(view)
+    initkwargs = getattr(view, "initkwargs", {})
+
+    async def async_view(request, *args, **kwargs):
+        if request.method == "GET" and "format" not in kwargs:
+            try:
+                return await _dispatch(cls, initkwargs, actions, action, handler, request, args, kwargs)
+            except Fallback:
+                pass
+        return await sync_view(request, *args, **kwargs)
+
+    async_view.cls = cls
+    async_view.actions = actions
+    async_view.initkwargs = initkwargs
+    return csrf_exempt(async_view)
+
+
+def async_read_urls(patterns):
+    """Apply ``async_read`` to every route in a URL pattern list (e.g. ``router.urls``)."""
+    for pattern in patterns:
+        if isinstance(pattern, URLPattern):
+            pattern.callback = async_read(pattern.callback)
+    return patterns
+
+
+async def _dispatch(cls, initkwargs, actions, action, handler, request, args, kwargs):
+    self = cls(**initkwargs)
+    if actions:  # as ViewSetMixin.as_view() does
+        self.action_map = actions
+        for method, name in actions.items():
+            setattr(self, method, getattr(self, name))
+        self.action = action
+    if hasattr(self, "get") and not hasattr(self, "head"):
+        self.head = self.get
+    self.args, self.kwargs = args, kwargs
+    self.format_kwarg = None
+
+    drf_request = Request(request, parsers=self.get_parsers(), authenticators=(),
+                          negotiator=self.get_content_negotiator(), parser_context=self.get_parser_context(request))
+    self.request = drf_request
+    renderer, media_type = self.perform_content_negotiation(drf_request)
+    if not isinstance(renderer, JSONRenderer):
+        raise Fallback  # e.g. the browsable API
+    drf_request.accepted_renderer, drf_request.accepted_media_type = renderer, media_type
+    drf_request.version, drf_request.versioning_scheme = self.determine_version(drf_request, *args, **kwargs)
+    self.headers = self.default_response_headers
+
+    try:
+        with phase("auth"):
+            drf_request.user, drf_request.auth = await _authenticate(self, drf_request)
+        self.check_permissions(drf_request)
+        self.check_throttles(drf_request)
+        response = await getattr(self, handler)(drf_request, *args, **kwargs)
+    except Fallback:
+        raise
+    except Exception as exc:
+        response = self.handle_exception(exc)  # re-raises what DRF wouldn't handle either
+    response = self.finalize_response(drf_request, response, *args, **kwargs)
+    response.render()
+    # a plain HttpResponse: Django's async handler would re-render template responses in a thread
+    plain = HttpResponse(response.content, status=response.status_code)
+    for name, value in response.items():
+        plain[name] = value
+    return plain
+
+
+async def _authenticate(view, request):
+    for authenticator in view.get_authenticators():
+        if not hasattr(authenticator, "aauthenticate"):
+            raise Fallback
+        result = await authenticator.aauthenticate(request)
+        if result is not None:
+            return result
+    raise Fallback  # anonymous: let DRF produce its 401/anonymous handling
+
+
+class AsyncReadMixin:
+    """``alist``/``aretrieve`` for a GenericAPIView, mirroring ListModelMixin/RetrieveModelMixin."""
+
+    async def alist(self, request, *args, **kwargs):
+        if not hasattr(self.paginator, "apaginate_queryset"):
+            raise Fallback
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return Response(self.get_serializer(await self.aget_object()).data)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, DjangoValidationError, ValueError, TypeError):
+            raise Http404  # as get_object_or_404
+        self.check_object_permissions(self.request, obj)
+        return obj
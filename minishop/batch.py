@@ -0,0 +1,190 @@
+"""
+``POST /api/batch/``: several API requests in one round trip.
+
+::
+
+    {"atomic": false, "requests": [
+        {"id": "me", "method": "GET", "path": "/api/accounts/me/"},
+        {"id": "orders", "method": "GET", "path": "/api/orders/?page_size=20"},
+        {"method": "PATCH", "path": "/api/orders/7/", "body": {"status": "paid"},
+         "headers": {"If-None-Match": "..."}}
+    ]}
+
+Each sub-request is resolved and dispatched to its view in order, inside this
+request: same permissions, throttles, validation and status codes as when it
+is sent on its own. The batch is authenticated once and sub-requests to views
+with the default authenticators run as that user
+(``BatchSubRequestAuthentication``), so the JWT is decoded and the role
+resolved once; views with their own ``authentication_classes`` (or none)
+authenticate the batch's Authorization header as usual. Sub-request reads
+also go to the primary, not a read replica, so they see the batch's own
+writes.
+
+The response lists ``{"id", "status", "headers", "body"}`` in request order.
+JSON bodies are embedded as-is; other bodies as a string. With
+``"atomic": true`` everything runs in one transaction. The first response with
+status >= 400 rolls it back, later requests are answered 424 without being run,
+and ``"committed"`` is false.
+
+Only ``/api/`` paths are accepted, not ``/api/batch/`` itself, and streamed
+responses (exports) are refused. Sub-requests may only set the headers in
+``SUB_REQUEST_HEADERS``; client identity (address, forwarding headers,
+authorization) is always the batch's. An exception in one sub-request is
+logged and answered 500 in its entry; the others still get their responses.
+"""
+import io
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from apps.accounts.authentication import BATCH_AUTH
+from .timing import TimedViewMixin
+
+logger = logging.getLogger("minishop.batch")
+
+DEFAULTS = {"MAX_REQUESTS": 20, "PREFIX": "/api/"}
+
+METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE")
+# request META passed on to every sub-request (the rest is rebuilt per sub-request)
+INHERITED_META = ("REMOTE_ADDR", "SERVER_NAME", "SERVER_PORT", "SERVER_PROTOCOL", "HTTP_HOST",
+                  "HTTP_X_FORWARDED_FOR", "HTTP_X_FORWARDED_PROTO", "HTTP_USER_AGENT", "HTTP_AUTHORIZATION",
+                  "HTTP_ACCEPT_LANGUAGE")
+# the only headers a sub-request may set itself
+SUB_REQUEST_HEADERS = {"accept": "HTTP_ACCEPT", "if-none-match": "HTTP_IF_NONE_MATCH", "if-match": "HTTP_IF_MATCH",
+                       "content-language": "HTTP_CONTENT_LANGUAGE"}
+
+
+def get_batch_settings():
+    return {**DEFAULTS, **getattr(settings, "BATCH_API", {})}
+
+
+class SubRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=100)
+    method = serializers.ChoiceField(choices=METHODS, default="GET")
+    path = serializers.CharField(max_length=2000)
+    headers = serializers.DictField(child=serializers.CharField(max_length=4000), required=False, default=dict)
+    body = serializers.JSONField(required=False, default=None)
+
+    def validate_headers(self, value):
+        unknown = sorted(name for name in value if name.lower() not in SUB_REQUEST_HEADERS)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Headers not allowed in a sub-request: {', '.join(unknown)} "
+                f"(allowed: {', '.join(SUB_REQUEST_HEADERS)})."
+            )
+        return value
+
+    def validate_path(self, value):
+        prefix = get_batch_settings()["PREFIX"]
+        if not value.startswith(prefix):
+            raise serializers.ValidationError(f"Only paths under {prefix} can be batched.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    atomic = serializers.BooleanField(default=False)
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        limit = get_batch_settings()["MAX_REQUESTS"]
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} requests per batch.")
+        return value
+
+
+class BatchView(TimedViewMixin, APIView):
+    def post(self, request):
+        ser = BatchSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        subs = ser.validated_data["requests"]
+        if not ser.validated_data["atomic"]:
+            parts = [self.run(request, sub) for sub in subs]
+            return self.envelope(subs, parts)
+
+        parts = []
+        with transaction.atomic():
+            for sub in subs:
+                if parts and parts[-1][0] >= 400:
+                    parts.append(_error(424, "Not run: an earlier request in the atomic batch failed."))
+                    continue
+                parts.append(self.run(request, sub))
+            committed = not any(status >= 400 for status, _, _ in parts)
+            if not committed:
+                transaction.set_rollback(True)
+        return self.envelope(subs, parts, committed)
+
+    def run(self, request, sub):
+        """(status, headers, JSON body bytes) of one sub-request."""
+        path, _, query = sub["path"].partition("?")
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return _error(404, "Not found.")
+        if getattr(match.func, "cls", None) is BatchView:
+            return _error(400, "Batches can't be nested.")
+
+        body = b"" if sub["body"] is None else json.dumps(sub["body"]).encode()
+        environ = {key: request.META[key] for key in INHERITED_META if key in request.META}
+        environ.update({
+            "REQUEST_METHOD": sub["method"], "PATH_INFO": path, "SCRIPT_NAME": "", "QUERY_STRING": query,
+            "CONTENT_TYPE": "application/json", "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body), "wsgi.url_scheme": request.scheme,
+        })
+        for name, value in sub["headers"].items():
+            environ[SUB_REQUEST_HEADERS[name.lower()]] = value
+        sub_request = WSGIRequest(environ)
+        sub_request.resolver_match = match
+        sub_request.COOKIES = request.COOKIES
+        if hasattr(request._request, "session"):
+            sub_request.session = request._request.session
+        # the batch's user/token for views using the default authenticators (no second JWT decode);
+        # views with their own authentication_classes authenticate the copied Authorization header
+        setattr(sub_request, BATCH_AUTH, (request.user, request.auth))
+
+        try:
+            response = _sync_view(match.func)(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            # earlier sub-requests may have committed already: answer the rest instead of failing the batch
+            logger.exception("Batch sub-request failed: %s %s", sub["method"], sub["path"])
+            return _error(500, "Server error.")
+        if response.streaming:
+            return _error(400, "Streaming responses can't be batched.")
+        if hasattr(response, "render"):
+            response.render()
+        content = response.content if sub["method"] != "HEAD" else b""
+        if not content:
+            content = b"null"
+        elif not response.get("Content-Type", "").startswith("application/json"):
+            content = json.dumps(content.decode(response.charset, "replace")).encode()
+        return response.status_code, dict(response.items()), content
+
+    def envelope(self, subs, parts, committed=None):
+        chunks = []
+        for index, (sub, (status, headers, content)) in enumerate(zip(subs, parts)):
+            head = json.dumps({"id": sub.get("id", str(index)), "status": status, "headers": headers},
+                              separators=(",", ":"))
+            chunks.append(head[:-1].encode() + b',"body":' + content + b"}")
+        head = b"{" if committed is None else b'{"committed":' + json.dumps(committed).encode() + b","
+        return HttpResponse(head + b'"responses":[' + b",".join(chunks) + b"]}",
+                            content_type="application/json")
+
+
+def _error(status, detail):
+    return status, {"Content-Type": "application/json"}, json.dumps({"detail": detail}, separators=(",", ":")).encode()
+
+
+def _sync_view(func):
+    # async_read() twins (ASGI) dispatch through the event loop; batches run the regular DRF view
+    if iscoroutinefunction(func) and getattr(func, "cls", None) is not None:
+        actions = getattr(func, "actions", None)
+        initkwargs = getattr(func, "initkwargs", {})
+        return func.cls.as_view(actions, **initkwargs) if actions else func.cls.as_view(**initkwargs)
+    return func
@@ -0,0 +1,125 @@
+"""
+Delta-sync change feeds (``GET <list url>changes/?since=<cursor>``).
+
+``ChangesFeedMixin`` adds a ``changes`` action to a model viewset: the rows
+whose ``(updated_at, id)`` is past the cursor, in that order (a range scan on an
+``(updated_at, id)`` index), and the ids deleted since, from the viewset's
+``tombstone_model`` (filled by a ``post_delete`` receiver)::
+
+    {"since": "<cursor for the next poll>", "has_more": false,
+     "results": [...], "deleted": [12, 40]}
+
+Clients upsert ``results``, drop ``deleted`` and, while ``has_more``, poll
+again right away. Without ``since`` the feed starts with every row (paged the
+same way) and deletes from then on.
+
+The cursor stays ``SETTLE_SECONDS`` behind the clock, so rows saved by
+transactions that commit late, or reach a read replica late, are sent again on
+the next poll instead of being skipped. Tombstones are kept ``TOMBSTONE_DAYS``
+(``prune_tombstones``); an older cursor gets 410 and the client resyncs from
+scratch.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.response import Response
+
+from .pagination import KeysetPagination
+from .timing import phase
+
+DEFAULTS = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 1000,
+    "SETTLE_SECONDS": 5,
+    "TOMBSTONE_DAYS": 30,
+}
+
+INVALID_CURSOR = "Invalid cursor"
+
+
+def get_changes_settings():
+    return {**DEFAULTS, **getattr(settings, "CHANGES_FEED", {})}
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Cursor is older than the retained deletes; sync again without since."
+    default_code = "cursor_expired"
+
+
+def encode_since(updated, deleted):
+    """Cursor for the (updated_at, id) and (deleted_at, tombstone id) positions."""
+    raw = json.dumps({"u": [updated[0].isoformat(), updated[1]], "d": [deleted[0].isoformat(), deleted[1]]},
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_since(token):
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        positions = [(parse_datetime(cursor[key][0]), int(cursor[key][1])) for key in ("u", "d")]
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError):
+        raise NotFound(INVALID_CURSOR)
+    if any(at is None or timezone.is_naive(at) for at, _ in positions):
+        raise NotFound(INVALID_CURSOR)
+    return positions
+
+
+class ChangesFeedMixin:
+    tombstone_model = None
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        conf = get_changes_settings()
+        now = timezone.now()
+        settled = (now - datetime.timedelta(seconds=conf["SETTLE_SECONDS"]), 0)
+        token = request.query_params.get("since")
+        if token:
+            updated, deleted = decode_since(token)
+            if deleted[0] < now - datetime.timedelta(days=conf["TOMBSTONE_DAYS"]):
+                raise CursorExpired()
+        else:
+            updated, deleted = None, settled
+        size = self.changes_page_size(request, conf)
+
+        queryset = self.get_queryset().order_by("updated_at", "pk")
+        if updated is not None:
+            queryset = queryset.filter(KeysetPagination.seek(["updated_at", "pk"], updated))
+        fast = self.row_serializer() if hasattr(self, "row_serializer") else None
+        rows = list((fast.rows(queryset) if fast else queryset)[: size + 1])
+        tombstones = list(self.tombstone_model.objects.order_by("deleted_at", "id")
+                          .filter(KeysetPagination.seek(["deleted_at", "id"], deleted))
+                          .values_list("deleted_at", "id", "object_id")[: size + 1])
+        more_rows, more_deletes = len(rows) > size, len(tombstones) > size
+        rows, tombstones = rows[:size], tombstones[:size]
+
+        # a full page continues after its last entry; otherwise everything up to now was read
+        if more_rows:
+            updated = (rows[-1].updated_at, getattr(rows[-1], fast.spec.pk if fast else "pk"))
+        else:
+            updated = max(updated, settled) if updated else settled
+        deleted = tombstones[-1][:2] if more_deletes else max(deleted, settled)
+        with phase("serialize"):
+            data = fast.serialize(rows) if fast else self.get_serializer(rows, many=True).data
+        return Response({
+            "since": encode_since(updated, deleted),
+            "has_more": more_rows or more_deletes,
+            "results": data,
+            "deleted": [object_id for _, _, object_id in tombstones],
+        })
+
+    def changes_page_size(self, request, conf):
+        try:
+            size = int(request.query_params["page_size"])
+        except (KeyError, ValueError):
+            return conf["PAGE_SIZE"]
+        return max(1, min(size, conf["MAX_PAGE_SIZE"]))
+
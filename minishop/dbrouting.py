@@ -0,0 +1,210 @@
+"""
+Read replicas (``settings.DATABASE_REPLICAS``).
+
+``ReplicaRouter`` sends the reads of safe-method (GET/HEAD) requests to a
+replica when the resolved view opts in with ``replica_reads = True``; writes,
+every other request, management commands and anything inside a transaction on
+the primary stay on the primary. One replica is picked per request, round-robin
+over the healthy ones: a replica is probed with ``SELECT 1`` at most every
+``HEALTH_CHECK_SECONDS`` and skipped until a later probe succeeds. With no
+healthy replica the primary serves the read.
+
+Read-your-writes: after a request that wrote to the primary, the user is pinned
+to it for ``PIN_SECONDS`` (a key in the ``CACHE`` alias), longer than the
+replication lag we expect. The pin is set by one worker and read by all of
+them, so with replicas configured the alias goes through ``require_shared``.
+
+``ReplicaRoutingMiddleware`` provides the request to the router and records the
+pins. Locally, ``DB_SQLITE_REPLICAS=2`` adds two SQLite files as replicas,
+refreshed from the primary by ``python manage.py sync_replicas``.
+"""
+import contextvars
+import itertools
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import Error, connections
+from django.utils.functional import SimpleLazyObject, empty
+
+from .sharedcache import require_shared
+
+logger = logging.getLogger("minishop.dbrouting")
+
+DEFAULTS = {
+    "PRIMARY": "default",
+    "REPLICAS": [],
+    "PIN_SECONDS": 5,
+    "HEALTH_CHECK_SECONDS": 10,
+    "CACHE": "default",
+}
+
+SAFE_METHODS = ("GET", "HEAD")
+
+_current = contextvars.ContextVar("replica_route", default=None)
+
+
+def get_replica_settings():
+    return {**DEFAULTS, **getattr(settings, "DATABASE_REPLICAS", {})}
+
+
+def pin_key(user_id):
+    return f"dbpin:{user_id}"
+
+
+class ReplicaPool:
+    """Round-robin over replica aliases, skipping those whose last health probe failed."""
+
+    def __init__(self, aliases, check_seconds):
+        self.aliases = list(aliases)
+        self.check_seconds = check_seconds
+        self._cycle = itertools.cycle(self.aliases)
+        self._lock = threading.Lock()
+        self._checked = {}  # alias -> (monotonic time of last probe, healthy)
+
+    def choose(self):
+        for _ in range(len(self.aliases)):
+            with self._lock:
+                alias = next(self._cycle)
+            if self.healthy(alias):
+                return alias
+        return None
+
+    def healthy(self, alias):
+        checked_at, ok = self._checked.get(alias, (None, True))
+        if checked_at is not None and time.monotonic() - checked_at < self.check_seconds:
+            return ok
+        ok = self.probe(alias)
+        self._checked[alias] = (time.monotonic(), ok)
+        return ok
+
+    def probe(self, alias):
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Error as exc:
+            logger.warning("Replica %s unavailable: %s", alias, exc, extra={"alias": alias})
+            return False
+
+
+class _Route:
+    """Routing state of the current request."""
+
+    __slots__ = ("request", "replica", "pinned", "wrote", "used")
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = None  # alias, or False once the request is known to read from the primary
+        self.pinned = None  # None until the user is known
+        self.wrote = False
+        self.used = False  # a read went to the replica
+
+
+def read_from_replica():
+    """Whether the current request read from a replica (data up to ``PIN_SECONDS`` behind the primary)."""
+    route = _current.get()
+    return route is not None and route.used
+
+
+def _known_user(request):
+    """The request's user once authenticated (DRF sets it on the HttpRequest); never triggers a lookup."""
+    user = request.__dict__.get("user")
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+    return user if user is not None and user.is_authenticated else None
+
+
+class ReplicaRouter:
+    def __init__(self):
+        conf = get_replica_settings()
+        self.primary = conf["PRIMARY"]
+        self.replicas = set(conf["REPLICAS"])
+        self.pool = ReplicaPool(conf["REPLICAS"], conf["HEALTH_CHECK_SECONDS"])
+        self.cache = conf["CACHE"]
+
+    def db_for_read(self, model, **hints):
+        route = _current.get()
+        if route is None or not self.replicas or route.replica is False:
+            return self.primary
+        if route.replica is None:
+            if not self.eligible(route.request) or connections[self.primary].in_atomic_block:
+                return self.primary
+            route.replica = self.pool.choose() or False
+        if route.pinned is None:
+            user = _known_user(route.request)
+            if user is not None:
+                route.pinned = caches[self.cache].get(pin_key(user.pk)) is not None
+        if not route.replica or route.pinned or connections[self.primary].in_atomic_block:
+            return self.primary
+        route.used = True
+        return route.replica
+
+    def db_for_write(self, model, **hints):
+        route = _current.get()
+        if route is not None:
+            route.wrote = True
+        # explicit: Django would otherwise write instances back to the replica they were read from
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {self.primary, *self.replicas}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in self.replicas else None
+
+    def eligible(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        match = getattr(request, "resolver_match", None)
+        cls = getattr(match.func, "cls", None) if match else None
+        return bool(getattr(cls, "replica_reads", False))
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.conf = get_replica_settings()
+        if self.conf["REPLICAS"]:
+            require_shared(self.conf["CACHE"], 'Read-your-writes pins (DATABASE_REPLICAS["CACHE"])')
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        route = _Route(request)
+        token = _current.set(route)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.pin(route)
+        return response
+
+    async def __acall__(self, request):
+        route = _Route(request)
+        token = _current.set(route)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.pin(route)
+        return response
+
+    def pin(self, route):
+        if not route.wrote or not self.conf["REPLICAS"]:
+            return
+        user = _known_user(route.request)
+        if user is not None:
+            caches[self.conf["CACHE"]].set(pin_key(user.pk), 1, self.conf["PIN_SECONDS"])
@@ -0,0 +1,170 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek pagination on the queryset's own ordering plus a primary key tiebreaker.
+
+    The cursor carries the ordering values of the first/last row of the page, so
+    every page is a bounded index range scan and no COUNT(*) is issued. Ordering
+    fields must be non-nullable.
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """The page's rows plus one (to detect more) as a lazy queryset."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor["r"])
+        self.has_cursor = cursor is not None
+
+        ordering = [_flip(f) for f in self.ordering] if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            try:
+                queryset = queryset.filter(self.seek(ordering, cursor["v"]))
+            except (DjangoValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or ["-pk"])
+        pk_name = queryset.model._meta.pk.name
+        ordering = [_normalize(f, pk_name) for f in ordering]
+        if not any(f.lstrip("-") == pk_name for f in ordering):
+            ordering.append(("-" if ordering[0].startswith("-") else "") + pk_name)
+        return ordering
+
+    @staticmethod
+    def seek(ordering, values):
+        # (a < va) OR (a = va AND ((b < vb) OR (b = vb AND ...))), with a leading
+        # range bound on the first column so the planner can use the index.
+        q = None
+        for field, value in reversed(list(zip(ordering, values))):
+            name = field.lstrip("-")
+            op = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{op}": value})
+            q = step if q is None else step | (Q(**{name: value}) & q)
+        first = ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": values[0]}) & q
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        values = [_dump(_value(row, f.lstrip("-"))) for f in self.ordering]
+        raw = json.dumps({"v": values, "r": int(reverse)}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            cursor = json.loads(raw)
+            values, reverse = cursor["v"], bool(cursor["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return {"v": values, "r": reverse}
+
+
+def _normalize(field, pk_name):
+    if not isinstance(field, str):
+        raise TypeError("KeysetPagination only supports ordering by field names.")
+    desc = field.startswith("-")
+    name = field.lstrip("-")
+    if name == "pk":
+        name = pk_name
+    return ("-" if desc else "") + name
+
+
+def _flip(field):
+    return field[1:] if field.startswith("-") else "-" + field
+
+
+def _value(row, name):
+    if isinstance(row, dict):
+        return row[name]
+    for part in name.split("__"):
+        row = getattr(row, part)
+    return row
+
+
+def _dump(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
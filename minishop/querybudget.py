@@ -0,0 +1,115 @@
+"""
+Per-request SQL accounting.
+
+``QueryBudgetMiddleware`` counts and times every statement a request runs (via
+``connection.execute_wrapper``) and logs requests that exceed their budget from
+``settings.QUERY_BUDGET`` (keyed by ``"<METHOD> <url name>"`` or ``"<url name>"``,
+see ``get_budget``). ``query_budget`` is the same check as a context manager /
+decorator for tests, raising ``QueryBudgetExceeded`` on regressions
+(``minishop/tests/test_query_budgets.py`` holds the API views to their budgets).
+"""
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("minishop.querybudget")
+
+DEFAULTS = {"DEFAULT": 20, "VIEWS": {}, "STRICT": False}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    max_recorded = 50
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            if len(self.statements) < self.max_recorded:
+                self.statements.append(sql)
+
+    def describe(self):
+        return "\n".join(f"  {i}. {sql}" for i, sql in enumerate(self.statements, 1))
+
+
+@contextmanager
+def count_queries(using=None):
+    """Count statements on ``using`` (default: every configured database)."""
+    counter = QueryCounter()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(counter))
+        yield counter
+
+
+@contextmanager
+def query_budget(max_queries, using=None):
+    with count_queries(using) as counter:
+        yield counter
+    if counter.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{counter.count} queries executed, budget is {max_queries}:\n{counter.describe()}"
+        )
+
+
+def get_budget_settings():
+    return {**DEFAULTS, **getattr(settings, "QUERY_BUDGET", {})}
+
+
+def get_budget(method, name, conf=None):
+    conf = conf or get_budget_settings()
+    per_view = conf["VIEWS"]
+    return per_view.get(f"{method} {name}", per_view.get(name, conf["DEFAULT"]))
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.conf = get_budget_settings()
+        self.strict = self.conf["STRICT"]
+
+    def __call__(self, request):
+        if self.async_mode:
+            # ASGI: the ORM runs on per-request worker threads whose connections we can't wrap
+            # from here without extra thread hops, so async requests are not counted.
+            return self.get_response(request)
+        start = time.perf_counter()
+        with count_queries() as counter:
+            response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        name = match.url_name if match else None
+        budget = get_budget(request.method, name, self.conf)
+        if counter.count > budget:
+            logger.warning(
+                "Query budget exceeded: %s %s (%s) ran %d queries in %.1f ms, budget %d",
+                request.method, request.path, name, counter.count, counter.duration * 1000, budget,
+                extra={"path": request.path, "view": name, "queries": counter.count,
+                       "sql_ms": round(counter.duration * 1000, 2),
+                       "total_ms": round((time.perf_counter() - start) * 1000, 2),
+                       "budget": budget},
+            )
+            if self.strict:
+                raise QueryBudgetExceeded(f"{name}: {counter.count} > {budget}\n{counter.describe()}")
+        return response
@@ -0,0 +1,35 @@
+"""
+``FastJSONRenderer``: DRF's ``JSONRenderer`` output, encoded by orjson.
+
+The bytes are the same as the stock renderer's for the default settings
+(compact separators, UTF-8, ``\\u2028``/``\\u2029`` escaped): types orjson
+would format differently (datetimes, Decimals, lazy strings, ...) are handed to
+DRF's ``JSONEncoder``. Indented output (``?indent=``/browsable API), non-default
+``UNICODE_JSON``/``COMPACT_JSON`` and anything orjson rejects fall back to the
+stock renderer, as does a missing orjson.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional: plain JSONRenderer behaviour
+    orjson = None
+
+_LINE_SEPARATORS = ("\u2028".encode(), "\u2029".encode())
+_OPTIONS = 0 if orjson is None else (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_OPTIONS)
+        except (orjson.JSONEncodeError, TypeError):  # e.g. ints beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        if _LINE_SEPARATORS[0] in ret or _LINE_SEPARATORS[1] in ret:
+            ret = ret.replace(_LINE_SEPARATORS[0], b"\\u2028").replace(_LINE_SEPARATORS[1], b"\\u2029")
+        return ret
@@ -0,0 +1,283 @@
+"""
+Read-only fast path for ModelSerializer output.
+
+``RowSerializer(SerializerClass)`` compiles the serializer's readable fields
+once into ``(name, column, converter)`` triples and then builds the same dicts
+DRF would, straight from ``values_list(named=True)`` rows (tuple-backed, so
+the keyset paginator can still read cursor values from them). Decimal and
+datetime converters reproduce ``DecimalField``/``DateTimeField.to_representation``
+exactly; columns that need no conversion are copied as-is. Reverse-FK
+``many=True`` children (``OrderSerializer.items``) are fetched with one query
+per page, like the prefetch they replace.
+
+Fields without a known equivalent (method fields, hyperlinks, nested objects,
+dotted sources, custom formats, ...) leave ``RowSerializer.supported`` false and
+views keep using the regular serializer.
+"""
+import decimal
+from functools import cached_property
+from operator import attrgetter
+
+from django.db.models import aprefetch_related_objects
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .timing import phase
+
+_IDENTITY = (drf_fields.IntegerField, drf_fields.CharField, drf_fields.BooleanField, drf_fields.ReadOnlyField)
+
+
+class Unsupported(Exception):
+    pass
+
+
+class RowSerializer:
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def spec(self):
+        try:
+            return _compile(self.serializer_class())
+        except Unsupported:
+            return None
+
+    @property
+    def supported(self) -> bool:
+        return self.spec is not None
+
+    def rows(self, queryset):
+        """The queryset as named tuples of the columns ``serialize`` needs (ordering columns included)."""
+        columns = list(self.spec.columns)
+        for name in queryset.query.order_by:
+            name = name.lstrip("-")
+            name = self.spec.pk if name == "pk" else name
+            if "__" not in name and name not in columns:
+                columns.append(name)
+        return queryset.prefetch_related(None).values_list(*columns, named=True)
+
+    def serialize(self, rows):
+        return self.spec.serialize(list(rows))
+
+    def serialize_instance(self, instance):
+        """Same output for one model instance (detail views; uses prefetched children if present)."""
+        return self.spec.serialize_instance(instance)
+
+    async def aserialize(self, rows):
+        return await self.spec.aserialize(list(rows))
+
+
+class _Spec:
+    def __init__(self, model, fields, children):
+        self.model = model
+        self.pk = model._meta.pk.attname
+        self.fields = fields  # [(output name, column or None for a child, converter factory or None)]
+        self.children = children  # {output name: (_Spec, related accessor, fk column)}
+        self.columns = list(dict.fromkeys([self.pk, *(column for _, column, _ in fields if column)]))
+
+    def build(self, rows, children):
+        """Output dicts in declared field order; ``children`` maps name -> {parent pk: [child dicts]}."""
+        pk = attrgetter(self.pk)
+        # per call, not per row: datetime converters resolve the active timezone
+        getters = []
+        for name, column, factory in self.fields:
+            if column is None:
+                grouped = children.get(name, {})
+                getters.append((name, lambda row, grouped=grouped: grouped.get(pk(row), []), None))
+            else:
+                getters.append((name, attrgetter(column), factory() if factory else None))
+        if all(conv is None for _, _, conv in getters):
+            return [{name: get(row) for name, get, _ in getters} for row in rows]
+        out = []
+        for row in rows:
+            item = {}
+            for name, get, conv in getters:
+                value = get(row)
+                item[name] = value if conv is None or value is None else conv(value)
+            out.append(item)
+        return out
+
+    def serialize(self, rows):
+        ids = [getattr(row, self.pk) for row in rows]
+        children = {name: _group(spec, fk, list(spec.child_queryset(fk, ids)))
+                    for name, (spec, accessor, fk) in self.children.items()} if ids else {}
+        return self.build(rows, children)
+
+    async def aserialize(self, rows):
+        ids = [getattr(row, self.pk) for row in rows]
+        children = {}
+        for name, (spec, accessor, fk) in self.children.items() if ids else ():
+            children[name] = _group(spec, fk, [row async for row in spec.child_queryset(fk, ids)])
+        return self.build(rows, children)
+
+    def child_queryset(self, fk, ids):
+        # same filter (and default ordering) as the related-manager prefetch
+        return self.model._default_manager.filter(**{f"{fk}__in": ids}).values_list(
+            *dict.fromkeys([fk, *self.columns]), named=True)
+
+    def serialize_instance(self, instance):
+        row = _InstanceRow(instance)
+        children = {}
+        for name, (spec, accessor, fk) in self.children.items():
+            related = [_InstanceRow(obj) for obj in getattr(instance, accessor).all()]
+            children[name] = {getattr(instance, self.pk): spec.build(related, {})}
+        return self.build([row], children)[0]
+
+
+class _InstanceRow:
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __getattr__(self, name):
+        return getattr(self.obj, name)
+
+
+def _group(spec, fk, rows):
+    grouped = {}
+    for key, item in zip(map(attrgetter(fk), rows), spec.build(rows, {})):
+        grouped.setdefault(key, []).append(item)
+    return grouped
+
+
+def _compile(serializer):
+    if not isinstance(serializer, serializers.ModelSerializer):
+        raise Unsupported(type(serializer).__name__)
+    model = serializer.Meta.model
+    fields, children = [], {}
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        source = field.source
+        if source == "*" or "." in source:
+            raise Unsupported(field.field_name)
+        if isinstance(field, serializers.ListSerializer):
+            rel = model._meta.get_field(source)
+            if not rel.one_to_many or not rel.auto_created:
+                raise Unsupported(field.field_name)
+            child = _compile(field.child)
+            children[field.field_name] = (child, rel.get_accessor_name(), rel.field.attname)
+            fields.append((field.field_name, None, None))
+            continue
+        fields.append((field.field_name, *_column(model, field, source)))
+    return _Spec(model, fields, children)
+
+
+def _column(model, field, source):
+    """(column for values_list, converter factory or None)."""
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            raise Unsupported(field.field_name)
+        return model._meta.get_field(source).attname, None
+    if isinstance(field, relations.RelatedField) or isinstance(field, serializers.BaseSerializer):
+        raise Unsupported(field.field_name)
+    if isinstance(field, drf_fields.DecimalField):
+        return source, _decimal(field)
+    if isinstance(field, drf_fields.DateTimeField):
+        return source, _datetime(field)
+    if isinstance(field, (drf_fields.DateField, drf_fields.UUIDField)) and type(field).to_representation in (
+            drf_fields.DateField.to_representation, drf_fields.UUIDField.to_representation):
+        return source, lambda: field.to_representation
+    if isinstance(field, _IDENTITY) and type(field).to_representation in {
+            cls.to_representation for cls in _IDENTITY}:
+        return source, None
+    raise Unsupported(field.field_name)
+
+
+def _decimal(field):
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce or field.localize or field.decimal_places is None:
+        raise Unsupported(field.field_name)
+    exp = decimal.Decimal(".1") ** field.decimal_places
+    normalize = field.normalize_output
+
+    def factory():
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+
+        def convert(value):
+            if not isinstance(value, decimal.Decimal):
+                return field.to_representation(value)
+            quantized = value.quantize(exp, rounding=field.rounding, context=context)
+            if normalize:
+                quantized = quantized.normalize()
+            return f"{quantized:f}"
+        return convert
+    return factory
+
+
+def _datetime(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != drf_fields.ISO_8601:
+        raise Unsupported(field.field_name)
+
+    def factory():
+        tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if tz is None:
+            return field.to_representation
+
+        def convert(value):
+            if not value or value.tzinfo is None:
+                return field.to_representation(value)
+            text = value.astimezone(tz).isoformat()
+            return text[:-6] + "Z" if text.endswith("+00:00") else text
+        return convert
+    return factory
+
+
+class FastReadMixin:
+    """
+    ``list``/``retrieve`` (and the async ``alist``/``aretrieve``) through a
+    ``RowSerializer`` of ``serializer_class``; any other action, or a serializer
+    the fast path can't compile, uses the regular DRF code.
+    """
+
+    @classmethod
+    def row_serializer(cls):
+        if "_row_serializer" not in cls.__dict__:
+            cls._row_serializer = RowSerializer(cls.serializer_class)
+        return cls._row_serializer if cls._row_serializer.supported else None
+
+    def list(self, request, *args, **kwargs):
+        fast = self.row_serializer()
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        rows = fast.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        with phase("serialize"):
+            data = fast.serialize(rows if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    async def alist(self, request, *args, **kwargs):
+        fast = self.row_serializer()
+        if fast is None or not hasattr(self.paginator, "apaginate_queryset"):
+            return await super().alist(request, *args, **kwargs)
+        rows = fast.rows(self.filter_queryset(self.get_queryset()))
+        page = await self.paginator.apaginate_queryset(rows, request, view=self)
+        with phase("serialize"):
+            data = await fast.aserialize(page)
+        return self.get_paginated_response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        fast = self.row_serializer()
+        if fast is None:
+            return super().retrieve(request, *args, **kwargs)
+        instance = self.get_object()  # object permissions see the model instance as before
+        with phase("serialize"):
+            return Response(fast.serialize_instance(instance))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        fast = self.row_serializer()
+        if fast is None:
+            return await super().aretrieve(request, *args, **kwargs)
+        instance = await self.aget_object()
+        # children come from the queryset's prefetch when it has one, else one query here
+        await aprefetch_related_objects([instance], *(accessor for _, accessor, _ in fast.spec.children.values()))
+        with phase("serialize"):
+            return Response(fast.serialize_instance(instance))
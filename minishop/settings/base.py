@@ -23,6 +23,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "minishop.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -30,6 +31,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "minishop.querybudget.QueryBudgetMiddleware",
+    "minishop.dbrouting.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "minishop.urls"
@@ -58,8 +61,39 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = "static/"
+
+# In-process caches; point CATALOG_CACHE_BACKEND at FileBasedCache to share
+# entries between worker processes without an external service.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "catalog": {
+        "BACKEND": os.environ.get("CATALOG_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CATALOG_CACHE_LOCATION", "catalog"),
+        "TIMEOUT": int(os.environ.get("CATALOG_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("CATALOG_CACHE_MAX_ENTRIES", 5000))},
+    },
+    # revoked jtis and role-change stamps only: an evicted entry makes a logged-out or demoted token valid
+    # again. Entries expire with the access token; size for a token lifetime's worth of logouts/role changes.
+    "auth": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("AUTH_CACHE_MAX_ENTRIES", 100_000))},
+    },
+}
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# GET/HEAD reads of views with replica_reads = True go to these aliases (round-robin, health-checked); a user
+# who just wrote reads from the primary for PIN_SECONDS. See minishop/dbrouting.py.
+DATABASE_ROUTERS = ["minishop.dbrouting.ReplicaRouter"]
+DATABASE_REPLICAS = {
+    "REPLICAS": [],
+    "PIN_SECONDS": int(os.environ.get("DB_REPLICA_PIN_SECONDS", 5)),
+    "HEALTH_CHECK_SECONDS": int(os.environ.get("DB_REPLICA_HEALTH_CHECK_SECONDS", 10)),
+    "CACHE": "default",
+}
+
 
 
 APPEND_SLASH = False
@@ -67,21 +101,116 @@ APPEND_SLASH = False
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "noreply@example.com"
 
+# "db": load auth_user per request (role claims still skip the groups query);
+# "stateless": request.user is built from token claims, no auth query.
+JWT_AUTH_MODE = os.getenv("JWT_AUTH_MODE", "db")
+JWT_AUTH_CLASSES = {
+    "db": "apps.accounts.authentication.RoleClaimJWTAuthentication",
+    "stateless": "apps.accounts.authentication.StatelessJWTAuthentication",
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # JWT only
+        "apps.accounts.authentication.BatchSubRequestAuthentication",  # batch sub-requests: the batch's user
+        JWT_AUTH_CLASSES[JWT_AUTH_MODE],  # JWT only
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'minishop.renderers.FastJSONRenderer',  # same bytes as JSONRenderer, orjson-encoded
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'minishop.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    # client IP for throttles: 0 = REMOTE_ADDR, N = the address N hops back in X-Forwarded-For (N trusted
+    # proxies in front). Unset, DRF would trust the whole client-supplied header.
+    'NUM_PROXIES': int(os.environ.get("NUM_PROXIES", 0)),
+}
+
+# Async GET handlers for the hot read endpoints; asgi.py turns this on (async views under WSGI would
+# each spin up an event loop).
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS") == "1"
+
+# Per-request SQL budget, keyed by "METHOD url-name" or url-name; over-budget requests are logged
+# (and raise when STRICT, e.g. under tests).
+QUERY_BUDGET = {
+    "DEFAULT": 20,
+    "VIEWS": {
+        "GET me": 3,
+        "GET user-list": 4,
+        "GET user-detail": 4,
+        "GET invitation-list": 3,
+        "GET invitation-detail": 3,
+        "GET product-list": 3,
+        "GET product-detail": 3,
+        "GET order-list": 4,
+        "GET order-detail": 4,
+        "POST batch": 200,  # up to BATCH_API["MAX_REQUESTS"] sub-requests
+        "POST invitation-bulk": 120,  # 2 checks + chunked bulk inserts (SQLite caps ~140 rows per INSERT)
+    },
+    "STRICT": os.environ.get("QUERY_BUDGET_STRICT") == "1",
+}
+
+# `changes/?since=` delta feeds (minishop/changes.py). SETTLE_SECONDS re-sends recent rows on the next poll and
+# should cover the replica lag allowed for by DATABASE_REPLICAS["PIN_SECONDS"].
+CHANGES_FEED = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 1000,
+    "SETTLE_SECONDS": int(os.environ.get("CHANGES_SETTLE_SECONDS", 5)),
+    "TOMBSTONE_DAYS": int(os.environ.get("TOMBSTONE_DAYS", 30)),
+}
+
+# Server-Timing header (auth/rbac/validate/serialize/render/db/app), slow-request logging and
+# sampled cProfile dumps of slow requests, see minishop/timing.py.
+SERVER_TIMING = {
+    "ENABLED": os.environ.get("SERVER_TIMING", "1") == "1",
+    "HEADER": os.environ.get("SERVER_TIMING_HEADER", "1") == "1",
+    "LOG_THRESHOLD_MS": float(os.environ.get("SLOW_REQUEST_MS", 500)),
+    "PROFILE_SAMPLE_RATE": float(os.environ.get("PROFILE_SAMPLE_RATE", 0)),
+    "PROFILE_THRESHOLD_MS": float(os.environ.get("PROFILE_THRESHOLD_MS", 1000)),
+    "PROFILE_DIR": os.environ.get("PROFILE_DIR", str(BASE_DIR / "profiles")),
+}
+
+# POST /api/batch/ (minishop/batch.py): sub-requests per batch, and the paths they may target.
+BATCH_API = {
+    "MAX_REQUESTS": int(os.environ.get("BATCH_MAX_REQUESTS", 20)),
+    "PREFIX": "/api/",
+}
+
+# Admission control for the password-hashing endpoints (login, invitation accept, user
+# create/update), see minishop/admission.py. Buckets live in CACHE; the semaphore is per process.
+ADMISSION = {
+    "ENABLED": os.environ.get("ADMISSION", "1") == "1",
+    "MAX_CONCURRENT": int(os.environ.get("ADMISSION_MAX_CONCURRENT", 2)),
+    "MAX_QUEUE": int(os.environ.get("ADMISSION_MAX_QUEUE", 4)),
+    "QUEUE_TIMEOUT": float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 2.0)),
+    "RATES": {
+        "ip": os.environ.get("ADMISSION_IP_RATE", "60/min"),
+        "username": os.environ.get("ADMISSION_USERNAME_RATE", "10/min"),
+    },
+    "CACHE": "default",
 }
 
 SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=72),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "TOKEN_OBTAIN_SERIALIZER": "apps.accounts.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.tokens.RoleTokenRefreshSerializer",
 }
 
+# Per-process cache of user group names for requests without role claims (seconds).
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", "300"))
+# Cache alias holding revoked token jtis (logout); use a shared backend when running several processes.
+# Not "default": admission buckets and replica pins there would cull revocations under load.
+TOKEN_REVOCATION_CACHE = "auth"
+# Cache alias for role-change stamps: role claims older than a stamp are ignored. Must be shared by all
+# workers, or a demoted user keeps the old role on the workers that didn't handle the change.
+ROLE_CHANGE_CACHE = TOKEN_REVOCATION_CACHE
+# Refuse to start when an alias above (or another cross-worker one) is process-local; see minishop/sharedcache.py.
+REQUIRE_SHARED_CACHES = False
+
 
 INSTALLED_APPS += ['corsheaders']
 MIDDLEWARE = ['corsheaders.middleware.CorsMiddleware', *MIDDLEWARE]
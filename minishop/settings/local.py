@@ -4,6 +4,13 @@ ALLOWED_HOSTS = ["*"]
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "dev-secret")
 from datetime import timedelta
 SIMPLE_JWT = {
+    **SIMPLE_JWT,
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
+
+# DB_SQLITE_REPLICAS=N: N SQLite copies of the primary as read replicas (refresh with `manage.py sync_replicas`).
+_replicas = [f"replica{i}" for i in range(1, int(os.getenv("DB_SQLITE_REPLICAS", "0")) + 1)]
+for _alias in _replicas:
+    DATABASES[_alias] = {**DATABASES["default"], "NAME": BASE_DIR / f"db.{_alias}.sqlite3", "TEST": {"MIRROR": "default"}}
+DATABASE_REPLICAS = {**DATABASE_REPLICAS, "REPLICAS": _replicas}
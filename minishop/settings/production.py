@@ -10,6 +10,35 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
 
+# State every worker must see: replica pins ("shared"), revoked jtis and role-change stamps ("auth"), the
+# catalog version. File caches under CACHE_DIR by default (one host, no outside service);
+# <ALIAS>_CACHE_BACKEND/<ALIAS>_CACHE_LOCATION point an alias elsewhere, e.g. Redis (needs the `redis` package).
+# Startup fails if one of them is process-local.
+FILE_CACHE = "django.core.cache.backends.filebased.FileBasedCache"
+CACHE_DIR = os.environ.get("CACHE_DIR", str(BASE_DIR / "cache"))
+
+
+def _cache_from_env(prefix, max_entries, **conf):
+    backend = os.environ.get(f"{prefix}_CACHE_BACKEND", FILE_CACHE)
+    conf = {"BACKEND": backend, "KEY_PREFIX": "minishop", **conf,
+            "LOCATION": os.environ.get(f"{prefix}_CACHE_LOCATION", os.path.join(CACHE_DIR, prefix.lower()))}
+    if backend == FILE_CACHE:  # Redis/Memcached take OPTIONS as client arguments and evict by memory
+        conf["OPTIONS"] = {"MAX_ENTRIES": max_entries}
+    return conf
+
+
+CACHES = {
+    **CACHES,
+    "shared": _cache_from_env("SHARED", int(os.environ.get("SHARED_CACHE_MAX_ENTRIES", 5000))),
+    "auth": _cache_from_env("AUTH", CACHES["auth"]["OPTIONS"]["MAX_ENTRIES"]),
+    "catalog": _cache_from_env("CATALOG", CACHES["catalog"]["OPTIONS"]["MAX_ENTRIES"],
+                               TIMEOUT=CACHES["catalog"]["TIMEOUT"]),
+}
+REQUIRE_SHARED_CACHES = True
+
+# Server-Timing shows any client how long auth, permission checks and queries took: logs only unless opted in.
+SERVER_TIMING = {**SERVER_TIMING, "HEADER": os.environ.get("SERVER_TIMING_HEADER", "0") == "1"}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -21,3 +50,13 @@ DATABASES = {
         "CONN_MAX_AGE": 60,
     }
 }
+
+# Read replicas: DB_REPLICA_HOSTS=host[:port],... (same database and credentials as the primary).
+# Read-your-writes pins go to the shared cache so a write on one worker pins reads on all of them.
+_replicas = {}
+for _i, _host in enumerate(filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(",")), 1):
+    _name, _, _port = _host.strip().partition(":")
+    _replicas[f"replica{_i}"] = {**DATABASES["default"], "HOST": _name, "PORT": _port or DATABASES["default"]["PORT"],
+                                 "TEST": {"MIRROR": "default"}}
+DATABASES.update(_replicas)
+DATABASE_REPLICAS = {**DATABASE_REPLICAS, "REPLICAS": list(_replicas), "CACHE": "shared"}
@@ -0,0 +1,31 @@
+"""
+Cache aliases whose contents every worker process must see.
+
+Revoked tokens, role-change stamps, read-replica pins and the catalog version
+are written by the worker that handled the request and read by all the
+others. In a process-local cache (``LocMemCache``, ``DummyCache``) the other
+workers never see them. With ``REQUIRE_SHARED_CACHES`` (production settings),
+``require_shared`` refuses to start instead.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+PROCESS_LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def is_process_local(alias) -> bool:
+    return settings.CACHES.get(alias, {}).get("BACKEND") in PROCESS_LOCAL_BACKENDS
+
+
+def require_shared(alias, purpose):
+    if alias not in settings.CACHES:
+        raise ImproperlyConfigured(f"{purpose}: cache alias {alias!r} is not in CACHES.")
+    if getattr(settings, "REQUIRE_SHARED_CACHES", False) and is_process_local(alias):
+        raise ImproperlyConfigured(
+            f"{purpose} needs a cache shared by all workers, but CACHES[{alias!r}] is "
+            f"{settings.CACHES[alias]['BACKEND']}. Point it at a cache all workers share (see "
+            f"minishop/settings/production.py)."
+        )
@@ -0,0 +1,56 @@
+"""Admission control on login: token-bucket throttles and the password-hashing slots, both answering 429."""
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from minishop import admission
+from conftest import PASSWORD
+
+LOGIN = "/api/accounts/login/"
+
+
+def _rates(**rates):
+    return override_settings(ADMISSION={**settings.ADMISSION, "RATES": rates})
+
+
+@pytest.fixture
+def user(make_user):
+    return make_user("admission-user", "staff")
+
+
+def _login(username, ip="10.0.0.1"):
+    return APIClient(REMOTE_ADDR=ip).post(LOGIN, {"username": username, "password": PASSWORD}, format="json")
+
+
+def test_ip_bucket(user):
+    with _rates(ip="2/min"):
+        assert [_login(user.username).status_code for _ in range(2)] == [200, 200]
+        response = _login(user.username)
+        assert response.status_code == 429
+        assert 0 < int(response["Retry-After"]) <= 30
+        assert _login(user.username, ip="10.0.0.2").status_code == 200
+
+
+def test_username_bucket(user):
+    with _rates(username="2/min"):
+        statuses = [_login(user.username.upper(), ip=f"10.0.1.{i}").status_code for i in range(3)]
+        assert statuses == [401, 401, 429]  # usernames are case-sensitive, buckets are not
+        assert _login("someone-else").status_code == 401
+
+
+def test_busy_hashing_slots(user, monkeypatch):
+    slots = admission._Slots(1, 0)
+    monkeypatch.setattr(admission, "_slots", slots)
+    before = admission.metrics().get("login.rejected_busy", 0)
+
+    assert slots.acquire(timeout=0) == (True, 0.0)
+    try:
+        response = _login(user.username)
+    finally:
+        slots.semaphore.release()
+    assert response.status_code == 429
+    assert "Server busy" in response.json()["detail"]
+    assert admission.metrics()["login.rejected_busy"] == before + 1
+
+    assert _login(user.username).status_code == 200
@@ -0,0 +1,93 @@
+"""``POST /api/batch/``: sub-request dispatch, atomic rollback and 424 for the requests after a failure."""
+from decimal import Decimal
+
+import pytest
+
+from apps.accounts.views import CurrentUserView
+from apps.catalog.models import Product
+from apps.orders.models import Order
+
+BATCH = "/api/batch/"
+
+
+@pytest.fixture
+def product(db):
+    return Product.objects.create(name="Batch widget", sku="BATCH-1", price=Decimal("3.00"), stock=10)
+
+
+@pytest.fixture
+def client(client_for):
+    return client_for("admin")
+
+
+def _order(product, qty):
+    return {"method": "POST", "path": "/api/orders/", "body": {"items": [{"product": product.pk, "qty": qty}]}}
+
+
+def test_runs_each_request_as_the_batch_user(client, product):
+    response = client.post(BATCH, {"requests": [
+        {"id": "me", "path": "/api/accounts/me/"},
+        {"id": "order", **_order(product, 2)},
+        {"id": "missing", "path": "/api/nowhere/"},
+    ]}, format="json")
+    assert response.status_code == 200
+    data = response.json()
+    assert "committed" not in data
+    me, order, missing = data["responses"]
+    assert (me["id"], me["status"], me["body"]["username"]) == ("me", 200, client.user.username)
+    assert order["status"] == 201
+    assert Order.objects.get(pk=order["body"]["id"]).user_id == client.user.pk
+    assert missing["status"] == 404
+
+
+def test_atomic_batch_rolls_back_and_skips_the_rest(client, product):
+    response = client.post(BATCH, {"atomic": True, "requests": [
+        _order(product, 2),
+        _order(product, 50),  # insufficient stock: 400
+        {"path": "/api/accounts/me/"},
+    ]}, format="json")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["committed"] is False
+    assert [r["status"] for r in data["responses"]] == [201, 400, 424]
+    assert data["responses"][2]["body"]["detail"].startswith("Not run")
+
+    assert not Order.objects.filter(user=client.user).exists()
+    assert Product.objects.get(pk=product.pk).stock == 10
+
+
+def test_atomic_batch_commits_when_all_succeed(client, product):
+    response = client.post(BATCH, {"atomic": True, "requests": [_order(product, 2), _order(product, 3)]},
+                           format="json")
+    data = response.json()
+    assert data["committed"] is True
+    assert [r["status"] for r in data["responses"]] == [201, 201]
+    assert Product.objects.get(pk=product.pk).stock == 5
+
+
+def test_sub_requests_keep_their_own_permissions(client_for, product):
+    client = client_for("staff")
+    data = client.post(BATCH, {"requests": [_order(product, 1), {"path": "/api/orders/"}]}, format="json").json()
+    assert [r["status"] for r in data["responses"]] == [403, 200]
+
+
+def test_refuses_nested_batches_and_foreign_headers(client):
+    data = client.post(BATCH, {"requests": [{"method": "POST", "path": BATCH}]}, format="json").json()
+    assert data["responses"][0]["status"] == 400
+
+    response = client.post(BATCH, {"requests": [{"path": "/api/orders/", "headers": {"Authorization": "x"}}]},
+                           format="json")
+    assert response.status_code == 400
+
+
+def test_views_with_their_own_authenticators_ignore_the_batch_user(client, monkeypatch):
+    monkeypatch.setattr(CurrentUserView, "authentication_classes", [])
+    data = client.post(BATCH, {"requests": [{"path": "/api/accounts/me/"}]}, format="json").json()
+    assert data["responses"][0]["status"] == 403
+
+
+def test_logout_in_a_batch_revokes_the_batch_token(client):
+    data = client.post(BATCH, {"requests": [{"method": "POST", "path": "/api/accounts/logout/"}]},
+                       format="json").json()
+    assert data["responses"][0]["status"] == 204
+    assert client.get("/api/accounts/me/").status_code == 401
@@ -0,0 +1,68 @@
+"""Streaming exports: same bytes under WSGI and ASGI, and an async iterator on ASGI (no buffering)."""
+import warnings
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+
+from apps.accounts.tokens import RoleRefreshToken
+from apps.catalog.models import Product
+from minishop import exports
+
+EXPORT = "/api/catalog/products/export/"
+
+
+@pytest.fixture
+def products(db, monkeypatch):
+    monkeypatch.setattr(exports, "BLOCK_SIZE", 64)  # several blocks from a few rows
+    return [Product.objects.create(name=f"Export widget {i}", sku=f"EXPORT-{i}", price=Decimal("1.50"), stock=i)
+            for i in range(10)]
+
+
+@pytest.fixture
+def token(make_user):
+    return f"Bearer {RoleRefreshToken.for_user(make_user('export-staff', 'staff')).access_token}"
+
+
+def _aget(token, params):
+    async def get():
+        response = await AsyncClient().get(EXPORT, params, headers={"Authorization": token})
+        return response, [block async for block in response.streaming_content]
+    return async_to_sync(get)()
+
+
+@pytest.mark.parametrize("fmt", exports.FORMATS)
+def test_asgi_streams_the_same_bytes(token, products, fmt):
+    params = {"fmt": fmt, "search": "EXPORT-"}
+    response = Client().get(EXPORT, params, headers={"Authorization": token})
+    assert response.status_code == 200
+    expected = b"".join(response.streaming_content)
+    assert expected.count(b"EXPORT-") == len(products)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # Django warns when it has to buffer a sync iterator
+        response, blocks = _aget(token, params)
+    assert response.is_async
+    assert response["Content-Type"] == exports.FORMATS[fmt]
+    assert len(blocks) > 1
+    assert b"".join(blocks) == expected
+
+
+def test_closing_early_closes_the_generator(products):
+    closed = []
+
+    def lines():
+        try:
+            yield from ("x" * 100 for _ in range(10))
+        finally:
+            closed.append(True)
+
+    async def first_block():
+        blocks = exports._ablocks(exports._blocks(lines()))
+        block = await anext(blocks)
+        await blocks.aclose()
+        return block
+
+    assert async_to_sync(first_block)() == b"x" * 100
+    assert closed == [True]
@@ -0,0 +1,80 @@
+"""``KeysetPagination`` through the products API: no duplicates or gaps across pages."""
+from decimal import Decimal
+
+import pytest
+
+from apps.catalog.models import Product
+
+LIST = "/api/catalog/products/"
+
+
+@pytest.fixture
+def products(db):
+    # few distinct prices, so pages split runs of equal values and rely on the id tiebreaker
+    return [Product.objects.create(name=f"Page widget {i}", sku=f"PAGE-{i:02d}", price=Decimal(i % 3), stock=i)
+            for i in range(23)]
+
+
+@pytest.fixture
+def client(client_for):
+    return client_for("staff")
+
+
+def _walk(client, url, params=None, link="next", on_page=None):
+    seen, pages = [], 0
+    while url:
+        response = client.get(url, params)
+        assert response.status_code == 200
+        data = response.json()
+        assert "count" not in data
+        seen.extend(r["sku"] for r in data["results"])
+        pages += 1
+        if on_page:
+            on_page(pages)
+        url, params = data[link], None
+    return seen, pages
+
+
+def _expected(products, key, reverse=False):
+    return [p.sku for p in sorted(products, key=key, reverse=reverse)]
+
+
+def test_forward_pages_cover_everything_once(client, products):
+    seen, pages = _walk(client, LIST, {"search": "PAGE-", "ordering": "price", "page_size": 4})
+    assert seen == _expected(products, lambda p: (p.price, p.pk))
+    assert pages == 6
+
+
+def test_descending_pages(client, products):
+    seen, _ = _walk(client, LIST, {"search": "PAGE-", "ordering": "-price", "page_size": 5})
+    assert seen == _expected(products, lambda p: (p.price, p.pk), reverse=True)
+
+
+def test_previous_links_walk_back(client, products):
+    params = {"search": "PAGE-", "ordering": "stock", "page_size": 4}
+    last = None
+    url = LIST
+    while url:
+        data = client.get(url, params).json()
+        url, params, last = data["next"], None, data
+    assert last["previous"]
+    back, _ = _walk(client, last["previous"], link="previous")
+    forward = _expected(products, lambda p: (p.stock, p.pk))[:-len(last["results"])]
+    # the same pages in reverse, rows within each page still ascending
+    pages = [forward[i:i + 4] for i in range(0, len(forward), 4)]
+    assert back == [sku for page in reversed(pages) for sku in page]
+
+
+def test_rows_inserted_behind_the_cursor_do_not_shift_pages(client, products):
+    def insert(page):
+        if page == 3:  # the cursor is past every price-0 row by now
+            Product.objects.create(name="Late widget", sku="PAGE-late", price=Decimal(0), stock=0)
+
+    seen, _ = _walk(client, LIST, {"search": "PAGE-", "ordering": "price", "page_size": 4}, on_page=insert)
+    assert len(seen) == len(set(seen))
+    assert "PAGE-late" not in seen
+    assert seen == _expected(products, lambda p: (p.price, p.pk))
+
+
+def test_invalid_cursor(client, products):
+    assert client.get(LIST, {"cursor": "not-a-cursor"}).status_code == 404
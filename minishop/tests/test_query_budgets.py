@@ -0,0 +1,76 @@
+"""
+List and detail endpoints within their ``settings.QUERY_BUDGET`` budgets.
+
+Every list page holds several rows with related objects (order items, user
+groups), so a query per row shows up as a ``QueryBudgetExceeded`` listing the
+statements.
+"""
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import Group
+from django.urls import resolve
+from django.utils import timezone
+
+from apps.accounts.models import Invitation
+from apps.catalog.models import Product
+from apps.orders.models import Order, OrderItem
+from minishop.querybudget import QueryBudgetExceeded, count_queries, get_budget, query_budget
+
+ROWS = 4
+
+
+@pytest.fixture
+def data(client_for, make_user):
+    client = client_for("admin")
+    products = [Product.objects.create(name=f"Budget widget {i}", sku=f"BUDGET-{i}", price=Decimal("1.00"), stock=9)
+                for i in range(ROWS)]
+    staff = Group.objects.get_or_create(name="staff")[0]
+    for i in range(ROWS):
+        user = make_user(f"budget-{i}", "manager")
+        user.groups.add(staff)
+        order = Order.objects.create(user=user)
+        OrderItem.objects.bulk_create(OrderItem(order=order, product=p, qty=1, price=p.price) for p in products)
+        Invitation.objects.create(email=f"budget-{i}@example.com", role="staff", invited_by=client.user,
+                                  expires_at=timezone.now() + timezone.timedelta(days=1))
+    return client, {"product": products[0].pk, "order": order.pk, "user": user.pk,
+                    "invitation": Invitation.objects.latest("pk").pk}
+
+
+ENDPOINTS = [
+    "/api/catalog/products/?page_size={rows}",
+    "/api/catalog/products/{product}/",
+    "/api/orders/?page_size={rows}",
+    "/api/orders/{order}/",
+    "/api/accounts/users/?page_size={rows}",
+    "/api/accounts/users/{user}/",
+    "/api/accounts/invitations/?page_size={rows}",
+    "/api/accounts/invitations/{invitation}/",
+    "/api/accounts/me/",
+]
+
+
+@pytest.mark.parametrize("path", ENDPOINTS, ids=lambda p: p.split("?")[0])
+def test_within_budget(data, path):
+    client, ids = data
+    url = path.format(rows=ROWS, **ids)
+    name = resolve(url.split("?")[0]).url_name
+    with query_budget(get_budget("GET", name)):
+        response = client.get(url)
+    assert response.status_code == 200
+    results = response.json().get("results")
+    assert results is None or len(results) == ROWS
+
+
+def test_reports_the_statements_over_budget(db):
+    with pytest.raises(QueryBudgetExceeded) as exc:
+        with query_budget(1):
+            list(Product.objects.all()[:1])
+            list(Order.objects.all()[:1])
+    message = str(exc.value)
+    assert message.startswith("2 queries executed, budget is 1:")
+    assert '"orders_order"' in message
+
+    with count_queries() as counter, query_budget(2):
+        list(Product.objects.all()[:1])
+    assert counter.count == 1
@@ -0,0 +1,211 @@
+"""
+Per-request timing breakdown.
+
+``ServerTimingMiddleware`` collects how long a request spent in each phase and
+returns it as a ``Server-Timing`` header (visible in the browser's network
+panel) plus a structured log line for requests slower than
+``settings.SERVER_TIMING["LOG_THRESHOLD_MS"]``:
+
+* ``auth``      DRF ``perform_authentication`` (JWT decode, user/claims)
+* ``rbac``      ``check_permissions``/``check_object_permissions`` (group lookups)
+* ``validate``  serializer ``is_valid``
+* ``serialize`` serializer ``to_representation``
+* ``render``    response rendering
+* ``db``        every SQL statement (``execute_wrapper``), also inside the phases above
+* ``app``       the whole request inside the middleware
+
+The DRF phases are recorded by views using ``TimedViewMixin`` and serializers
+using ``TimedSerializerMixin``. The header is off by default in production
+(``SERVER_TIMING_HEADER=1`` to send it): it tells any client how long auth,
+permission checks and queries took. A sample of
+requests (``PROFILE_SAMPLE_RATE``) runs under cProfile; those slower than
+``PROFILE_THRESHOLD_MS`` are dumped as pstats files into ``PROFILE_DIR``
+(``python -m pstats <file>`` to inspect).
+"""
+import cProfile
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .querybudget import count_queries
+
+logger = logging.getLogger("minishop.timing")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "HEADER": True,
+    "LOG_THRESHOLD_MS": 500,
+    "PROFILE_SAMPLE_RATE": 0.0,
+    "PROFILE_THRESHOLD_MS": 1000,
+    "PROFILE_DIR": "profiles",
+}
+
+_current = contextvars.ContextVar("server_timing", default=None)
+
+
+class Timings:
+    def __init__(self):
+        self.phases = {}
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self, extra=()):
+        items = [*self.phases.items(), *extra]
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in items)
+
+
+@contextmanager
+def phase(name):
+    """Add the block's wall time to phase ``name`` of the current request (no-op outside one)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def get_timing_settings():
+    return {**DEFAULTS, **getattr(settings, "SERVER_TIMING", {})}
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.conf = get_timing_settings()
+
+    def __call__(self, request):
+        if not self.conf["ENABLED"]:
+            return self.get_response(request)
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = Timings()
+        token = _current.set(timings)
+        profiler = self.start_profiler()
+        start = time.perf_counter()
+        try:
+            # SQL on worker threads (async views) can't be wrapped from here; sync requests only
+            with count_queries() as counter:
+                response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+            _current.reset(token)
+        timings.add("db", counter.duration)
+        self.finish(request, response, timings, elapsed, counter.count)
+        if profiler is not None and elapsed * 1000 >= self.conf["PROFILE_THRESHOLD_MS"]:
+            self.dump_profile(profiler, request, elapsed)
+        return response
+
+    async def __acall__(self, request):
+        timings = Timings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, timings, time.perf_counter() - start, None)
+        return response
+
+    def start_profiler(self):
+        rate = self.conf["PROFILE_SAMPLE_RATE"]
+        if not rate or random.random() >= rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is active in this thread
+            return None
+        return profiler
+
+    def finish(self, request, response, timings, elapsed, queries):
+        if self.conf["HEADER"]:
+            response["Server-Timing"] = timings.header([("app", elapsed)])
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < self.conf["LOG_THRESHOLD_MS"]:
+            return
+        match = getattr(request, "resolver_match", None)
+        name = match.url_name if match else None
+        phases = {k: round(v * 1000, 2) for k, v in timings.phases.items()}
+        logger.warning(
+            "Slow request: %s %s (%s) %d in %.1f ms %s",
+            request.method, request.path, name, response.status_code, elapsed_ms, phases,
+            extra={"path": request.path, "view": name, "status": response.status_code,
+                   "total_ms": round(elapsed_ms, 2), "phases_ms": phases, "queries": queries},
+        )
+
+    def dump_profile(self, profiler, request, elapsed):
+        match = getattr(request, "resolver_match", None)
+        name = (match.url_name if match else None) or "unresolved"
+        directory = Path(self.conf["PROFILE_DIR"])
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method}-{name}-{elapsed * 1000:.0f}ms.prof"
+        profiler.dump_stats(path)
+        logger.warning("Profile written: %s", path, extra={"path": request.path, "view": name,
+                                                           "profile": str(path)})
+
+
+class TimedViewMixin:
+    """Record DRF's auth, permission and render phases for ServerTimingMiddleware."""
+
+    def perform_authentication(self, request):
+        with phase("auth"):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with phase("rbac"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with phase("rbac"):
+            super().check_object_permissions(request, obj)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        timings = _current.get()
+        if timings is not None and hasattr(response, "add_post_render_callback"):
+            # rendering runs right after the view returns (handler or async_read)
+            start = time.perf_counter()
+            response.add_post_render_callback(lambda r: timings.add("render", time.perf_counter() - start))
+        return response
+
+
+class TimedSerializerMixin:
+    """Record ``is_valid`` and ``to_representation`` as the validate/serialize phases.
+
+    Mix into the serializers views hand out, not into nested ones: a nested
+    serializer's time is already inside its parent's.
+    """
+
+    def is_valid(self, *args, **kwargs):
+        with phase("validate"):
+            return super().is_valid(*args, **kwargs)
+
+    def to_representation(self, instance):
+        # called per item with many=True: skip the context manager when nothing is timed
+        timings = _current.get()
+        if timings is None:
+            return super().to_representation(instance)
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timings.add("serialize", time.perf_counter() - start)
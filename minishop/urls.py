@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from .batch import BatchView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/accounts/", include("apps.accounts.urls")),
     path("api/catalog/", include("apps.catalog.urls")),
+    path("api/batch/", BatchView.as_view(), name="batch"),
     path("api/", include("apps.orders.urls")),
     ]